@@ -3,7 +3,12 @@ import json
 from datetime import datetime
 from typing import List, Dict, Optional
 
-class DatabaseManager:
+from ocr_cache_db import OCRCacheDB, create_cache_tables
+from ocr_jobs_db import OCRJobsDB, create_job_tables
+from ocr_pages_db import OCRPagesDB, create_page_tables, dump_words
+from ocr_stats_db import OCRStatsDB, create_stats_tables
+
+class DatabaseManager(OCRPagesDB, OCRStatsDB, OCRCacheDB, OCRJobsDB):
     def __init__(self, db_path: str = "student_submissions.db"):
         self.db_path = db_path
         self.init_database()
@@ -31,10 +36,14 @@ class DatabaseManager:
             ai_evaluation TEXT,
             ai_stage INTEGER,
             submit_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            update_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            update_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            ocr_words TEXT
         )
         ''')
         
+        # 여러 쪽 제출과 OCR 단어 상자 (ocr_pages_db.py)
+        create_page_tables(cursor)
+        
         # 새로운 평가 기준 테이블 추가
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS evaluation_criteria (
@@ -44,19 +53,32 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        
+        # OCR 스케줄러 통계, 라우팅 기록, 결과 캐시, 이미지 해시
+        # (ocr_stats_db.py, ocr_cache_db.py)
+        create_stats_tables(cursor)
+        create_cache_tables(cursor)
+        
+        # 비동기 OCR 작업 큐 (ocr_jobs_db.py)
+        create_job_tables(cursor)
         conn.commit()
         conn.close()
         print("✅ 데이터베이스 테이블 초기화 완료")
     
-    def save_submission(self, student_id: str, ocr_text: str = None, revised_text: str = None, ai_stage: int = 1) -> int:
-        """제출 내역 저장 (유연한 파라미터 버전)"""
+    def save_submission(self, student_id: str, ocr_text: str = None,
+                        revised_text: str = None, ai_stage: int = 1,
+                        original_image_path: str = None,
+                        ocr_words: Dict = None) -> int:
+        """제출 내역 저장 (유연한 파라미터 버전, ocr_words는 OCR 단어 상자/신뢰도)"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
-        INSERT INTO submissions (student_id, ocr_text, revised_text, ai_stage, submit_time)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (student_id, ocr_text, revised_text, ai_stage, datetime.now()))
+        INSERT INTO submissions (student_id, original_image_path, ocr_text,
+            revised_text, ai_stage, submit_time, ocr_words)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (student_id, original_image_path, ocr_text, revised_text,
+              ai_stage, datetime.now(), dump_words(ocr_words)))
         
         submission_id = cursor.lastrowid
         conn.commit()
@@ -99,8 +121,11 @@ class DatabaseManager:
         rows = cursor.fetchall()
         conn.close()
         
-        # Row 객체를 딕셔너리로 변환
-        return [dict(row) for row in rows]
+        # Row 객체를 딕셔너리로 변환 (목록에서는 OCR 단어 상자 제외)
+        submissions = [dict(row) for row in rows]
+        for submission in submissions:
+            submission.pop("ocr_words", None)
+        return submissions
     
     def get_submission_by_id(self, submission_id: int):
         """ID로 특정 제출 내역 조회"""
@@ -111,8 +136,28 @@ class DatabaseManager:
         conn.close()
         
         if row:
-            return dict(row)
+            submission = dict(row)
+            if submission.get("ocr_words"):
+                submission["ocr_words"] = json.loads(submission["ocr_words"])
+            pages = self.get_submission_pages(submission_id)
+            if pages:
+                submission["pages"] = pages
+            return submission
         return None
+    
+    def update_revised_text(self, submission_id: int, student_id: str,
+                            revised_text: str) -> bool:
+        """학생이 수정한 글 업데이트 (그 학생의 제출 내역이 없으면 False)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        UPDATE submissions SET revised_text = ?, update_time = ?
+        WHERE id = ? AND student_id = ?
+        ''', (revised_text, datetime.now(), submission_id, student_id))
+        updated = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        return updated
 
     # === 평가 기준 관련 메서드들 ===
 
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""OCR 엔진에 넘기는 그레이스케일 이미지 컨테이너
+
+전처리 결과(연속된 uint8 배열 하나)를 그대로 감싸서 OCR 엔진에 원시 픽셀로 넘깁니다.
+PIL 이미지로 바꿔 PNG로 압축했다가 Tesseract가 다시 푸는 과정이 없고,
+워커 프로세스로 보낼 때도 배열 버퍼가 그대로 전달됩니다.
+"""
+import cv2
+import numpy as np
+from PIL import Image
+
+
+class GrayImage:
+    """연속된 그레이스케일 uint8 버퍼 하나를 가진 이미지"""
+    __slots__ = ("pixels",)
+
+    def __init__(self, pixels):
+        pixels = np.asarray(pixels)
+        if pixels.ndim == 3:
+            pixels = cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY)
+        if pixels.dtype != np.uint8:
+            pixels = pixels.astype(np.uint8)
+        # 이미 연속된 배열이면 복사하지 않음
+        self.pixels = np.ascontiguousarray(pixels)
+
+    @classmethod
+    def from_pil(cls, image):
+        return cls(np.asarray(image.convert('L')))
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    @property
+    def size(self):
+        """PIL과 같은 (가로, 세로)"""
+        return self.width, self.height
+
+    @property
+    def nbytes(self):
+        return self.pixels.nbytes
+
+    def to_pil(self):
+        """같은 버퍼를 공유하는 PIL 이미지 (복사 없음)"""
+        return Image.frombuffer('L', self.size, self.pixels, 'raw', 'L', 0, 1)
+
+    def to_pgm(self):
+        """무압축 PGM(P5) 바이트 (헤더 + 원시 픽셀)"""
+        header = f"P5\n{self.width} {self.height}\n255\n".encode('ascii')
+        return header + self.pixels.tobytes()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""지각 해시(dHash) 기반 유사 이미지 탐지
+
+같은 종이를 두 번 찍으면 파일 바이트는 달라도 dHash는 거의 같습니다.
+학생별 BK-트리에 해시를 넣어 두고 해밍 거리로 가까운 이전 업로드를 찾습니다.
+
+쪽 전체의 64비트 dHash는 틀이 같고 글만 다른 사진도 가깝게 나오므로 후보를 고르는
+데만 쓰고, 가로세로 비율과 16×16 dHash(256비트)가 모두 맞아야 같은 사진으로 봅니다.
+"""
+import os
+import threading
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from ocr_trace import trace
+
+# 이 해밍 거리(64비트 중) 이하이면 같은 사진 후보
+NEAR_DUP_MAX_DISTANCE = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "3"))
+
+# 후보 확인용 세밀한 해시의 최대 해밍 거리 (256비트 중)
+NEAR_DUP_FINE_MAX_DISTANCE = int(os.getenv("NEAR_DUP_FINE_MAX_DISTANCE", "24"))
+
+# 후보 확인용 가로세로 비율의 최대 차이 (0.03 = 3%)
+NEAR_DUP_MAX_ASPECT_DIFF = float(os.getenv("NEAR_DUP_MAX_ASPECT_DIFF", "0.03"))
+
+FINE_HASH_SIZE = 16
+
+# 업로드 이미지의 지문: 후보 검색용 dHash, 확인용 세밀한 dHash, 크기
+ImageFingerprint = namedtuple(
+    "ImageFingerprint", ["dhash", "fine_hash", "width", "height"])
+
+
+def _gray(image):
+    img_array = np.asarray(image)
+    if img_array.ndim == 3:
+        return cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+    return img_array
+
+
+def _dhash_gray(gray, hash_size):
+    small = cv2.resize(gray, (hash_size + 1, hash_size),
+                       interpolation=cv2.INTER_AREA)
+    diff = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(diff).tobytes(), 'big')
+
+
+def dhash(image, hash_size=8):
+    """이미지의 dHash (가로 방향 밝기 차이, 기본 64비트)"""
+    return _dhash_gray(_gray(image), hash_size)
+
+
+def fingerprint(image):
+    """유사 이미지 검색과 확인에 쓰는 지문"""
+    gray = _gray(image)
+    height, width = gray.shape[:2]
+    return ImageFingerprint(_dhash_gray(gray, 8),
+                            _dhash_gray(gray, FINE_HASH_SIZE), width, height)
+
+
+def same_picture(a, b):
+    """dHash 후보 두 개가 정말 같은 사진인지 (비율과 세밀한 해시로 확인)"""
+    if a.fine_hash is None or b.fine_hash is None:
+        return False  # 세밀한 해시가 없던 예전 기록은 확인할 수 없음
+    aspect_a = a.width / a.height
+    aspect_b = b.width / b.height
+    if abs(aspect_a - aspect_b) > NEAR_DUP_MAX_ASPECT_DIFF * aspect_a:
+        return False
+    return (hamming_distance(a.fine_hash, b.fine_hash)
+            <= NEAR_DUP_FINE_MAX_DISTANCE)
+
+
+def hamming_distance(a, b):
+    """두 해시의 해밍 거리"""
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """해밍 거리용 BK-트리"""
+
+    def __init__(self):
+        self.root = None  # [해시, 값 목록, {거리: 자식 노드}]
+        self.size = 0
+
+    def add(self, hash_value, item):
+        self.size += 1
+        if self.root is None:
+            self.root = [hash_value, [item], {}]
+            return
+
+        node = self.root
+        while True:
+            distance = hamming_distance(hash_value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [hash_value, [item], {}]
+                return
+            node = child
+
+    def search(self, hash_value, max_distance):
+        """max_distance 이내의 (거리, 값) 목록을 가까운 순으로 반환"""
+        if self.root is None:
+            return []
+
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+            if distance <= max_distance:
+                found.extend((distance, item) for item in node[1])
+            # 삼각 부등식: 자식 중 |d - max| ~ d + max 범위만 탐색
+            for child_distance, child in node[2].items():
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+
+        found.sort(key=lambda x: x[0])
+        return found
+
+
+class NearDuplicateIndex:
+    """학생별 유사 이미지 색인 (데이터베이스에 저장된 해시로 처음 한 번 구성)"""
+
+    def __init__(self, db=None, max_distance=None):
+        self.db = db
+        self.max_distance = (NEAR_DUP_MAX_DISTANCE if max_distance is None
+                             else max_distance)
+        self._trees = None  # student_id -> BKTree
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """데이터베이스에서 해시 목록을 읽어 BK-트리 구성"""
+        if self._trees is not None:
+            return
+        self._trees = {}
+        if not self.db:
+            return
+        try:
+            for row in self.db.get_image_hashes():
+                tree = self._trees.setdefault(row['student_id'], BKTree())
+                fine_hash = row.get('fine_hash')
+                stored = ImageFingerprint(
+                    int(row['dhash'], 16),
+                    int(fine_hash, 16) if fine_hash else None,
+                    row.get('width'), row.get('height'))
+                tree.add(stored.dhash, (row['content_hash'], stored))
+            print(f"✅ 유사 이미지 색인 로딩 완료: {len(self._trees)}명")
+        except Exception as e:
+            print(f"⚠️ 유사 이미지 색인 로딩 실패: {e}")
+
+    def find(self, student_id, image_print):
+        """같은 학생의 같은 사진 (거리, content_hash) 목록 반환
+
+        dHash가 가까운 후보 중 same_picture로 확인된 것만 돌려줍니다.
+        """
+        with self._lock:
+            self._load()
+            tree = self._trees.get(student_id)
+            if tree is None:
+                return []
+            found = tree.search(image_print.dhash, self.max_distance)
+        return [(distance, content_hash)
+                for distance, (content_hash, other) in found
+                if same_picture(image_print, other)]
+
+    def add(self, student_id, image_print, content_hash, image_path=None):
+        """업로드 이미지를 색인에 추가 (데이터베이스에도 저장)"""
+        with self._lock:
+            self._load()
+            tree = self._trees.setdefault(student_id, BKTree())
+            tree.add(image_print.dhash, (content_hash, image_print))
+
+        if self.db:
+            try:
+                self.db.save_image_hash(
+                    student_id, f"{image_print.dhash:016x}", content_hash,
+                    image_path, fine_hash=f"{image_print.fine_hash:064x}",
+                    width=image_print.width, height=image_print.height)
+            except Exception as e:
+                trace.warning("⚠️ 이미지 해시 저장 실패: {}", e)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""업로드 이미지 읽기 (헤더 크기 확인 → 축소 디코딩 → 크기 조정)
+
+먼저 파일 헤더만 읽어 가로/세로를 확인하고, 픽셀 수가 한도를 넘으면
+디코딩하지 않고 거부합니다 (압축 폭탄 방지). JPEG는 draft 모드로
+DCT 단계에서 1/2, 1/4, 1/8로 줄여 디코딩하므로 48MP 사진도
+원본 해상도로 메모리에 풀지 않고 바로 목표 크기 근처로 읽습니다.
+"""
+import io
+import os
+import time
+
+from PIL import Image, ImageOps
+
+# OCR에 사용할 이미지의 최대/최소 변 길이 (px)
+OCR_MAX_IMAGE_SIDE = int(os.getenv("OCR_MAX_IMAGE_SIDE", "2000"))
+OCR_MIN_IMAGE_SIDE = int(os.getenv("OCR_MIN_IMAGE_SIDE", "300"))
+
+# 헤더 기준 최대 픽셀 수 (넘으면 디코딩하지 않고 거부)
+OCR_MAX_IMAGE_PIXELS = int(os.getenv("OCR_MAX_IMAGE_PIXELS", str(64_000_000)))
+
+# JPEG 축소 디코딩 사용 여부
+OCR_JPEG_DRAFT = os.getenv("OCR_JPEG_DRAFT", "1") != "0"
+
+
+class ImageTooLargeError(ValueError):
+    """픽셀 수가 한도를 넘는 이미지"""
+
+
+def rss_mb():
+    """프로세스의 현재 메모리 사용량 (RSS, MB, /proc이 없는 OS면 None)
+
+    ru_maxrss는 프로세스가 뜬 뒤의 최댓값이라 오래 도는 서버에서는
+    요청마다 차이를 볼 수 없으므로 현재 값을 읽습니다.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+def _fit_size(width, height, max_side):
+    """긴 변이 max_side가 되도록 비율을 유지한 크기"""
+    scale = max_side / max(width, height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def open_image_header(contents, max_pixels=None):
+    """헤더만 읽어 이미지인지와 픽셀 수를 확인 (픽셀은 아직 디코딩하지 않음)
+
+    픽셀 수가 max_pixels를 넘으면 ImageTooLargeError, 이미지가 아니면
+    PIL.UnidentifiedImageError를 발생시킵니다.
+    """
+    max_pixels = max_pixels or OCR_MAX_IMAGE_PIXELS
+    try:
+        image = Image.open(io.BytesIO(contents))
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(str(e))
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ImageTooLargeError(
+            f"이미지가 너무 큽니다 ({width}x{height}, {width * height / 1e6:.0f}MP > "
+            f"{max_pixels / 1e6:.0f}MP)")
+    return image
+
+
+def ingest_image(contents, max_side=None, min_side=None, max_pixels=None,
+                 draft=None):
+    """업로드 바이트를 OCR용 이미지로 읽고 (이미지, 읽기 정보)를 반환
+
+    픽셀 수가 max_pixels를 넘으면 ImageTooLargeError를 발생시킵니다.
+    """
+    max_side = max_side or OCR_MAX_IMAGE_SIDE
+    min_side = min_side or OCR_MIN_IMAGE_SIDE
+    draft = OCR_JPEG_DRAFT if draft is None else draft
+
+    started = time.perf_counter()
+    rss_before = rss_mb()
+
+    # 1. 헤더만 읽어 크기 확인 (아직 픽셀은 디코딩하지 않음)
+    image = open_image_header(contents, max_pixels)
+    width, height = image.size
+
+    info = {
+        "format": image.format,
+        "original_size": [width, height],
+        "draft": False,
+    }
+
+    # 2. JPEG는 목표 크기 이상인 가장 작은 배율(1/2, 1/4, 1/8)로 디코딩
+    if draft and image.format == "JPEG" and max(width, height) > max_side:
+        mode = image.mode if image.mode in ("L", "RGB") else None
+        if image.draft(mode, _fit_size(width, height, max_side)):
+            info["draft"] = True
+    image.load()
+    info["decoded_size"] = list(image.size)
+
+    # 3. 휴대폰 사진의 EXIF 회전 정보 반영
+    image = ImageOps.exif_transpose(image)
+
+    # 이미지 형식 확인 및 RGB로 변환
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    # 4. 너무 크면 축소, 너무 작으면 확대 (OCR 성능 향상)
+    if image.width > max_side or image.height > max_side:
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    elif image.width < min_side or image.height < min_side:
+        scale_factor = max(min_side / image.width, min_side / image.height)
+        new_size = (int(image.width * scale_factor),
+                    int(image.height * scale_factor))
+        image = image.resize(new_size, Image.Resampling.LANCZOS)
+
+    # 읽기 전후의 현재 RSS 차이 (같은 프로세스의 다른 요청도 영향을 줄 수 있음)
+    rss_after = rss_mb()
+    info.update({
+        "final_size": list(image.size),
+        "decode_ms": round((time.perf_counter() - started) * 1000, 1),
+        "rss_mb": rss_after,
+        "rss_growth_mb": (round(rss_after - rss_before, 1)
+                          if rss_after is not None else None),
+    })
+    return image, info
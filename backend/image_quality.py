@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""이미지 품질 분석과 전처리 경로 선택
+
+축소한 썸네일에서 흐림(라플라시안 분산), 대비, 획 두께, 배경 얼룩, 글자 밀도를
+빠르게 재고, 라우팅 표(JSON)의 규칙에 따라 이 사진에 맞는 전처리 변형 2~3개만 고릅니다.
+규칙과 변형 목록은 코드가 아니라 표에 있으므로 실제 업로드 기록을 보고 조정할 수 있습니다.
+"""
+import json
+import os
+
+import cv2
+import numpy as np
+
+from ocr_trace import trace
+
+# 이미지 품질에 따라 변형을 고를지 여부 (0이면 모든 변형 실행)
+OCR_QUALITY_ROUTING = os.getenv("OCR_QUALITY_ROUTING", "1") != "0"
+
+# 라우팅 표 경로
+OCR_ROUTING_TABLE = os.getenv(
+    "OCR_ROUTING_TABLE",
+    os.path.join(os.path.dirname(__file__), 'ocr_routing.json'))
+
+# 품질 분석용 썸네일의 긴 변 (px)
+THUMBNAIL_SIZE = 512
+
+# 획 두께를 잴 원본 해상도 영역 크기 (px)
+STROKE_CROP = 256
+
+# 규칙 조건에 쓸 수 있는 비교 (측정값, 기준값)
+CONDITIONS = {
+    "min": lambda value, limit: value >= limit,
+    "max": lambda value, limit: value < limit,
+}
+
+
+def _ink_mask(gray, window):
+    """배경(획보다 큰 창으로 닫힘 연산)을 빼서 조명 차이를 없앤 뒤 Otsu로 잉크 분리
+
+    (잉크 마스크, 배경 이미지)를 반환합니다.
+    """
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (window, window))
+    background = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
+    _, ink = cv2.threshold(cv2.subtract(background, gray), 0, 255,
+                           cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return ink, background
+
+
+def _stroke_width(gray, thumb_ink, scale):
+    """잉크가 가장 많은 곳을 원본 해상도로 잘라 잰 획 두께 중앙값 (px)
+
+    썸네일에서는 가는 획이 뭉개지므로 획 두께만 원본에서 잽니다.
+    획의 중심선(거리 변환의 극대점)까지 거리의 두 배가 획 두께입니다.
+    """
+    if not thumb_ink.any():
+        return 0.0
+    # 썸네일에서 잉크가 가장 많은 STROKE_CROP 크기 영역 찾기
+    size = max(1, int(STROKE_CROP * scale))
+    density = cv2.boxFilter(thumb_ink.astype(np.float32), -1, (size, size))
+    y, x = np.unravel_index(np.argmax(density), density.shape)
+    cx, cy = int(x / scale), int(y / scale)
+    half = STROKE_CROP // 2
+    crop = gray[max(0, cy - half):cy + half, max(0, cx - half):cx + half]
+
+    ink, _ = _ink_mask(crop, 31)
+    distance = cv2.distanceTransform(ink, cv2.DIST_L2, 5)
+    peaks = cv2.dilate(distance, np.ones((3, 3), np.uint8))
+    ridge = (distance > 0) & (distance >= peaks)
+    return float(np.median(distance[ridge])) * 2 if ridge.any() else 0.0
+
+
+def analyze_image_quality(gray):
+    """그레이스케일 이미지의 품질 지표 (흐림, 대비, 획 두께, 배경 얼룩, 글자 밀도)
+
+    - blur: 라플라시안 분산 (작을수록 흐림)
+    - contrast: 밝기 1~99 백분위 차이 (0~255)
+    - stroke_width: 글자 획 두께 중앙값 (원본 이미지 px)
+    - background_unevenness: 배경 밝기 5~95 백분위 차이 비율 (0~1, 클수록 그림자/조명 얼룩)
+    - text_density: 글자(잉크) 픽셀 비율 (0~1)
+    """
+    height, width = gray.shape[:2]
+    scale = min(1.0, THUMBNAIL_SIZE / max(height, width))
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    thumb = (cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+             if scale < 1 else gray)
+
+    low, high = np.percentile(thumb, [1, 99])
+
+    # 글줄 높이보다 큰 창으로 배경 밝기만 남김
+    ink, background = _ink_mask(thumb, max(15, (min(thumb.shape) // 8) | 1))
+    bg_low, bg_high = np.percentile(background, [5, 95])
+
+    return {
+        "blur": round(float(cv2.Laplacian(thumb, cv2.CV_64F).var()), 1),
+        "contrast": round(float(high - low), 1),
+        "stroke_width": round(_stroke_width(gray, ink > 0, scale), 1),
+        "background_unevenness": round(float(bg_high - bg_low) / 255, 3),
+        "text_density": round(float(np.count_nonzero(ink)) / ink.size, 3),
+    }
+
+
+class QualityRouter:
+    """라우팅 표에 따라 품질 지표에 맞는 전처리 변형을 고름
+
+    표 형식:
+      {"max_variants": 3, "min_variants": 2,
+       "default": [변형, ...],
+       "rules": [{"name": 이름, "when": {지표: {"min"|"max": 값}},
+                  "variants": [변형, ...]}, ...]}
+    규칙은 위에서부터 검사하며, 조건을 모두 만족한 규칙의 변형을 순서대로 모읍니다.
+    모은 변형이 min_variants보다 적으면 default로 채웁니다.
+    db를 주면 선택 결과와 최종 OCR 결과를 기록해 표를 조정하는 데 씁니다.
+    """
+
+    def __init__(self, table, known_variants=None, db=None):
+        self.db = db
+        self.max_variants = table.get("max_variants", 3)
+        self.min_variants = table.get("min_variants", 2)
+        self.default = table["default"]
+        self.rules = table.get("rules", [])
+
+        if known_variants is not None:
+            rule_variants = [rule["variants"] for rule in self.rules]
+            for names in [self.default] + rule_variants:
+                unknown = set(names) - set(known_variants)
+                if unknown:
+                    raise ValueError("라우팅 표에 없는 전처리 변형: "
+                                     + ', '.join(sorted(unknown)))
+
+    @classmethod
+    def from_file(cls, path=None, known_variants=None, db=None):
+        with open(path or OCR_ROUTING_TABLE, encoding='utf-8') as f:
+            return cls(json.load(f), known_variants, db)
+
+    def matches(self, rule, metrics):
+        return all(
+            CONDITIONS[op](metrics[metric], limit)
+            for metric, bounds in rule["when"].items()
+            for op, limit in bounds.items()
+        )
+
+    def route(self, metrics):
+        """(고른 변형 목록, 일치한 규칙 이름 목록)"""
+        variants, matched = [], []
+        for rule in self.rules:
+            if not self.matches(rule, metrics):
+                continue
+            matched.append(rule["name"])
+            variants += [name for name in rule["variants"]
+                         if name not in variants]
+
+        for name in self.default:
+            if len(variants) >= self.min_variants:
+                break
+            if name not in variants:
+                variants.append(name)
+        return variants[:self.max_variants], matched
+
+    def record(self, metrics, matched, variants, winner, best_score):
+        """선택 결과와 그 업로드의 최종 OCR 결과를 기록"""
+        if self.db:
+            try:
+                self.db.save_routing_log(metrics, matched, variants, winner,
+                                         best_score)
+            except Exception as e:
+                trace.warning("⚠️ 라우팅 기록 저장 실패: {}", e)
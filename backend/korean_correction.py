@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""한국어 OCR 오인식 교정 엔진
+
+교정 규칙은 코드가 아니라 규칙 파일(JSON)에 있고, 서버 시작 시 한 번 컴파일합니다.
+- substitutions: 어디에 있든 바꾸는 글자열 (Aho-Corasick 오토마톤으로 한 번 훑어서
+  가장 왼쪽·가장 긴 일치를 겹치지 않게 바꿈, 규칙 수와 관계없이 텍스트 길이에 비례)
+- tokens: 어절(공백으로 나눈 단위) 전체가 같을 때만 바꾸는 규칙 (사전 조회)
+- words: 띄어쓰기가 잘못 들어가 쪼개진 어절을 다시 붙일 낱말
+  (이웃한 어절 2~4개를 붙인 것이 목록에 있으면 붙임)
+- sentence_endings: 글 마지막 어절이 이 어미로 끝나면 마침표를 붙임
+규칙을 차례로 str.replace하거나 '.*?' 정규식으로 찾으면 규칙 수만큼 텍스트를 다시 훑고
+규칙끼리 서로의 결과를 또 바꾸거나 어절 사이의 글자를 지워 버리므로,
+모든 규칙을 원문 기준으로 한 번에 적용합니다.
+"""
+import json
+import os
+import re
+from collections import deque
+
+# 교정 규칙 파일 경로
+OCR_CORRECTION_RULES = os.getenv(
+    "OCR_CORRECTION_RULES",
+    os.path.join(os.path.dirname(__file__), 'ocr_corrections.json'))
+
+# 한 낱말로 붙여 볼 최대 어절 수
+MAX_JOIN_TOKENS = 4
+
+
+class AhoCorasick:
+    """여러 글자열을 한 번에 찾아 바꾸는 오토마톤
+
+    patterns: {찾을 글자열: 바꿀 글자열}
+    """
+
+    def __init__(self, patterns):
+        # 상태별 다음 상태, 실패 링크, 상태 깊이(=일치 길이), 바꿀 글자열, 출력 링크
+        self.goto = [{}]
+        self.fail = [0]
+        self.depth = [0]
+        self.value = [None]
+        self.output = [-1]
+
+        for pattern, replacement in patterns.items():
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.depth.append(self.depth[state] + 1)
+                    self.value.append(None)
+                    self.output.append(-1)
+                    self.goto[state][ch] = next_state
+                state = next_state
+            self.value[state] = replacement
+
+        # 너비 우선으로 실패 링크와 출력 링크(실패 링크를 따라가며 만나는 첫 일치 상태) 계산
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                fail = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = fail
+                self.output[next_state] = (
+                    fail if self.value[fail] is not None
+                    else self.output[fail])
+
+        # 첫 상태에서는 규칙의 첫 글자가 나올 때까지 정규식으로 건너뜀 (대부분의 글자는 규칙과 무관)
+        first_chars = ''.join(re.escape(ch) for ch in sorted(self.goto[0]))
+        self.skip = re.compile(f'[{first_chars}]') if first_chars else None
+
+    def __len__(self):
+        return sum(1 for value in self.value if value is not None)
+
+    def find(self, text):
+        """모든 일치 (시작, 끝, 바꿀 글자열)"""
+        if self.skip is None:
+            return
+        goto, fail, depth = self.goto, self.fail, self.depth
+        value, output = self.value, self.output
+        state = 0
+        position = 0
+        while position < len(text):
+            if not state:
+                found = self.skip.search(text, position)
+                if found is None:
+                    return
+                position = found.start()
+            ch = text[position]
+            position += 1
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            match = state if value[state] is not None else output[state]
+            while match > 0:
+                yield position - depth[match], position, value[match]
+                match = output[match]
+
+    def replace(self, text):
+        """(바꾼 텍스트, [(원래 글자열, 바꾼 글자열), ...])
+
+        같은 위치에서 시작하는 일치는 가장 긴 것을, 겹치는 일치는 왼쪽 것을 고릅니다.
+        """
+        longest = {}
+        for start, end, replacement in self.find(text):
+            if end > longest.get(start, (0,))[0]:
+                longest[start] = (end, replacement)
+        if not longest:
+            return text, []
+
+        parts = []
+        applied = []
+        position = 0
+        for start in sorted(longest):
+            if start < position:
+                continue
+            end, replacement = longest[start]
+            parts.append(text[position:start])
+            parts.append(replacement)
+            applied.append((text[start:end], replacement))
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts), applied
+
+
+class CorrectionEngine:
+    """규칙 파일을 컴파일한 교정기
+
+    규칙 형식:
+      {"substitutions": {글자열: 바꿀 글자열, ...},
+       "tokens": {어절: 바꿀 어절, ...},
+       "words": [낱말, ...],
+       "sentence_endings": [어미, ...]}
+    """
+
+    def __init__(self, rules):
+        self.substitutions = AhoCorasick(rules.get("substitutions", {}))
+        self.tokens = dict(rules.get("tokens", {}))
+        self.words = frozenset(rules.get("words", []))
+        self.sentence_endings = tuple(rules.get("sentence_endings", []))
+        # 붙여서 만들 수 있는 낱말/어절의 모든 앞부분
+        self.prefixes = frozenset(
+            word[:end] for word in self.words | self.tokens.keys()
+            for end in range(1, len(word) + 1))
+
+    @classmethod
+    def from_file(cls, path=None):
+        with open(path or OCR_CORRECTION_RULES, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.substitutions) + len(self.tokens) + len(self.words)
+
+    def correct_tokens(self, tokens, applied):
+        """어절 목록을 왼쪽부터 한 번 훑으며 쪼개진 낱말을 붙이고 어절 규칙 적용
+
+        붙인 글자열이 낱말의 앞부분이 아니게 되면 더 붙여 보지 않으므로
+        대부분의 어절은 집합 조회 한 번으로 끝납니다.
+        """
+        corrected = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token not in self.prefixes:
+                corrected.append(token)
+                i += 1
+                continue
+            count = 1
+            joined = token
+            for j in range(i + 1, min(i + MAX_JOIN_TOKENS, len(tokens))):
+                joined += tokens[j]
+                if joined not in self.prefixes:
+                    break
+                if joined in self.words or joined in self.tokens:
+                    token, count = joined, j - i + 1
+            if count > 1:
+                original = ' '.join(tokens[i:i + count])
+            else:
+                original = token
+            if token in self.tokens:
+                token = self.tokens[token]
+            if token != original:
+                applied.append((original, token))
+            corrected.append(token)
+            i += count
+        return corrected
+
+    def correct(self, text):
+        """(교정한 텍스트, [(원래, 교정), ...])
+
+        줄바꿈은 그대로 두고 줄마다 연속 공백을 하나로 줄입니다.
+        """
+        text, applied = self.substitutions.replace(text)
+
+        lines = [' '.join(self.correct_tokens(line.split(), applied))
+                 for line in text.split('\n')]
+        corrected = '\n'.join(lines).strip()
+
+        if self.sentence_endings and corrected.endswith(self.sentence_endings):
+            last = corrected.split()[-1]
+            applied.append((last, last + '.'))
+            corrected += '.'
+        return corrected, applied
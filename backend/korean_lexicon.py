@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""자모 단위 어휘 교정 (엔진 신뢰도가 낮은 OCR 어절 교정)
+
+음절을 초성/중성/종성 자모로 풀어(NFD) 낱말 사이의 편집 거리를 자모 단위로 잽니다.
+'밥'과 '밤'은 음절로는 한 글자가 다르지만 자모로는 종성 하나만 다르므로,
+OCR이 획 하나를 잘못 읽은 어절을 가까운 낱말로 찾을 수 있습니다.
+
+찾기는 SymSpell 방식의 삭제 색인(korean_lexicon_index)을 씁니다. 어절을 색인과 같은
+방식으로 지운 변형들을 만들어 np.searchsorted로 한 번에 찾은 뒤 후보만 실제 거리로
+확인합니다. 색인은 어휘 목록(korean_words.txt)에서 미리 만든 파일을 메모리 매핑으로
+열므로 서버 시작 때 다시 계산하지 않습니다 (어휘 목록이 바뀌면 다시 만듦).
+"""
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from korean_lexicon_index import (
+    OCR_LEXICON_INDEX, OCR_LEXICON_MAX_DISTANCE, OCR_LEXICON_WORDS,
+    build_index, decompose, deletes, key_hash, map_index, read_words,
+)
+
+# 엔진 신뢰도가 이 값 미만인 어절만 교정 (0이면 어휘 교정을 하지 않음)
+OCR_LEXICON_MIN_CONF = int(os.getenv("OCR_LEXICON_MIN_CONF", "60"))
+
+# 어절 끝에서 떼어 볼 조사 (긴 것부터)
+PARTICLES = (
+    "에서", "에게", "으로", "부터", "까지", "처럼", "보다", "한테",
+    "은", "는", "이", "가", "을", "를", "에", "의", "와", "과", "도", "로", "만",
+)
+
+# 받침 있는 낱말 뒤에만 / 받침 없는 낱말(또는 ㄹ 받침, '로'만) 뒤에만 오는 조사
+AFTER_CONSONANT = frozenset(["은", "을", "이", "과", "으로"])
+AFTER_VOWEL = frozenset(["는", "를", "가", "와", "로"])
+
+HANGUL_WORD = re.compile(r'[가-힣]+')
+NON_HANGUL = re.compile(r'[^가-힣]')
+
+
+def final_consonant(syllable):
+    """완성형 음절의 종성 번호 (0이면 받침 없음)"""
+    return (ord(syllable) - 0xAC00) % 28
+
+
+def fits_particle(stem, particle):
+    """조사가 낱말의 받침과 어울리는지 ('도덕은'은 맞고 '도덕는'은 틀림)"""
+    final = final_consonant(stem[-1])
+    if particle in AFTER_CONSONANT:
+        return final != 0
+    if particle in AFTER_VOWEL:
+        return final == 0 or (particle == "로" and final == 8)
+    return True
+
+
+def jamo_distance(a, b, limit):
+    """두 자모 문자열의 편집 거리 (이웃 자모 바꿈 포함), limit을 넘으면 limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and ca == b[j - 2] and a[i - 2] == cb):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class KoreanLexicon:
+    """메모리 매핑한 삭제 색인으로 가까운 낱말을 찾음"""
+
+    def __init__(self, path=None):
+        self._map, header, arrays = map_index(path)
+        self.max_distance = header["max_distance"]
+        self.word_count = header["words"]
+        self.keys = arrays["keys"]
+        self.postings = arrays["postings"]
+        self.word_offsets = arrays["word_offsets"]
+        self.word_data = arrays["word_data"]
+
+        # 같은 어절은 후보마다 반복되므로 교정 결과를 캐시
+        self.correct_token = lru_cache(maxsize=4096)(self._correct_token)
+
+    @classmethod
+    def open(cls, words_path=None, index_path=None,
+             max_distance=OCR_LEXICON_MAX_DISTANCE):
+        """색인 파일을 엶
+
+        없거나, 어휘 목록보다 오래됐거나, 거리 설정이 다르면 먼저 만듭니다.
+        """
+        words_path = words_path or OCR_LEXICON_WORDS
+        index_path = index_path or OCR_LEXICON_INDEX
+        if (not os.path.exists(index_path)
+                or os.path.getmtime(index_path) < os.path.getmtime(words_path)):
+            build_index(read_words(words_path), index_path, max_distance)
+        lexicon = cls(index_path)
+        if lexicon.max_distance != max_distance:
+            build_index(read_words(words_path), index_path, max_distance)
+            lexicon = cls(index_path)
+        return lexicon
+
+    def __len__(self):
+        return self.word_count
+
+    def word(self, word_id):
+        start, end = self.word_offsets[word_id], self.word_offsets[word_id + 1]
+        return self.word_data[start:end].tobytes().decode('utf-8')
+
+    def _candidates(self, keys):
+        """삭제 변형들과 해시가 같은 낱말 번호 (작은 번호 = 우선 낱말부터)"""
+        hashes = np.fromiter((key_hash(key) for key in keys),
+                             dtype=np.uint64, count=len(keys))
+        starts = np.searchsorted(self.keys, hashes, 'left')
+        ends = np.searchsorted(self.keys, hashes, 'right')
+        found = ends > starts
+        word_ids = set()
+        for start, end in zip(starts[found], ends[found]):
+            word_ids.update(self.postings[start:end].tolist())
+        return sorted(word_ids)
+
+    def __contains__(self, word):
+        candidates = self._candidates([decompose(word)])
+        return any(self.word(word_id) == word for word_id in candidates)
+
+    def lookup(self, word, max_distance=None):
+        """가장 가까운 낱말 (낱말, 자모 거리), 최대 거리 안에 없으면 None
+
+        거리가 같으면 어휘 목록에서 위에 있는 낱말을 고릅니다.
+        """
+        jamo = decompose(word)
+        if max_distance is None:
+            max_distance = self.max_distance
+        limit = min(max_distance, self.max_distance)
+        best = None
+        for word_id in self._candidates(list(deletes(jamo, limit))):
+            candidate = self.word(word_id)
+            distance = jamo_distance(jamo, decompose(candidate), limit)
+            if distance <= limit:
+                best = (candidate, distance)
+                if distance == 0:
+                    break
+                limit = distance - 1
+        return best
+
+    def _splits(self, token):
+        """어절을 (낱말 부분, 조사, 조사의 자모 거리)로 나눈 경우들
+
+        OCR이 조사를 잘못 읽은 경우('나라애서')도 찾도록 자모 하나까지 다른
+        조사도 나누되, 이때는 낱말 부분의 받침과 어울리는 조사만 씁니다.
+        """
+        splits = []
+        for particle in PARTICLES:
+            if len(token) <= len(particle):
+                continue
+            stem, suffix = token[:-len(particle)], token[-len(particle):]
+            if suffix == particle:
+                splits.append((stem, particle, 0))
+            elif fits_particle(stem, particle) and jamo_distance(
+                    decompose(suffix), decompose(particle), 1) <= 1:
+                splits.append((stem, particle, 1))
+        return splits
+
+    def _correct_token(self, token):
+        """어절 하나의 교정 결과 (어휘에 있거나 가까운 낱말이 없으면 None)
+
+        어절 전체로 찾고, 끝의 조사를 떼어 낱말 부분으로도 찾아 자모 거리가
+        가장 작은 것을 고릅니다. 두 음절 낱말은 자모 하나, 그보다 긴 낱말은
+        최대 거리까지 (조사의 거리 포함) 바꿉니다.
+        """
+        if len(token) < 2 or not HANGUL_WORD.fullmatch(token):
+            return None
+        splits = self._splits(token)
+        if token in self or any(stem in self for stem, _, distance in splits
+                                if distance == 0):
+            return None
+
+        best = None
+        for stem, particle, particle_distance in [(token, "", 0)] + splits:
+            limit = 1 if len(stem) == 2 else self.max_distance
+            if best is not None:
+                limit = min(limit, best[1] - 1)
+            limit -= particle_distance
+            if len(stem) < 2 or limit < 0:
+                continue
+            found = self.lookup(stem, limit)
+            if found:
+                best = (found[0] + particle, found[1] + particle_distance)
+        return best[0] if best else None
+
+    def correct_text(self, text, uncertain):
+        """uncertain에 든 어절만 가까운 낱말로 교정
+
+        (교정한 텍스트, [(원래 어절, 교정한 어절), ...])를 반환합니다.
+        """
+        applied = []
+        lines = []
+        for line in text.split('\n'):
+            tokens = line.split(' ')
+            for i, token in enumerate(tokens):
+                if token in uncertain:
+                    corrected = self.correct_token(token)
+                    if corrected:
+                        applied.append((token, corrected))
+                        tokens[i] = corrected
+            lines.append(' '.join(tokens))
+        return '\n'.join(lines), applied
+
+
+def uncertain_tokens(words, min_confidence=OCR_LEXICON_MIN_CONF):
+    """엔진 신뢰도가 min_confidence 미만인 단어들 (원래 텍스트와 한글만 남긴 형태)
+
+    신뢰도를 모르는 단어(-1)는 넣지 않습니다.
+    """
+    tokens = set()
+    for word in words:
+        if 0 <= word.conf < min_confidence:
+            tokens.add(word.text)
+            tokens.add(NON_HANGUL.sub('', word.text))
+    tokens.discard('')
+    return frozenset(tokens)
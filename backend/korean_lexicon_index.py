@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""자모 삭제 색인 파일 만들기와 읽기 (korean_lexicon이 사용)
+
+어휘의 모든 낱말을 자모로 풀어(NFD) 최대 거리만큼 지운 변형들의 해시를 정렬해
+파일 하나에 저장합니다. 읽을 때는 메모리 매핑으로 열어 배열을 복사 없이 씁니다.
+
+실행: python backend/korean_lexicon_index.py --words 어휘목록.txt --output 색인파일
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import unicodedata
+
+import numpy as np
+
+# 어휘 목록 경로 (한 줄에 한 낱말, 위에 있을수록 우선)
+OCR_LEXICON_WORDS = os.getenv(
+    "OCR_LEXICON_WORDS",
+    os.path.join(os.path.dirname(__file__), 'korean_words.txt'))
+
+# 미리 만든 색인 파일 경로 (없거나 어휘 목록보다 오래되면 다시 만듦)
+OCR_LEXICON_INDEX = os.getenv(
+    "OCR_LEXICON_INDEX",
+    os.path.join(os.path.dirname(__file__), 'korean_lexicon.idx'))
+
+# 최대 자모 편집 거리 (색인도 이 거리까지 지운 변형으로 만듦)
+OCR_LEXICON_MAX_DISTANCE = int(os.getenv("OCR_LEXICON_MAX_DISTANCE", "2"))
+
+# 색인 파일 형식 표시
+INDEX_MAGIC = b"KLEX0001"
+
+
+def decompose(word):
+    """음절을 초성/중성/종성 자모로 풂 ('각' → 'ᄀ','ᅡ','ᆨ')"""
+    return unicodedata.normalize('NFD', word)
+
+
+def deletes(jamo, distance):
+    """자모를 distance개까지 지운 모든 변형 (원래 문자열 포함)"""
+    variants = {jamo}
+    frontier = {jamo}
+    for _ in range(distance):
+        frontier = {key[:i] + key[i + 1:]
+                    for key in frontier for i in range(len(key))}
+        variants |= frontier
+    return variants
+
+
+def key_hash(key):
+    """삭제 변형의 64비트 해시 (프로세스가 달라도 같은 값)"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def read_words(path=None):
+    """어휘 목록 파일의 낱말들 (빈 줄, '#' 주석 제외, 중복은 처음 것만)"""
+    words = {}
+    with open(path or OCR_LEXICON_WORDS, encoding='utf-8') as f:
+        for line in f:
+            word = line.strip()
+            if word and not word.startswith('#'):
+                words.setdefault(word, None)
+    return list(words)
+
+
+def _aligned(size):
+    """8바이트 단위로 올림"""
+    return -(-size // 8) * 8
+
+
+def build_index(words, path=None, max_distance=OCR_LEXICON_MAX_DISTANCE):
+    """낱말 목록으로 삭제 색인 파일을 만듦
+
+    파일 형식: INDEX_MAGIC, 헤더 길이(4바이트), JSON 헤더, 8바이트로 정렬한 배열들
+      keys: 삭제 변형 해시 (정렬, uint64)
+      postings: 같은 위치의 낱말 번호 (uint32)
+      word_offsets: 낱말별 UTF-8 시작 위치 (uint32, 낱말 수 + 1개)
+      word_data: 낱말 UTF-8
+    """
+    hashes = []
+    word_ids = []
+    for word_id, word in enumerate(words):
+        for key in deletes(decompose(word), max_distance):
+            hashes.append(key_hash(key))
+            word_ids.append(word_id)
+
+    keys = np.array(hashes, dtype='<u8')
+    order = np.argsort(keys, kind='stable')
+    encoded = [word.encode('utf-8') for word in words]
+    lengths = [0] + [len(data) for data in encoded]
+    arrays = {
+        "keys": keys[order],
+        "postings": np.array(word_ids, dtype='<u4')[order],
+        "word_offsets": np.cumsum(lengths, dtype='<u4'),
+        "word_data": np.frombuffer(b''.join(encoded), dtype='u1'),
+    }
+
+    header = {"max_distance": max_distance, "words": len(words), "arrays": {}}
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = [offset, len(array), array.dtype.str]
+        offset += _aligned(array.nbytes)
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _aligned(len(INDEX_MAGIC) + 4 + len(header_bytes))
+
+    path = path or OCR_LEXICON_INDEX
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(INDEX_MAGIC + struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + header["arrays"][name][0])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(temp_path, path)
+    return path
+
+
+def map_index(path=None):
+    """색인 파일을 메모리 매핑으로 엶 → (매핑, 헤더, {배열 이름: 배열})
+
+    배열은 매핑을 그대로 가리키므로 매핑을 닫기 전까지만 쓸 수 있습니다.
+    """
+    path = path or OCR_LEXICON_INDEX
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        raise ValueError(f"어휘 색인 파일 형식이 아님: {path}")
+    header_length, = struct.unpack_from('<I', mapped, len(INDEX_MAGIC))
+    header_end = len(INDEX_MAGIC) + 4 + header_length
+    header = json.loads(mapped[len(INDEX_MAGIC) + 4:header_end])
+    data_start = _aligned(header_end)
+
+    arrays = {
+        name: np.frombuffer(mapped, dtype=dtype, count=count,
+                            offset=data_start + offset)
+        for name, (offset, count, dtype) in header["arrays"].items()
+    }
+    return mapped, header, arrays
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="어휘 목록으로 자모 삭제 색인 파일 만들기")
+    parser.add_argument("--words", default=OCR_LEXICON_WORDS,
+                        help="어휘 목록 파일")
+    parser.add_argument("--output", default=OCR_LEXICON_INDEX,
+                        help="색인 파일")
+    parser.add_argument("--max-distance", type=int,
+                        default=OCR_LEXICON_MAX_DISTANCE,
+                        help="최대 자모 편집 거리")
+    args = parser.parse_args()
+
+    words = read_words(args.words)
+    build_index(words, args.output, args.max_distance)
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"✅ 어휘 {len(words)}개 색인 저장: {args.output} ({size_kb:.0f}KB)")
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""텍스트 줄 분할
+
+이진화된 손글씨 이미지에서 가로 투영(행별 잉크 픽셀 수)으로 글줄을 찾아
+줄 단위로 잘라냅니다. 잘라낸 줄은 PSM 7(단일 라인)로 병렬 OCR한 뒤
+위에서부터 순서대로 이어 붙입니다.
+"""
+import numpy as np
+
+# 한 페이지에서 찾을 최대 줄 수 (넘으면 노이즈로 보고 줄 분할 포기)
+MAX_LINES = 80
+
+
+def _runs(mask):
+    """참(True)이 연속되는 구간 목록 [(시작, 끝), ...] (끝은 포함하지 않음)"""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def find_text_lines(binary, min_line_height=8, ink_ratio=0.01, margin=4):
+    """글줄 영역 [(x0, y0, x1, y1), ...]을 위에서부터 순서대로 반환
+
+    binary: 흰 배경(255)에 검은 글씨(0)인 2차원 uint8 배열
+    """
+    ink = binary < 128
+    height, width = ink.shape
+    profile = ink.sum(axis=1)
+
+    # 거의 한 줄 전체가 검은 행은 테두리나 공책 줄로 보고 제외
+    profile[profile > width * 0.9] = 0
+
+    rows = profile > max(1, int(width * ink_ratio))
+    bands = _runs(rows)
+
+    # 받침/모음 사이처럼 아주 좁은 빈 틈은 같은 줄로 합침
+    merged = []
+    for start, end in bands:
+        if merged and start - merged[-1][1] < max(2, min_line_height // 2):
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    lines = []
+    for start, end in merged:
+        if end - start < min_line_height:
+            continue
+        columns = _runs(ink[start:end].any(axis=0))
+        if not columns:
+            continue
+        x0, x1 = columns[0][0], columns[-1][1]
+        lines.append((
+            max(0, int(x0) - margin),
+            max(0, int(start) - margin),
+            min(width, int(x1) + margin),
+            min(height, int(end) + margin),
+        ))
+
+    if len(lines) > MAX_LINES:
+        return []
+    return lines
+
+
+def crop_lines(binary, lines):
+    """글줄 영역대로 잘라낸 이미지 목록 (연속 메모리 배열)"""
+    return [np.ascontiguousarray(binary[y0:y1, x0:x1])
+            for x0, y0, x1, y1 in lines]
@@ -1,16 +1,20 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Body
-from fastapi.responses import JSONResponse
+from fastapi import (
+    FastAPI, UploadFile, File, Form, HTTPException, Body, Request)
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import json
+import asyncio
+import time
+from collections import namedtuple
+from contextlib import aclosing
 from datetime import datetime
 import re
+from typing import List, Optional
 
 # OCR 관련 추가 import
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import ImageEnhance, ImageFilter
 import pytesseract
-import io
-import cv2
 import numpy as np
 
 # Tesseract 실행 파일 경로 설정 (Windows)
@@ -27,6 +31,42 @@ import openai
 # 데이터베이스 import
 from database import DatabaseManager
 
+# OCR 병렬 실행기 import
+from ocr_executor import (
+    OCRTask, configure_ocr_executor, ensure_ocr_executor, get_ocr_stats,
+    iter_ocr_results, run_ocr_tasks, shutdown_ocr_executor,
+)
+from ocr_scheduler import PARTIAL_STOP_REASONS, OCRScheduler, ocr_method_name
+from ocr_cache import OCRResultCache, hash_upload
+from image_hash import NearDuplicateIndex, fingerprint
+from ocr_jobs import OCRJobQueue
+from ocr_batch import build_batch_items, iter_batch_results
+from ocr_pages import OCR_MAX_PAGES, PageUpload, iter_page_results
+from line_segmentation import crop_lines, find_text_lines
+from preprocess_graph import PreprocessGraph
+from preprocess_nodes import (
+    GENERAL_VARIANTS, HANDWRITING_VARIANTS, NATIVE_VARIANTS, UPSCALED_VARIANTS,
+)
+from variant_stream import VariantStream
+from gray_image import GrayImage
+from ocr_words import (
+    OCR_LOW_QUALITY_SCORE, confidence_score, mean_confidence,
+    merge_line_pages, pack_page,
+)
+from ocr_fusion import OCR_FUSION_TOP, fuse_results
+from text_stats import text_stats
+from ocr_trace import DEBUG, INFO, attach_trace, in_context, trace, tracing
+from text_patterns import (
+    ENGLISH_PENALTY, MIXED_CASE_LINE, MIXED_CASE_TEXT, NON_WORD_RUN,
+    REPEATED_MARKER, SUSPICIOUS_ENGLISH,
+)
+from korean_correction import CorrectionEngine
+from korean_lexicon import OCR_LEXICON_MIN_CONF, KoreanLexicon, uncertain_tokens
+from image_quality import OCR_QUALITY_ROUTING, QualityRouter
+from image_ingest import (
+    OCR_MAX_IMAGE_PIXELS, ImageTooLargeError, ingest_image, open_image_header,
+)
+
 app = FastAPI(
     title="AI 학생 글 평가 시스템",
     description="손글씨 OCR, AI 피드백, 단계별 평가를 제공하는 교육용 시스템",
@@ -57,132 +97,53 @@ except Exception as e:
 ALLOWED_EXTENSIONS = ["jpg", "jpeg", "png", "bmp", "gif", "tiff", "tif", "webp"]
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+# OCR 워커 풀 설정 (워커에도 같은 Tesseract 경로 전달)
+configure_ocr_executor(pytesseract.pytesseract.tesseract_cmd)
+
+# OCR 후보 스케줄러 (방법별 선택률은 데이터베이스에 누적)
+ocr_scheduler = OCRScheduler(db)
+
+# OCR 파이프라인 버전 (전처리/OCR 방식을 바꾸면 올려서 기존 캐시를 무효화)
+OCR_PIPELINE_VERSION = "11"
+
+# OCR 결과 캐시 (업로드 파일 SHA-256 + 파이프라인 버전 기준)
+ocr_cache = OCRResultCache(OCR_PIPELINE_VERSION, db)
+
+# 학생별 유사 이미지 색인 (같은 종이를 다시 찍은 사진 탐지)
+near_duplicates = NearDuplicateIndex(db)
+
+# 이미지 품질에 맞는 전처리 변형만 고르는 라우터 (규칙은 ocr_routing.json, 선택 결과는 DB에 기록)
+quality_router = QualityRouter.from_file(
+    known_variants=(NATIVE_VARIANTS + UPSCALED_VARIANTS
+                    + HANDWRITING_VARIANTS + GENERAL_VARIANTS),
+    db=db,
+) if OCR_QUALITY_ROUTING else None
+
+# OCR 오인식 교정 엔진 (규칙은 ocr_corrections.json, 서버 시작 시 한 번 컴파일)
+correction_engine = CorrectionEngine.from_file()
+
+# 엔진 신뢰도가 낮은 어절을 가까운 낱말로 고치는 자모 어휘 색인 (korean_words.txt로 만든 색인을 메모리 매핑)
+lexicon = KoreanLexicon.open() if OCR_LEXICON_MIN_CONF > 0 else None
+
+@app.on_event("startup")
+async def start_ocr_workers():
+    """서버 시작 시 OCR 워커 풀 예열"""
+    await ensure_ocr_executor()
+
+@app.on_event("shutdown")
+def stop_ocr_workers():
+    """서버 종료 시 OCR 워커 풀 정리"""
+    shutdown_ocr_executor()
+
 def preprocess_image_for_ocr(image):
     """OCR을 위한 고급 이미지 전처리 (한글 손글씨 특화)"""
-    # PIL 이미지를 numpy 배열로 변환
-    img_array = np.array(image)
-    
-    # 그레이스케일로 변환
-    if len(img_array.shape) == 3:
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-    else:
-        gray = img_array
-    
-    print(f"📸 원본 이미지 크기: {gray.shape}")
-    
-    # 1. 가우시안 블러로 노이즈 제거 (더 강화)
-    denoised = cv2.GaussianBlur(gray, (3, 3), 0)
-    
-    # 2. 샤프닝 필터 적용 (글자 윤곽 선명화)
-    kernel_sharpen = np.array([[-1,-1,-1],
-                              [-1, 9,-1],
-                              [-1,-1,-1]])
-    sharpened = cv2.filter2D(denoised, -1, kernel_sharpen)
-    
-    # 3. 대비 향상 (CLAHE - 더 강한 설정)
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-    enhanced = clahe.apply(sharpened)
-    
-    # 4. 적응형 이진화 (Otsu + Gaussian)
-    # 먼저 Otsu로 임계값 찾기
-    _, otsu_binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    
-    # 적응형 임계값도 적용해서 비교
-    adaptive_binary = cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                           cv2.THRESH_BINARY, 11, 2)
-    
-    # 두 결과를 조합 (더 나은 결과 선택)
-    combined_binary = cv2.bitwise_and(otsu_binary, adaptive_binary)
-    
-    # 5. 모폴로지 연산으로 글자 개선
-    # 작은 노이즈 제거
-    kernel_noise = np.ones((2,2), np.uint8)
-    cleaned = cv2.morphologyEx(combined_binary, cv2.MORPH_OPEN, kernel_noise)
-    
-    # 글자 두께 보정
-    kernel_close = np.ones((1,1), np.uint8)
-    processed = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, kernel_close)
-    
-    # 6. 텍스트 영역 확대 (OCR 성능 향상)
-    # 텍스트가 있는 영역을 찾아서 확대
-    contours, _ = cv2.findContours(processed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    if contours:
-        # 가장 큰 텍스트 영역 찾기
-        largest_contour = max(contours, key=cv2.contourArea)
-        x, y, w, h = cv2.boundingRect(largest_contour)
-        
-        # 여백 추가
-        margin = 20
-        x = max(0, x - margin)
-        y = max(0, y - margin)
-        w = min(processed.shape[1] - x, w + 2*margin)
-        h = min(processed.shape[0] - y, h + 2*margin)
-        
-        # 텍스트 영역만 추출
-        text_area = processed[y:y+h, x:x+w]
-        
-        # 충분히 큰 영역이면 사용
-        if w > 50 and h > 30:
-            processed = text_area
-            print(f"✂️ 텍스트 영역 추출: {w}x{h}")
-    
-    print(f"🔧 전처리 완료: {processed.shape}")
-    
-    # numpy 배열을 다시 PIL 이미지로 변환
-    return Image.fromarray(processed)
+    return PreprocessGraph(image).image("기본전처리")
 
-def create_multiple_preprocessed_images(image):
-    """다양한 전처리 방법으로 이미지 여러 버전 생성"""
-    images = []
-    
-    # PIL 이미지를 numpy 배열로 변환
-    img_array = np.array(image)
-    
-    # 그레이스케일로 변환
-    if len(img_array.shape) == 3:
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-    else:
-        gray = img_array
-    
-    print(f"🎨 다중 전처리 시작: {gray.shape}")
-    
-    # 1. 기본 전처리 (위의 함수와 동일)
-    basic_processed = preprocess_image_for_ocr(image)
-    images.append(("기본전처리", basic_processed))
-    
-    # 2. 고대비 버전
-    try:
-        # 히스토그램 평활화
-        equalized = cv2.equalizeHist(gray)
-        # 강한 이진화
-        _, high_contrast = cv2.threshold(equalized, 127, 255, cv2.THRESH_BINARY)
-        images.append(("고대비", Image.fromarray(high_contrast)))
-    except:
-        pass
-    
-    # 3. 부드러운 버전 (노이즈가 많은 이미지용)
-    try:
-        # 강한 블러 후 샤프닝
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        kernel = np.array([[0,-1,0], [-1,5,-1], [0,-1,0]])
-        soft_sharp = cv2.filter2D(blurred, -1, kernel)
-        _, soft_binary = cv2.threshold(soft_sharp, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        images.append(("부드러운처리", Image.fromarray(soft_binary)))
-    except:
-        pass
-    
-    # 4. 침식-팽창 버전 (얇은 글씨용)
-    try:
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        kernel = np.ones((2,2), np.uint8)
-        eroded = cv2.erode(binary, kernel, iterations=1)
-        dilated = cv2.dilate(eroded, kernel, iterations=1)
-        images.append(("침식팽창", Image.fromarray(dilated)))
-    except:
-        pass
-    
-    print(f"🎨 전처리 완료: {len(images)}개 버전 생성")
+def create_multiple_preprocessed_images(image, graph=None):
+    """다양한 전처리 방법으로 이미지 여러 버전 생성 (graph를 주면 중간 결과를 공유)"""
+    graph = graph or PreprocessGraph(image)
+    images = graph.variants(GENERAL_VARIANTS)
+    trace.info("🎨 전처리 완료: {}개 버전 생성", len(images))
     return images
 
 def clean_ocr_text(text):
@@ -192,40 +153,27 @@ def clean_ocr_text(text):
     
     # 1. 기본 정리
     cleaned = text.strip()
+    stats = text_stats(cleaned)
     
-    # 2. 한글이 영어로 잘못 인식된 패턴 감지 (강화된 버전)
-    suspicious_english_patterns = [
-        r'^[a-zA-Z\s]{1,3}$',  # 너무 짧은 영문
-        r'^[oOsS][a-zA-Z\s]*$',  # 'o', 'S' 등으로 시작하는 의심스러운 패턴
-        r'[a-zA-Z]{1,2}\s+[a-zA-Z]{1,2}\s+[a-zA-Z]{1,2}',  # 짧은 영단어들이 연속으로
-        r'^[a-zA-Z]{1,2}\s+[a-zA-Z]+\s+[a-zA-Z]{1,2}',  # 패턴: "oS witty Ee"
-        r'[oOsSa-zA-Z]+\s+[wW][a-zA-Z]+\s+[eE][a-zA-Z]*',  # "oS witty Ee" 패턴
-        r'^[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+',  # 5개 이상 짧은 영단어
-        r'[oO][sS]\s+[a-zA-Z]+',  # "oS" 또는 "OS"로 시작하는 패턴
-        r'[eE][eE]\s+[oO][dD]',  # "Ee OD" 패턴
-        r'a[eE]\s+[a-zA-Z]+ee',  # "ae ataanee" 패턴
-    ]
-    
-    # 한글이 포함되지 않고 위 패턴에 해당하면 의심스러운 결과
-    korean_chars = sum(1 for c in cleaned if '가' <= c <= '힣')
-    if korean_chars == 0:
-        for pattern in suspicious_english_patterns:
-            if re.search(pattern, cleaned.strip(), re.IGNORECASE):
-                print(f"🔍 의심스러운 영어 패턴 감지: '{cleaned}' -> 패턴: {pattern}")
-                return ""  # 의심스러운 영어 패턴은 제거
+    # 2. 한글이 영어로 잘못 인식된 패턴 감지 (패턴 목록은 text_patterns.SUSPICIOUS_ENGLISH)
+    # 한글이 포함되지 않고 패턴에 해당하면 의심스러운 결과
+    if stats.hangul == 0:
+        pattern = SUSPICIOUS_ENGLISH.search(cleaned)
+        if pattern:
+            trace.debug("🔍 의심스러운 영어 패턴 감지: '{}' -> 패턴: {}", cleaned, pattern)
+            return ""  # 의심스러운 영어 패턴은 제거
         
         # 추가 검증: 전체 텍스트가 의미없는 영어 조합인지 확인
-        words = cleaned.split()
-        if len(words) >= 3:
+        if stats.word_count >= 3:
             # 3단어 이상인데 모두 3글자 이하의 영단어들이면 의심
-            short_words = [w for w in words if len(w) <= 3 and w.isalpha()]
-            if len(short_words) >= len(words) * 0.7:  # 70% 이상이 짧은 영단어
-                print(f"🔍 의심스러운 짧은 영단어 조합 감지: '{cleaned}'")
+            # 70% 이상이 짧은 영단어
+            if stats.short_alpha_words >= stats.word_count * 0.7:
+                trace.debug("🔍 의심스러운 짧은 영단어 조합 감지: '{}'", cleaned)
                 return ""
         
         # 대소문자가 불규칙하게 혼재된 패턴 감지
-        if re.search(r'[a-z][A-Z][a-z].*[A-Z][a-z]', cleaned):
-            print(f"🔍 불규칙한 대소문자 패턴 감지: '{cleaned}'")
+        if MIXED_CASE_TEXT.search(cleaned):
+            trace.debug("🔍 불규칙한 대소문자 패턴 감지: '{}'", cleaned)
             return ""
     
     # 3. 의미없는 단일 문자나 특수문자 제거
@@ -234,18 +182,18 @@ def clean_ocr_text(text):
                         '\\', ':', ';', '"', "'", '<', '>', '?', '/', '¥', '₩']
     
     # 4. 줄별로 처리
-    lines = cleaned.split('\n')
     valid_lines = []
+    final_korean = final_english = 0
     
-    for line in lines:
-        line = line.strip()
+    for line_stats in stats.lines:
+        line = line_stats.text.strip()
         if not line:
             continue
         
         # 한글 문자 개수 확인
-        line_korean_chars = sum(1 for c in line if '가' <= c <= '힣')
-        line_english_chars = sum(1 for c in line if c.isalpha() and c.isascii())
-        line_total_chars = len(line.replace(' ', ''))
+        line_korean_chars = line_stats.hangul
+        line_english_chars = line_stats.ascii_letters
+        line_total_chars = line_stats.total
         
         # 너무 짧은 줄 필터링 (1-2글자이고 의미없는 문자들)
         if len(line) <= 2:
@@ -259,64 +207,60 @@ def clean_ocr_text(text):
         # 한글이 없고 영어만 있는 경우 더 엄격하게 검사
         if line_korean_chars == 0 and line_english_chars > 0:
             # 3글자 미만의 영어 단어들만 있으면 제거
-            english_words = re.findall(r'[a-zA-Z]+', line)
-            if all(len(word) < 3 for word in english_words):
+            if line_stats.longest_ascii_run < 3:
                 continue
             # 대소문자가 혼재된 이상한 패턴 제거
-            if re.search(r'[a-z][A-Z][a-z]|[A-Z][a-z][A-Z]', line):
+            if MIXED_CASE_LINE.search(line):
                 continue
             
             # 줄 전체가 의심스러운 영어 패턴인지 재검사
-            for pattern in suspicious_english_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    print(f"🔍 줄별 영어 오인식 패턴 감지: '{line}'")
-                    line = ""  # 해당 줄 제거
-                    break
+            if SUSPICIOUS_ENGLISH.search(line):
+                trace.debug("🔍 줄별 영어 오인식 패턴 감지: '{}'", line)
+                line = ""  # 해당 줄 제거
         
         # 빈 줄이 되었으면 건너뛰기
         if not line:
             continue
         
         # 5. 깨진 글자 패턴 제거
-        special_chars = sum(1 for c in line if not c.isalnum() and not '가' <= c <= '힣' and c != ' ')
-        
         if line_total_chars > 0:
-            special_ratio = special_chars / line_total_chars
+            special_ratio = line_stats.special / line_total_chars
             # 특수문자가 50% 이상이면 의미없는 텍스트로 간주
             if special_ratio > 0.5:
                 continue
         
         # 6. 의미있는 단어가 포함된 줄만 유지
-        korean_words = re.findall(r'[가-힣]{2,}', line)
-        english_words = re.findall(r'[a-zA-Z]{3,}', line)
+        korean_words = line_stats.longest_hangul_run >= 2
+        english_words = line_stats.longest_ascii_run >= 3
         
         # 한글이 우선, 영어는 더 긴 단어만 인정
         if korean_words or (line_korean_chars >= 2) or english_words:
-            # 7. 특수문자 정리
-            cleaned_line = re.sub(r'[^\w\s가-힣]', ' ', line)  # 특수문자를 공백으로
-            cleaned_line = re.sub(r'\s+', ' ', cleaned_line)   # 연속 공백을 하나로
-            cleaned_line = cleaned_line.strip()
+            # 7. 특수문자 정리 (특수문자와 연속 공백을 공백 하나로)
+            cleaned_line = NON_WORD_RUN.sub(' ', line).strip()
             
             if cleaned_line and len(cleaned_line) >= 2:
                 valid_lines.append(cleaned_line)
+                # 특수문자만 공백으로 바뀌므로 한글/영문 수는 줄 통계 그대로
+                final_korean += line_korean_chars
+                final_english += line_english_chars
     
     result = '\n'.join(valid_lines)
     
     # 8. 최종 검증 (한글 우선) - 더 엄격한 조건
     if result:
-        final_korean = sum(1 for c in result if '가' <= c <= '힣')
-        final_english = sum(1 for c in result if c.isalpha() and c.isascii())
-        
         # 한글이 있으면 우선 채택
         if final_korean >= 2:
-            print(f"✅ 한글 텍스트 채택: '{result[:50]}...' (한글 {final_korean}자)")
+            trace.debug("✅ 한글 텍스트 채택: '{:.50}...' (한글 {}자)",
+                        result, final_korean)
             return result
         # 한글이 없어도 의미있는 영어 단어가 있으면 채택 (더 엄격한 조건)
         elif final_english >= 6:  # 최소 6글자 이상의 영어 (더 엄격)
-            print(f"⚠️ 영어 텍스트 채택: '{result[:50]}...' (영어 {final_english}자)")
+            trace.debug("⚠️ 영어 텍스트 채택: '{:.50}...' (영어 {}자)",
+                        result, final_english)
             return result
         else:
-            print(f"❌ 텍스트 품질 부족으로 제거: '{result}' (한글 {final_korean}자, 영어 {final_english}자)")
+            trace.debug("❌ 텍스트 품질 부족으로 제거: '{}' (한글 {}자, 영어 {}자)",
+                        result, final_korean, final_english)
     
     return ""
 
@@ -328,101 +272,105 @@ def clean_korean_ocr_text(text):
     # 1. 기본 정리
     cleaned = text.strip()
     
-    print(f"🔤 원본 텍스트: '{cleaned}'")
+    trace.debug("🔤 원본 텍스트: '{}'", cleaned)
+    stats = text_stats(cleaned)
     
     # 2. 숫자와 한글 혼재 비율 체크
-    korean_chars = sum(1 for c in cleaned if '가' <= c <= '힣')
-    digit_chars = sum(1 for c in cleaned if c.isdigit())
-    total_chars = len(cleaned.replace(' ', '').replace('\n', ''))
+    korean_chars = stats.hangul
+    digit_chars = stats.digits
+    total_chars = stats.total
     
     if total_chars > 0:
         digit_ratio = digit_chars / total_chars
         korean_ratio = korean_chars / total_chars
         
-        print(f"📊 문자 분석: 한글 {korean_chars}자({korean_ratio:.1%}), 숫자 {digit_chars}자({digit_ratio:.1%})")
+        trace.debug("📊 문자 분석: 한글 {}자({:.1%}), 숫자 {}자({:.1%})",
+                    korean_chars, korean_ratio, digit_chars, digit_ratio)
         
         # 숫자가 30% 이상이면 품질이 낮은 것으로 판단
         if digit_ratio > 0.3:
-            print(f"❌ 숫자 비율 과다: {digit_ratio:.1%} > 30%")
+            trace.debug("❌ 숫자 비율 과다: {:.1%} > 30%", digit_ratio)
             return ""
         
         # 한글이 50% 미만이면 품질이 낮은 것으로 판단
         if korean_ratio < 0.5:
-            print(f"❌ 한글 비율 부족: {korean_ratio:.1%} < 50%")
+            trace.debug("❌ 한글 비율 부족: {:.1%} < 50%", korean_ratio)
             return ""
     
-    # 3. 의미없는 한글 패턴 감지
-    korean_text_only = re.sub(r'[^가-힣\s]', '', cleaned)
-    korean_words = korean_text_only.split()
+    # 3. 의미없는 한글 패턴 감지 (공백으로 나눈 단어마다 한글 글자 수)
+    word_lengths = stats.word_length_histogram
+    word_count = sum(word_lengths.values())
     
-    if korean_words:
+    if word_count:
         # 한글 단어들의 길이 분석
-        word_lengths = [len(word) for word in korean_words if len(word) > 0]
-        avg_word_length = sum(word_lengths) / len(word_lengths) if word_lengths else 0
+        avg_word_length = sum(length * count for length, count
+                              in word_lengths.items()) / word_count
         
-        print(f"📝 한글 단어 분석: {len(korean_words)}개 단어, 평균 길이: {avg_word_length:.1f}자")
+        trace.debug("📝 한글 단어 분석: {}개 단어, 평균 길이: {:.1f}자",
+                    word_count, avg_word_length)
         
         # 너무 짧은 단어들만 있으면 품질 의심
         if avg_word_length < 1.5:
-            print(f"❌ 단어 길이 부족: 평균 {avg_word_length:.1f}자 < 1.5자")
+            trace.debug("❌ 단어 길이 부족: 평균 {:.1f}자 < 1.5자", avg_word_length)
             return ""
         
         # 1글자 단어가 80% 이상이면 품질 의심
-        short_words = [w for w in korean_words if len(w) == 1]
-        if len(korean_words) > 0 and len(short_words) / len(korean_words) > 0.8:
-            print(f"❌ 1글자 단어 과다: {len(short_words)}/{len(korean_words)}개")
+        short_words = word_lengths.get(1, 0)
+        if short_words / word_count > 0.8:
+            trace.debug("❌ 1글자 단어 과다: {}/{}개", short_words, word_count)
             return ""
     
-    # 4. 의미없는 연속 문자 패턴 감지
+    # 4. 의미없는 연속 문자 패턴 감지 (자모 연속은 통계에서)
     suspicious_korean_patterns = [
-        r'[ㄱ-ㅎ]{2,}',  # 자음만 연속
-        r'[ㅏ-ㅣ]{2,}',  # 모음만 연속
-        r'같은문자{3,}',  # 같은 문자 3번 이상 반복 (일반적 패턴)
+        (r'[ㄱ-ㅎ]{2,}', stats.has_consonant_run),  # 자음만 연속
+        (r'[ㅏ-ㅣ]{2,}', stats.has_vowel_run),      # 모음만 연속
+        # 같은 문자 3번 이상 반복 (일반적 패턴)
+        (REPEATED_MARKER.pattern, REPEATED_MARKER.search(cleaned)),
     ]
     
-    for pattern in suspicious_korean_patterns:
-        if re.search(pattern, cleaned):
-            print(f"❌ 의심스러운 한글 패턴 감지: {pattern}")
+    for pattern, found in suspicious_korean_patterns:
+        if found:
+            trace.debug("❌ 의심스러운 한글 패턴 감지: {}", pattern)
             return ""
     
     # 5. 줄별 처리 및 정리
-    lines = cleaned.split('\n')
     valid_lines = []
+    final_korean = final_total = 0
     
-    for line in lines:
-        line = line.strip()
+    for line_stats in stats.lines:
+        line = line_stats.text.strip()
         if not line:
             continue
         
         # 줄별 한글 비율 확인
-        line_korean = sum(1 for c in line if '가' <= c <= '힣')
-        line_total = len(line.replace(' ', ''))
+        line_korean = line_stats.hangul
+        line_total = line_stats.total
         
         if line_total > 0 and line_korean / line_total >= 0.6:  # 60% 이상 한글
             # 특수문자와 불필요한 공백 정리
-            cleaned_line = re.sub(r'[^\w\s가-힣]', ' ', line)
-            cleaned_line = re.sub(r'\s+', ' ', cleaned_line)
-            cleaned_line = cleaned_line.strip()
+            cleaned_line = NON_WORD_RUN.sub(' ', line).strip()
             
             if len(cleaned_line) >= 2:  # 최소 2글자 이상
                 valid_lines.append(cleaned_line)
-                print(f"✅ 유효한 줄: '{cleaned_line}'")
+                # 정리 후 남는 글자는 \w 글자뿐 (나머지는 공백으로 바뀜)
+                final_korean += line_korean
+                final_total += line_stats.word_chars
+                trace.debug("✅ 유효한 줄: '{}'", cleaned_line)
     
     result = '\n'.join(valid_lines)
     
     # 6. 최종 검증
     if result:
-        final_korean = sum(1 for c in result if '가' <= c <= '힣')
-        final_total = len(result.replace(' ', '').replace('\n', ''))
-        
         if final_total > 0:
             final_korean_ratio = final_korean / final_total
             
             if final_korean_ratio >= 0.7 and final_korean >= 4:  # 70% 이상 한글, 최소 4글자
-                print(f"✅ 한글 텍스트 품질 양호: '{result}' (한글 {final_korean_ratio:.1%})")
+                trace.debug("✅ 한글 텍스트 품질 양호: '{}' (한글 {:.1%})",
+                            result, final_korean_ratio)
                 return result
             else:
-                print(f"❌ 최종 품질 부족: 한글 {final_korean_ratio:.1%}, {final_korean}글자")
+                trace.debug("❌ 최종 품질 부족: 한글 {:.1%}, {}글자",
+                            final_korean_ratio, final_korean)
     
     return ""
 
@@ -431,10 +379,11 @@ def analyze_korean_text_quality(text):
     if not text:
         return 0, "텍스트 없음", {}
     
-    korean_chars = sum(1 for c in text if '가' <= c <= '힣')
-    digit_chars = sum(1 for c in text if c.isdigit())
-    english_chars = sum(1 for c in text if c.isalpha() and c.isascii())
-    total_chars = len(text.replace(' ', '').replace('\n', ''))
+    stats = text_stats(text)
+    korean_chars = stats.hangul
+    digit_chars = stats.digits
+    english_chars = stats.ascii_letters
+    total_chars = stats.total
     
     if total_chars == 0:
         return 0, "빈 텍스트", {}
@@ -461,10 +410,10 @@ def analyze_korean_text_quality(text):
         score += 20
     
     # 3. 한글 단어 품질 (최대 20점)
-    korean_words = re.findall(r'[가-힣]{2,}', text)
+    korean_words = stats.hangul_words
     if korean_words:
-        word_score = min(len(korean_words) * 3, 15)  # 단어 개수
-        avg_length = sum(len(w) for w in korean_words) / len(korean_words)
+        word_score = min(korean_words * 3, 15)  # 단어 개수
+        avg_length = stats.mean_hangul_word_length
         if avg_length >= 2:
             word_score += 5  # 단어 길이 보너스
         score += word_score
@@ -479,7 +428,7 @@ def analyze_korean_text_quality(text):
         score += 10
     
     # 6. 문장 구조 보너스 (10점)
-    if korean_chars >= 6 and ' ' in text:  # 공백이 있고 충분한 길이
+    if korean_chars >= 6 and stats.spaces:  # 공백이 있고 충분한 길이
         score += 10
     
     score = max(0, min(100, int(score)))
@@ -504,12 +453,13 @@ def evaluate_ocr_quality(text):
         return 0, "텍스트 없음"
     
     # 한글, 영문, 숫자, 특수문자 비율 계산
-    korean_count = sum(1 for c in text if '가' <= c <= '힣')
-    english_count = sum(1 for c in text if c.isalpha() and c.isascii())
-    digit_count = sum(1 for c in text if c.isdigit())
-    special_count = sum(1 for c in text if not c.isalnum() and not '가' <= c <= '힣' and c != ' ')
+    stats = text_stats(text)
+    korean_count = stats.hangul
+    english_count = stats.ascii_letters
+    digit_count = stats.digits
+    special_count = stats.special
     
-    total_count = len(text.replace(' ', '').replace('\n', ''))
+    total_count = stats.total
     
     if total_count == 0:
         return 0, "빈 텍스트"
@@ -524,11 +474,12 @@ def evaluate_ocr_quality(text):
         quality_score += 25  # 한글 존재 보너스 (증가)
         
         # 한글 단어 개수 보너스
-        korean_words = len(re.findall(r'[가-힣]{2,}', text))
+        korean_words = stats.hangul_words
         if korean_words > 0:
             quality_score += min(korean_words * 5, 20)  # 한글 단어 보너스 증가
         
-        print(f"✅ 한글 발견: {korean_count}자 ({korean_ratio:.1%}), 단어: {korean_words}개")
+        trace.debug("✅ 한글 발견: {}자 ({:.1%}), 단어: {}개",
+                    korean_count, korean_ratio, korean_words)
     
     # 2. 영문 비율 (한글이 없을 때만 적용)
     if korean_count == 0:
@@ -536,29 +487,21 @@ def evaluate_ocr_quality(text):
         quality_score += english_ratio * 30  # 영어만 있을 때 기본 점수 감소
         
         # 영어 오인식 패턴 감지 및 페널티
-        words = text.split()
-        if len(words) >= 3:
+        if stats.word_count >= 3:
             # 짧은 영단어들이 많으면 페널티
-            short_words = [w for w in words if len(w) <= 3 and w.isalpha()]
-            if len(short_words) >= len(words) * 0.6:  # 60% 이상이 짧은 영단어
+            # 60% 이상이 짧은 영단어
+            if stats.short_alpha_words >= stats.word_count * 0.6:
                 quality_score -= 40  # 강한 페널티
-                print(f"⚠️ 영어 오인식 의심: 짧은 영단어 {len(short_words)}/{len(words)}개")
-        
-        # 특정 의심스러운 패턴 감지
-        suspicious_patterns = [
-            r'[oO][sS]\s+[a-zA-Z]+',  # "oS witty" 패턴
-            r'[eE][eE]\s+[oO][dD]',   # "Ee OD" 패턴  
-            r'a[eE]\s+[a-zA-Z]+ee',   # "ae ataanee" 패턴
-            r'[a-z][A-Z][a-z].*[A-Z][a-z]',  # 불규칙한 대소문자
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                quality_score -= 50  # 매우 강한 페널티
-                print(f"❌ 영어 오인식 패턴 감지: {pattern}")
-                break
+                trace.debug("⚠️ 영어 오인식 의심: 짧은 영단어 {}/{}개",
+                            stats.short_alpha_words, stats.word_count)
         
-        print(f"⚠️ 영어만 감지: {english_count}자 ({english_ratio:.1%})")
+        # 특정 의심스러운 패턴 감지 (패턴 목록은 text_patterns.ENGLISH_PENALTY)
+        pattern = ENGLISH_PENALTY.search(text)
+        if pattern:
+            quality_score -= 50  # 매우 강한 페널티
+            trace.debug("❌ 영어 오인식 패턴 감지: {}", pattern)
+        
+        trace.debug("⚠️ 영어만 감지: {}자 ({:.1%})", english_count, english_ratio)
     
     # 3. 숫자 비율
     digit_ratio = digit_count / total_count
@@ -604,268 +547,383 @@ def evaluate_ocr_quality(text):
         else:
             quality_desc = "매우 나쁨 (영어)"
     
-    print(f"📊 품질 평가: {quality_score}점 ({quality_desc}) - 한글:{korean_count}자, 영어:{english_count}자")
+    trace.debug("📊 품질 평가: {}점 ({}) - 한글:{}자, 영어:{}자",
+                quality_score, quality_desc, korean_count, english_count)
     
     return quality_score, quality_desc
 
-def try_multiple_ocr_methods(image):
-    """손글씨 특화 확장 OCR 방법으로 텍스트 추출 시도"""
-    results = []
-    
-    print("🔍 손글씨 특화 OCR 시작!")
-    
-    # 1. 손글씨 특화 이미지 변형 생성
-    handwriting_variants = create_handwriting_variants(image)
-    
-    # 2. 기존 일반 전처리 이미지들도 생성
-    general_variants = create_multiple_preprocessed_images(image)
+# 페이지 전체에 적용하는 PSM 모드들
+# (라인/단어 단위 인식은 줄 분할 후 줄마다 따로 실행)
+PSM_MODES = [
+    (6, "균등분할"),    # 단일 텍스트 블록 
+    (4, "단일컬럼"),    # 단일 컬럼
+]
+
+# 한영 혼합도 시도하는 PSM 모드 (백업용, 일반적인 PSM만)
+MIXED_LANG_PSMS = [6]
+
+# 줄 분할 OCR 설정 (손글씨 전처리 결과에서 줄을 찾아 줄마다 인식)
+LINE_VARIANT_NAME = "손글씨_라인분할"
+LINE_PSM = 7  # 단일 텍스트 라인
+
+# 다중 해상도 모드: 원본 크기 변형으로 먼저 인식하고,
+# 품질이 낮을 때만 2~3배 확대 변형으로 다시 시도 (0이면 모든 변형을 한 번에)
+OCR_MULTI_RESOLUTION = os.getenv("OCR_MULTI_RESOLUTION", "1") != "0"
+
+# 원본 크기 결과의 한글 품질 점수가 이 값 미만이면 확대 변형으로 넘어감
+OCR_ESCALATE_SCORE = int(os.getenv("OCR_ESCALATE_SCORE", "60"))
+
+# OCR 단계: 이름, 줄 분할 원본 변형, 줄 분할 결과 변형 이름, 페이지 OCR 변형들
+OCRStage = namedtuple(
+    "OCRStage", ["name", "line_source", "line_variant", "variants"])
+
+if OCR_MULTI_RESOLUTION:
+    OCR_STAGES = [
+        OCRStage("원본크기", "손글씨_원본크기",
+                 f"{LINE_VARIANT_NAME}_원본크기", NATIVE_VARIANTS),
+        OCRStage("확대", "손글씨_기본", LINE_VARIANT_NAME, UPSCALED_VARIANTS),
+    ]
+else:
+    OCR_STAGES = [
+        OCRStage("전체", "손글씨_기본", LINE_VARIANT_NAME,
+                 HANDWRITING_VARIANTS + GENERAL_VARIANTS),
+    ]
+
+def load_line_source(graph, name):
+    """줄 분할에 쓸 변형 이미지 배열 (전처리 실패 시 None)"""
+    try:
+        return graph.get(name)
+    except Exception as e:
+        trace.warning("⚠️ {} 전처리 실패: {}", name, e)
+        return None
+
+def build_ocr_tasks(variants):
+    """이미지 변형 × PSM × 언어 조합으로 OCR 작업 목록 생성"""
+    tasks = []
+    for variant_name, processed_image in variants:
+        for psm, psm_desc in PSM_MODES:
+            # 한국어 전용 시도
+            tasks.append(OCRTask(variant_name, processed_image, psm, 'kor'))
+            # 한영 혼합도 시도 (백업용)
+            if psm in MIXED_LANG_PSMS:
+                tasks.append(OCRTask(
+                    variant_name, processed_image, psm, 'kor+eng'))
+    return tasks
+
+def method_bonus(task):
+    """전처리 변형/PSM/언어별 보너스 (한글 품질 점수에 더함)"""
+    bonus = 0
+    if task.lang == 'kor':
+        # 손글씨 특화 보너스
+        if "손글씨" in task.variant_name:
+            bonus += 25  # 손글씨 전처리 보너스
+        if task.psm in [8, 13]:  # 손글씨에 좋은 PSM
+            bonus += 15
+        else:
+            bonus += 10
+    else:
+        # 혼합 모드는 보너스 적게
+        if "손글씨" in task.variant_name:
+            bonus += 15
+        bonus += 5
+    return bonus
+
+def rate_ocr_text(text, bonus, confidence):
+    """정리된 텍스트의 (점수, 설명, 분석)
+    
+    한글 품질 휴리스틱에 방법별 보너스를 더하고(최대 100) 엔진 신뢰도 비율을 곱하므로,
+    신뢰도가 있든 없든 모든 후보의 점수를 서로 비교할 수 있습니다.
+    """
+    quality, desc, analysis = analyze_korean_text_quality(text)
+    analysis = {**analysis, "method_bonus": bonus, "confidence": confidence}
+    return confidence_score(quality + bonus, confidence), desc, analysis
+
+def score_ocr_output(task, page):
+    """OCR 결과(OCRPage)를 정리하고 점수를 매김 (품질 부족이면 None)"""
+    uncertain = uncertain_tokens(page.words) if lexicon is not None else ()
+    cleaned_text = enhance_korean_ocr_result(page.text, uncertain)
+    if not cleaned_text:
+        return None
+    
+    score, desc, analysis = rate_ocr_text(
+        cleaned_text, method_bonus(task), mean_confidence(page.words))
+    return (ocr_method_name(task), cleaned_text, score, desc, analysis, page)
+
+async def ocr_text_lines(binary_image, variant_name=LINE_VARIANT_NAME):
+    """이진화된 손글씨 이미지를 줄 단위로 나눠 병렬 OCR 후 위에서부터 이어 붙임
+    
+    (이어 붙인 OCRPage, 찾은 줄 수)를 반환합니다. 줄을 못 찾으면 (None, 0)
+    단어 상자는 줄 이미지가 아니라 binary_image 좌표로 옮겨 둡니다.
+    """
+    if binary_image is None:
+        return None, 0
+    
+    binary = np.asarray(binary_image)
+    lines = find_text_lines(binary)
+    if not lines:
+        return None, 0
+    
+    trace.info("📏 줄 분할: {}줄 발견", len(lines))
+    tasks = [
+        OCRTask(variant_name, GrayImage(crop), LINE_PSM, 'kor')
+        for crop in crop_lines(binary, lines)
+    ]
+    outputs = await run_ocr_tasks(tasks)
+    
+    pages, boxes = [], []
+    for output, box in zip(outputs, lines):
+        if isinstance(output, Exception):
+            trace.warning("❌ 줄 OCR 오류: {}", output)
+        elif output.text.strip():
+            pages.append(output)
+            boxes.append(box)
+    height, width = binary.shape[:2]
+    return merge_line_pages(pages, boxes, (width, height)), len(lines)
+
+async def run_ocr_stage(stage, graph, search):
+    """한 단계(해상도)의 줄 분할 OCR + 페이지 OCR 실행
+    
+    search: 단계 사이에 공유하는 상태
+            (results, tried_methods, best_score, started, routing)
+    반환값은 이 단계의 디버그 정보(dict)
+    """
+    loop = asyncio.get_running_loop()
+    results = search["results"]
+    tried_methods = search["tried_methods"]
+    executed_before = len(tried_methods)
+    
+    # 1단계: 줄 분할 OCR (줄마다 PSM 7로 병렬 인식)
+    # 이미지 변형 생성도 CPU 작업이므로 이벤트 루프 밖에서 실행
+    line_source = await loop.run_in_executor(
+        None, in_context(load_line_source), graph, stage.line_source)
+    line_task = OCRTask(stage.line_variant, None, LINE_PSM, 'kor')
+    line_page, line_count = await ocr_text_lines(line_source,
+                                                 stage.line_variant)
+    del line_source
+    if line_page is not None:
+        tried_methods.append(ocr_method_name(line_task))
+        result = score_ocr_output(line_task, line_page)
+        if result:
+            results.append(result)
+            search["best_score"] = max(search["best_score"] or 0, result[2])
+            trace.info("✅ 줄 분할 OCR 성공: '{:.40}...' (품질: {}점)",
+                       result[1], result[2])
+    
+    # 2단계: 페이지 전체 OCR (줄 분할 결과가 충분하면 건너뜀)
+    # 변형은 실행 순서대로 하나씩 만들고, 그 변형의 작업이 모두 끝나면 바로 해제
+    # 품질 라우팅을 켰으면 이 사진에 고른 변형만 실행
+    routed = search["routing"]["variants"] if search["routing"] else None
+    variants = [name for name in stage.variants
+                if routed is None or name in routed]
+    stop_reason = ocr_scheduler.stop_reason(
+        search["best_score"], search["started"], len(results))
+    tasks = [] if stop_reason else ocr_scheduler.order(
+        build_ocr_tasks([(name, None) for name in variants]))
+    stream = VariantStream(graph, tasks)
+    trace.info("⚙️ [{}] 페이지 OCR 작업 {}개를 선택률 순으로 실행", stage.name, len(tasks))
+    
+    async with aclosing(iter_ocr_results(stream.tasks())) as outputs:
+        async for task, output in outputs:
+            stream.task_done(task)
+            tried_methods.append(ocr_method_name(task))
+            label = ocr_method_name(task)
+            if isinstance(output, Exception):
+                trace.warning("❌ {} 오류: {}", label, output)
+            else:
+                result = score_ocr_output(task, output)
+                if result:
+                    results.append(result)
+                    search["best_score"] = max(search["best_score"] or 0,
+                                               result[2])
+                    trace.debug("✅ {} 성공: '{:.40}...' (품질: {}점)",
+                                label, result[1], result[2])
+                else:
+                    trace.debug("❌ {} 품질 부족으로 제거됨", label)
+            
+            stop_reason = ocr_scheduler.stop_reason(
+                search["best_score"], search["started"], len(results))
+            if stop_reason:
+                trace.info("⏹️ 조기 종료 ({}): {}개 실행",
+                           stop_reason, len(tried_methods))
+                break
+    stream.close()
     
-    # 모든 이미지 변형들 결합
-    all_variants = handwriting_variants + general_variants
+    return {
+        "stage": stage.name,
+        "text_lines": line_count,
+        "candidates": len(tasks) + (1 if line_page is not None else 0),
+        "executed": len(tried_methods) - executed_before,
+        "variants_built": len(stream.produced),
+        "stop_reason": stop_reason,
+    }
+
+def route_variants(graph):
+    """이미지 품질 지표로 실행할 페이지 OCR 변형 선택 (라우팅을 끄면 None)"""
+    if quality_router is None:
+        return None
+    metrics = graph.get("image_quality")
+    variants, matched = quality_router.route(metrics)
+    trace.info("🧭 이미지 품질 {} → 규칙 {}, 변형 {}", metrics, matched or '없음', variants)
+    return {"metrics": metrics, "rules": matched, "variants": variants}
+
+def fuse_ocr_results(results):
+    """점수 상위 결과를 글자 단위로 융합한 결과 (채택하지 않으면 None)
     
-    print(f"🎨 총 {len(all_variants)}개 이미지 변형 생성")
+    점수를 가중치로 글자마다 투표하고, 융합 텍스트는 최고 결과와 같은 방법 보너스로
+    다시 채점해서 최고 결과보다 높을 때만 채택합니다. 단어 상자는 최고 결과의 것을 씁니다.
+    """
+    def rate(text, confidence, best):
+        return rate_ocr_text(text, best[4].get("method_bonus", 0), confidence)
     
-    # 각 이미지 변형에 대해 손글씨 특화 OCR 방법들 시도
-    for variant_name, processed_image in all_variants:
-        print(f"\n🖼️ {variant_name} 이미지로 OCR 시도...")
-        
-        # 손글씨에 최적화된 PSM 모드들
-        psm_modes = [
-            (6, "균등분할"),    # 단일 텍스트 블록 
-            (8, "단어단위"),    # 단일 단어 - 손글씨에 좋음
-            (7, "단일라인"),    # 단일 텍스트 라인
-            (13, "원시라인"),   # 원시 라인, 조정 없음 - 손글씨 특화
-            (4, "단일컬럼"),    # 단일 컬럼
-        ]
-        
-        for psm, psm_desc in psm_modes:
-            # 한국어 전용 시도
-            try:
-                print(f"  📝 한국어전용 PSM{psm}({psm_desc}) 시도...")
-                
-                # DPI 설정 추가 (고해상도)
-                config = f'--psm {psm} --dpi 300'
-                text = pytesseract.image_to_string(processed_image, lang='kor', config=config)
-                
-                cleaned_text = enhance_korean_ocr_result(text)
-                if cleaned_text:
-                    score, desc, analysis = analyze_korean_text_quality(cleaned_text)
-                    
-                    # 손글씨 특화 보너스
-                    if "손글씨" in variant_name:
-                        score += 25  # 손글씨 전처리 보너스
-                    if psm in [8, 13]:  # 손글씨에 좋은 PSM
-                        score += 15
-                    else:
-                        score += 10
-                    
-                    if score > 100: score = 100
-                    
-                    method_name = f"한국어({variant_name}-PSM{psm})"
-                    results.append((method_name, cleaned_text, score, desc, analysis))
-                    print(f"    ✅ 성공: '{cleaned_text[:40]}...' (품질: {score}점)")
-                else:
-                    print(f"    ❌ 품질 부족으로 제거됨")
-                    
-            except Exception as e:
-                print(f"    ❌ 오류: {e}")
+    return fuse_results(results, rate, OCR_FUSION_TOP)
+
+def escalation_decision(search):
+    """다음(더 높은 해상도) 단계로 넘어갈지 판단: (넘어갈지, 이유, 한글 품질 점수)"""
+    if search["stop_reason"]:
+        return False, search["stop_reason"], None
+    if not search["results"]:
+        return True, "no_result", None
+    
+    best_text = max(search["results"], key=lambda x: x[2])[1]
+    text_quality, _, _ = analyze_korean_text_quality(best_text)
+    if text_quality < OCR_ESCALATE_SCORE:
+        return True, "low_quality", text_quality
+    return False, "quality_ok", text_quality
+
+async def try_multiple_ocr_methods(image, run_info=None):
+    """손글씨 특화 확장 OCR 방법으로 텍스트 추출 시도
+    
+    변형 × PSM × 언어 조합은 OCR 워커 풀에서 병렬로 실행되므로
+    OCR이 도는 동안에도 이벤트 루프는 다른 요청을 처리할 수 있습니다.
+    후보는 과거 선택률 순으로 실행하고, 점수가 충분하거나 시간 예산을
+    다 쓰면 나머지 후보는 건너뜁니다. 다중 해상도 모드에서는 원본 크기로
+    먼저 인식하고 품질이 낮을 때만 확대 변형을 실행합니다.
+    품질 라우팅을 켜면 사진의 흐림/대비/획 두께 등에 맞는 변형만 실행합니다.
+    마지막으로 점수 상위 결과들을 글자 단위로 융합해 서로 다른 글자 오류를 바로잡습니다.
+    (진행 정보와 단계별 판단은 run_info에 기록)
+    """
+    if run_info is None:
+        run_info = {}
+    
+    trace.info("🔍 손글씨 특화 OCR 시작!")
+    search = {
+        "results": [],
+        "tried_methods": [],
+        "best_score": None,
+        "started": ocr_scheduler.start(),
+        "stop_reason": None,
+        "stage": None,
+        "routing": None,
+    }
+    graph = PreprocessGraph(image)
+    stages = []
+    
+    # 썸네일 품질 지표로 이 사진에 맞는 전처리 변형 2~3개만 선택
+    search["routing"] = await asyncio.get_running_loop().run_in_executor(
+        None, in_context(route_variants), graph)
+    
+    async def run_stages():
+        for i, stage in enumerate(OCR_STAGES):
+            search["stage"] = stage.name
+            stage_info = await run_ocr_stage(stage, graph, search)
+            search["stop_reason"] = stage_info["stop_reason"]
+            stages.append(stage_info)
             
-            # 한영 혼합도 시도 (백업용)
-            if psm in [6, 7]:  # 일반적인 PSM만
-                try:
-                    print(f"  🔤 한영혼합 PSM{psm} 시도...")
-                    
-                    config = f'--psm {psm} --dpi 300'
-                    text = pytesseract.image_to_string(processed_image, lang='kor+eng', config=config)
-                    
-                    cleaned_text = enhance_korean_ocr_result(text)
-                    if cleaned_text:
-                        score, desc, analysis = analyze_korean_text_quality(cleaned_text)
-                        
-                        # 혼합 모드는 보너스 적게
-                        if "손글씨" in variant_name:
-                            score += 15
-                        score += 5
-                        
-                        if score > 100: score = 100
-                        
-                        method_name = f"한영혼합({variant_name}-PSM{psm})"
-                        results.append((method_name, cleaned_text, score, desc, analysis))
-                        print(f"    ✅ 성공: '{cleaned_text[:40]}...' (품질: {score}점)")
-                    else:
-                        print(f"    ❌ 품질 부족으로 제거됨")
-                        
-                except Exception as e:
-                    print(f"    ❌ 오류: {e}")
-    
-    print(f"\n🔍 OCR 완료: {len(results)}개 방법에서 유효한 결과 획득")
+            if i + 1 < len(OCR_STAGES):
+                escalate, reason, text_quality = escalation_decision(search)
+                stage_info.update({"escalate": escalate, "reason": reason,
+                                   "text_quality": text_quality})
+                if not escalate:
+                    break
+                trace.info("🔺 {} 단계로 전환 ({}, 한글 품질: {})",
+                           OCR_STAGES[i + 1].name, reason, text_quality)
+    
+    try:
+        # 마감 시간이 지나면 실행 중인 OCR 작업까지 취소하고 그때까지의 결과 사용
+        await asyncio.wait_for(run_stages(),
+                               ocr_scheduler.remaining(search["started"]))
+    except asyncio.TimeoutError:
+        search["stop_reason"] = "deadline"
+        stages.append({"stage": search["stage"], "stop_reason": "deadline"})
+        trace.warning("⏰ OCR 마감 시간({:g}초) 초과: 지금까지의 결과 {}개 사용",
+                      ocr_scheduler.deadline, len(search["results"]))
+    
+    results = search["results"]
+    tried_methods = search["tried_methods"]
+    
+    if trace.enabled(INFO):
+        slowest = ", ".join(f"{name} {ms:.0f}ms"
+                            for name, ms in graph.slowest(3))
+        trace.info("⏱️ 전처리 {:.0f}ms (오래 걸린 단계: {}), 최대 메모리 {}MB",
+                   graph.total_ms(), slowest, graph.memory_info()['peak_mb'])
+    
+    # 이번 업로드에서 선택된 방법을 통계에 반영
+    best = max(results, key=lambda x: x[2]) if results else None
+    winner = best[0] if best else None
+    ocr_scheduler.record(tried_methods, winner)
+    routing = search["routing"]
+    if routing:
+        quality_router.record(routing["metrics"], routing["rules"],
+                              routing["variants"], winner,
+                              best[2] if best else None)
+    
+    run_info.update({
+        "text_lines": max(info.get("text_lines", 0) for info in stages),
+        "candidates": sum(info.get("candidates", 0) for info in stages),
+        "executed": len(tried_methods),
+        "stop_reason": search["stop_reason"],
+        "partial": search["stop_reason"] in PARTIAL_STOP_REASONS,
+        "elapsed_seconds": round(time.perf_counter() - search["started"], 2),
+        "preprocess_ms": dict(graph.timings),
+        "preprocess_memory": graph.memory_info(),
+        "rectification": graph.get("rectify")[1],
+        "routing": routing,
+        "resolution_stages": stages,
+    })
+    
+    trace.info("🔍 OCR 완료: {}개 방법에서 유효한 결과 획득", len(results))
     
     # 결과가 있으면 품질 점수 순으로 정렬
     if results:
         results.sort(key=lambda x: x[2], reverse=True)  # 점수 기준 내림차순
-        print("\n🏆 최종 결과 순위:")
-        for i, (method, text, score, desc, analysis) in enumerate(results[:10], 1):
-            korean_ratio = analysis.get('korean_ratio', 0) * 100
-            digit_ratio = analysis.get('digit_ratio', 0) * 100
-            print(f"  {i}위. {method}")
-            print(f"      점수: {score}점 ({desc})")
-            print(f"      텍스트: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-            print(f"      구성: 한글 {korean_ratio:.0f}%, 숫자 {digit_ratio:.0f}%")
-            print()
-    
-    # 기존 format에 맞춰 반환 (호환성)
+        
+        # 상위 결과 융합 (통계에는 실제로 실행한 방법만 기록했으므로 여기서 추가)
+        fused = await asyncio.get_running_loop().run_in_executor(
+            None, in_context(fuse_ocr_results), results)
+        run_info["fusion"] = {
+            "hypotheses": (min(len(results), OCR_FUSION_TOP)
+                           if OCR_FUSION_TOP >= 2 else 0),
+            "changed": fused is not None,
+        }
+        if fused:
+            trace.info("🧬 {}: '{:.40}...'", fused[0], fused[1])
+            results.insert(0, fused)
+        if trace.enabled(INFO):
+            ranked = enumerate(results[:10], 1)
+            for i, (method, text, score, desc, analysis, _) in ranked:
+                trace.info("🏆 {}위. {} - 점수: {}점 ({}), "
+                           "구성: 한글 {:.0%}, 숫자 {:.0%}, 텍스트: '{}'",
+                           i, method, score, desc,
+                           analysis.get('korean_ratio', 0),
+                           analysis.get('digit_ratio', 0),
+                           text[:50] + ('...' if len(text) > 50 else ''))
+    
+    # (방법, 텍스트, 점수, 설명, OCRPage) 형식으로 반환
     converted_results = []
-    for method, text, score, desc, analysis in results:
-        converted_results.append((method, text, score, desc))
+    for method, text, score, desc, analysis, page in results:
+        converted_results.append((method, text, score, desc, page))
     
     return converted_results
 
 def preprocess_for_handwriting(image):
     """손글씨 특화 이미지 전처리"""
-    img_array = np.array(image)
-    
-    # 그레이스케일로 변환
-    if len(img_array.shape) == 3:
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-    else:
-        gray = img_array
-    
-    print(f"✍️ 손글씨 전처리 시작: {gray.shape}")
-    
-    # 1. 해상도 증대 (2배 확대)
-    height, width = gray.shape
-    enlarged = cv2.resize(gray, (width*2, height*2), interpolation=cv2.INTER_CUBIC)
-    print(f"🔍 해상도 증대: {gray.shape} → {enlarged.shape}")
-    
-    # 2. 가우시안 블러로 노이즈 제거
-    denoised = cv2.GaussianBlur(enlarged, (3, 3), 0)
-    
-    # 3. 언샤프 마스킹으로 선명화 강화
-    gaussian = cv2.GaussianBlur(denoised, (0, 0), 2.0)
-    unsharp_mask = cv2.addWeighted(denoised, 1.5, gaussian, -0.5, 0)
-    
-    # 4. 대비 향상 (CLAHE - 손글씨 특화 설정)
-    clahe = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(16,16))
-    enhanced = clahe.apply(unsharp_mask)
-    
-    # 5. 적응형 이진화 (손글씨용 설정)
-    # 여러 방법을 시도하여 최적 결과 선택
-    
-    # 방법 1: 적응형 가우시안
-    adaptive_gaussian = cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                             cv2.THRESH_BINARY, 21, 10)
-    
-    # 방법 2: 적응형 평균
-    adaptive_mean = cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_MEAN_C, 
-                                         cv2.THRESH_BINARY, 21, 10)
-    
-    # 방법 3: Otsu
-    _, otsu_binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    
-    # 세 방법 중 가장 좋은 결과 선택 (흰 픽셀 비율로 판단)
-    methods = [
-        ("적응형_가우시안", adaptive_gaussian),
-        ("적응형_평균", adaptive_mean), 
-        ("Otsu", otsu_binary)
-    ]
-    
-    best_method = None
-    best_score = 0
-    
-    for name, binary_img in methods:
-        white_ratio = np.sum(binary_img == 255) / binary_img.size
-        # 적절한 흰색 비율 (70-90%)인 것을 선호
-        if 0.7 <= white_ratio <= 0.9:
-            score = 100 - abs(white_ratio - 0.8) * 100  # 80%에 가까울수록 높은 점수
-        else:
-            score = max(0, 50 - abs(white_ratio - 0.8) * 100)
-        
-        print(f"  📊 {name}: 흰색 비율 {white_ratio:.1%}, 점수 {score:.0f}")
-        
-        if score > best_score:
-            best_score = score
-            best_method = (name, binary_img)
-    
-    if best_method:
-        method_name, binary = best_method
-        print(f"  ✅ 선택된 이진화: {method_name}")
-    else:
-        binary = adaptive_gaussian
-        print(f"  ⚠️ 기본값 사용: 적응형_가우시안")
-    
-    # 6. 모폴로지 연산으로 연결된 글자 분리
-    # 수직선 제거 (연결된 글자 분리용)
-    vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 3))
-    temp = cv2.morphologyEx(binary, cv2.MORPH_OPEN, vertical_kernel, iterations=1)
-    
-    # 작은 노이즈 제거
-    noise_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-    cleaned = cv2.morphologyEx(temp, cv2.MORPH_OPEN, noise_kernel, iterations=1)
-    
-    # 글자 두께 약간 증가 (OCR 인식률 향상)
-    thick_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-    thickened = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, thick_kernel, iterations=1)
-    
-    print(f"✍️ 손글씨 전처리 완료")
-    
-    return Image.fromarray(thickened)
+    return PreprocessGraph(image).image("손글씨_기본")
 
-def create_handwriting_variants(image):
-    """손글씨용 다양한 이미지 변형 생성"""
-    variants = []
-    
-    # 기본 손글씨 전처리
-    handwriting_processed = preprocess_for_handwriting(image)
-    variants.append(("손글씨_기본", handwriting_processed))
-    
-    # 원본 이미지로도 여러 처리
-    img_array = np.array(image)
-    if len(img_array.shape) == 3:
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-    else:
-        gray = img_array
-    
-    # 1. 고해상도 + 강한 선명화
-    try:
-        large = cv2.resize(gray, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
-        kernel_sharp = np.array([[-1,-1,-1,-1,-1],
-                                [-1, 2, 2, 2,-1],
-                                [-1, 2, 8, 2,-1],
-                                [-1, 2, 2, 2,-1],
-                                [-1,-1,-1,-1,-1]]) / 8
-        sharp = cv2.filter2D(large, -1, kernel_sharp)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(sharp)
-        _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        variants.append(("고해상도_선명", Image.fromarray(binary)))
-    except:
-        pass
-    
-    # 2. 연결 분리 특화
-    try:
-        # 강한 침식으로 연결 분리
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        erode_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
-        eroded = cv2.erode(binary, erode_kernel, iterations=2)
-        dilate_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        restored = cv2.dilate(eroded, dilate_kernel, iterations=1)
-        variants.append(("연결분리", Image.fromarray(restored)))
-    except:
-        pass
-    
-    # 3. 회전 보정 (±2도)
-    try:
-        for angle in [-2, 2]:
-            center = (gray.shape[1]//2, gray.shape[0]//2)
-            rotation_matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
-            rotated = cv2.warpAffine(gray, rotation_matrix, (gray.shape[1], gray.shape[0]), 
-                                   borderMode=cv2.BORDER_REPLICATE)
-            _, binary = cv2.threshold(rotated, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            variants.append((f"회전{angle}도", Image.fromarray(binary)))
-    except:
-        pass
-    
-    print(f"✍️ 손글씨 변형 완료: {len(variants)}개 버전")
+def create_handwriting_variants(image, graph=None):
+    """손글씨용 다양한 이미지 변형 생성 (graph를 주면 중간 결과를 공유)"""
+    graph = graph or PreprocessGraph(image)
+    variants = graph.variants(HANDWRITING_VARIANTS)
+    trace.info("✍️ 손글씨 변형 완료: {}개 버전", len(variants))
     return variants
 
 def validate_file(file: UploadFile) -> tuple[bool, str]:
@@ -890,8 +948,9 @@ async def validate_file_size(file: UploadFile) -> tuple[bool, str]:
     return True, ""
 
 @app.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
-    """단순 파일 업로드 (OCR 없음)"""
+async def upload_file(file: UploadFile = File(...),
+                      student_id: Optional[str] = Form(None)):
+    """단순 파일 업로드 (OCR 없음, 학생 ID가 있으면 유사 이미지 확인)"""
     try:
         # 파일 유효성 검사
         valid, error_msg = validate_file(file)
@@ -917,20 +976,230 @@ async def upload_file(file: UploadFile = File(...)):
         with open(save_path, "wb") as f:
             f.write(contents)
         
-        return JSONResponse(content={
+        response = {
             "filename": save_name, 
             "message": "파일 업로드가 완료되었습니다.",
             "file_size": len(contents)
-        })
+        }
+        
+        # 같은 학생이 같은 사진을 올린 적이 있으면 그 OCR 결과를 함께 반환
+        student_id = student_id.strip() if student_id else None
+        if student_id:
+            try:
+                # 이미지 디코딩은 CPU 작업이므로 이벤트 루프 밖에서 실행
+                image, _ = await asyncio.get_running_loop().run_in_executor(
+                    None, in_context(load_upload_image), contents)
+                image_print = fingerprint(image)
+                near_result = find_near_duplicate_result(
+                    student_id, image_print)
+                if near_result:
+                    response["near_duplicate"] = near_result["near_duplicate"]
+                    response["ocr_text"] = near_result.get("ocr_text", "")
+                near_duplicates.add(student_id, image_print,
+                                    hash_upload(contents), save_path)
+            except Exception as hash_error:
+                trace.warning("⚠️ 유사 이미지 확인 실패: {}", hash_error)
+        
+        return JSONResponse(content=response)
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 업로드 중 오류가 발생했습니다: {str(e)}")
 
+def find_near_duplicate_result(student_id, image_print):
+    """같은 학생의 같은 사진 중 OCR 결과가 저장된 것을 찾아 반환"""
+    for distance, dup_hash in near_duplicates.find(student_id, image_print):
+        cached_result = ocr_cache.get(dup_hash)
+        if cached_result:
+            trace.info("♻️ 유사 이미지 OCR 재사용: {:.12} (거리 {})", dup_hash, distance)
+            return {
+                **cached_result,
+                "cached": True,
+                "near_duplicate": {
+                    "content_hash": dup_hash, "distance": distance}
+            }
+    return None
+
+def load_upload_image(contents):
+    """업로드 바이트를 OCR용 이미지로 디코딩하고 크기 조정 → (이미지, 읽기 정보)"""
+    image, ingest_info = ingest_image(contents)
+    trace.info("🖼️ 이미지 읽기: {} {} → {} ({}ms{})",
+               ingest_info['format'], ingest_info['original_size'],
+               ingest_info['final_size'], ingest_info['decode_ms'],
+               ', 축소 디코딩' if ingest_info['draft'] else '')
+    return image, ingest_info
+
+async def process_ocr_upload(contents, student_id=None):
+    """업로드된 이미지로 OCR 전체 과정 실행 (캐시/유사 이미지 재사용 포함)
+    
+    유사 이미지 재사용은 student_id가 있을 때만 합니다.
+    
+    OCR 도중 발생한 예외는 호출하는 쪽에서 처리합니다.
+    """
+    # 같은 사진을 다시 올린 경우 저장된 OCR 결과 재사용
+    content_hash = hash_upload(contents)
+    cached_result = ocr_cache.get(content_hash)
+    if cached_result:
+        trace.info("♻️ OCR 캐시 적중: {:.12}", content_hash)
+        return {**cached_result, "cached": True}
+    
+    # Tesseract 설치 확인
+    if not TESSERACT_INSTALLED:
+        return {
+            "success": False,
+            "ocr_text": "",
+            "message": "❌ Tesseract OCR이 설치되지 않았습니다. 수동으로 텍스트를 입력해주세요.",
+            "error": "Tesseract not installed"
+        }
+    
+    # 이미지 디코딩도 CPU 작업이므로 이벤트 루프 밖에서 실행
+    loop = asyncio.get_running_loop()
+    try:
+        image, ingest_info = await loop.run_in_executor(
+            None, in_context(load_upload_image), contents)
+    except ImageTooLargeError as size_error:
+        return {
+            "success": False,
+            "ocr_text": "",
+            "message": "❌ 이미지 해상도가 너무 큽니다. 더 작은 사진으로 다시 올려주세요.",
+            "error": f"Image too large: {str(size_error)}",
+            "suggestion": (f"{OCR_MAX_IMAGE_PIXELS // 1_000_000}MP "
+                           "이하의 사진을 사용해주세요.")
+        }
+    except Exception as img_error:
+        return {
+            "success": False,
+            "ocr_text": "",
+            "message": f"❌ 이미지 파일을 읽을 수 없습니다. 파일이 손상되었거나 지원하지 않는 형식일 수 있습니다.",
+            "error": f"Image processing error: {str(img_error)}",
+            "suggestion": "JPG, PNG, BMP, GIF, TIFF, WebP 형식의 이미지를 사용해주세요."
+        }
+    
+    # 같은 학생이 같은 사진을 이미 올렸다면 그 OCR 결과 재사용
+    image_print = fingerprint(image) if student_id else None
+    if image_print is not None:
+        near_result = find_near_duplicate_result(student_id, image_print)
+        if near_result:
+            return near_result
+    
+    # 다중 OCR 방법으로 텍스트 추출 시도
+    ocr_run_info = {}
+    ocr_results = await try_multiple_ocr_methods(image, ocr_run_info)
+    
+    if not ocr_results:
+        # 모든 방법이 실패한 경우
+        return {
+            "success": True,
+            "ocr_text": "",
+            "message": "📄 텍스트를 감지할 수 없습니다.",
+            "detailed_message": "6가지 다른 OCR 방법을 시도했지만 의미있는 텍스트를 찾을 수 없습니다.",
+            "suggestion": (
+                "다음을 확인해보세요:\n"
+                "• 글씨가 선명하고 읽을 수 있나요?\n"
+                "• 배경과 글씨의 대비가 충분한가요?\n"
+                "• 이미지에 노이즈나 얼룩이 많지 않나요?\n"
+                "• 글씨 크기가 너무 작지 않나요?\n"
+                "• 손글씨가 너무 흘림체는 아닌가요?"),
+            "quality_info": "모든 OCR 방법에서 깨진 글자나 의미없는 문자만 감지되었습니다.",
+            "partial": ocr_run_info.get("partial", False),
+            "ocr_search": ocr_run_info,
+            "ingest": ingest_info
+        }
+    
+    # 품질 점수가 가장 높은 결과를 선택
+    best_result = max(ocr_results, key=lambda x: x[2])  # quality_score 기준
+    method_used = best_result[0]
+    text = best_result[1]
+    quality_score = best_result[2]
+    quality_desc = best_result[3]
+    
+    # 품질이 너무 낮으면 경고
+    if quality_score < OCR_LOW_QUALITY_SCORE:
+        warning_message = (
+            f"⚠️ 텍스트 품질이 낮습니다 (품질: {quality_desc}, "
+            f"{quality_score}점). 결과를 확인해주세요.")
+    else:
+        warning_message = None
+    
+    # 시간 예산/마감으로 일부 후보만 실행한 결과
+    partial = ocr_run_info.get("partial", False)
+    if partial and not warning_message:
+        warning_message = "⏰ 처리 시간이 초과되어 일부 방법의 결과만 사용했습니다. 결과를 확인해주세요."
+    
+    # 디버깅 정보 포함 (품질 점수 포함)
+    debug_info = []
+    for method, result, q_score, q_desc, _ in ocr_results:
+        short_result = result[:50] + "..." if len(result) > 50 else result
+        debug_info.append(
+            f"{method} (품질: {q_score}점, {q_desc}): {short_result}")
+    
+    response = {
+        "success": True,
+        "ocr_text": text,
+        "message": f"✅ 텍스트 추출 완료! ({method_used} 방법 사용, 품질: {quality_desc})",
+        "quality_score": quality_score,
+        "quality_description": quality_desc,
+        "warning": warning_message,
+        "debug_info": debug_info,
+        "total_methods_tried": len(ocr_results),
+        "best_method": method_used,
+        "ocr_words": pack_page(best_result[4]),
+        "partial": partial,
+        "ocr_search": ocr_run_info,
+        "ingest": ingest_info
+    }
+    
+    # 같은 사진을 다시 올리면 바로 돌려줄 수 있도록 저장 (일부 결과는 저장하지 않음)
+    if not partial:
+        ocr_cache.put(content_hash, response)
+        if image_print is not None:
+            near_duplicates.add(student_id, image_print, content_hash)
+    return response
+
+def ocr_error_response(ocr_error):
+    """OCR 처리 중 예외가 났을 때의 응답"""
+    return {
+        "success": False,
+        "ocr_text": "",
+        "message": "❌ OCR 처리 중 오류가 발생했습니다.",
+        "error": f"OCR error: {str(ocr_error)}",
+        "suggestion": "이미지를 다시 확인하거나 다른 이미지를 시도해보세요."
+    }
+
+class ClientDisconnected(Exception):
+    """요청 처리 중 클라이언트 연결이 끊김"""
+
+async def cancel_on_disconnect(request: Request, awaitable, poll_interval=0.5):
+    """awaitable을 실행하다가 클라이언트 연결이 끊기면 취소하고 ClientDisconnected 발생"""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                trace.warning("🔌 클라이언트 연결 끊김: 남은 OCR 작업 취소")
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
 @app.post("/ocr_upload")
-async def ocr_upload(file: UploadFile = File(...)):
-    """사진 업로드 및 OCR 텍스트 추출"""
+async def ocr_upload(
+    request: Request,
+    file: UploadFile = File(...),
+    student_id: Optional[str] = Form(None),
+    mode: Optional[str] = Form(None),
+    trace_requested: bool = Form(False, alias="trace")
+):
+    """사진 업로드 및 OCR 텍스트 추출
+    
+    mode="job"이면 OCR을 기다리지 않고 작업 ID를 바로 반환합니다.
+    (결과는 GET /ocr_jobs/{job_id}로 조회)
+    trace=true이면 이 요청의 OCR 추적 기록을 debug_info에 붙여 반환합니다.
+    """
     try:
         # 파일 유효성 검사
         valid, error_msg = validate_file(file)
@@ -942,110 +1211,269 @@ async def ocr_upload(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail=error_msg)
         
         contents = await file.read()
+        student_id = student_id.strip() if student_id else None
         
-        # OCR 처리
-        try:
-            # Tesseract 설치 확인
-            if not TESSERACT_INSTALLED:
-                return {
-                    "success": False,
-                    "ocr_text": "",
-                    "message": "❌ Tesseract OCR이 설치되지 않았습니다. 수동으로 텍스트를 입력해주세요.",
-                    "error": "Tesseract not installed"
-                }
+        # 작업 모드: 이미지를 저장하고 대기열에 넣은 뒤 바로 응답
+        if mode == "job":
+            if not db:
+                raise HTTPException(status_code=500,
+                                    detail="데이터베이스를 사용할 수 없습니다.")
             
-            # 이미지 열기 및 형식 확인
+            # 워커에서 실패하기 전에 이미지인지, 너무 크지 않은지 헤더로 확인
             try:
-                image = Image.open(io.BytesIO(contents))
-                # 이미지 형식 확인 및 RGB로 변환
-                if image.mode not in ('RGB', 'L'):
-                    image = image.convert('RGB')
-                    
-            except Exception as img_error:
-                return {
-                    "success": False,
-                    "ocr_text": "",
-                    "message": f"❌ 이미지 파일을 읽을 수 없습니다. 파일이 손상되었거나 지원하지 않는 형식일 수 있습니다.",
-                    "error": f"Image processing error: {str(img_error)}",
-                    "suggestion": "JPG, PNG, BMP, GIF, TIFF, WebP 형식의 이미지를 사용해주세요."
-                }
+                open_image_header(contents)
+            except ImageTooLargeError:
+                raise HTTPException(
+                    status_code=400,
+                    detail=("이미지 해상도가 너무 큽니다. "
+                            f"({OCR_MAX_IMAGE_PIXELS // 1_000_000}MP 이하만 가능)"))
+            except Exception:
+                raise HTTPException(
+                    status_code=400,
+                    detail="이미지 파일을 읽을 수 없습니다. 파일이 손상되었거나 "
+                           "지원하지 않는 형식일 수 있습니다.")
             
-            # 이미지가 너무 크면 리사이즈
-            if image.width > 2000 or image.height > 2000:
-                image.thumbnail((2000, 2000), Image.Resampling.LANCZOS)
-            
-            # 이미지가 너무 작으면 확대 (OCR 성능 향상)
-            elif image.width < 300 or image.height < 300:
-                scale_factor = max(300 / image.width, 300 / image.height)
-                new_size = (int(image.width * scale_factor), int(image.height * scale_factor))
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
-            
-            # 다중 OCR 방법으로 텍스트 추출 시도
-            try:
-                ocr_results = try_multiple_ocr_methods(image)
-                
-                if ocr_results:
-                    # 품질 점수가 가장 높은 결과를 선택
-                    best_result = max(ocr_results, key=lambda x: x[2])  # quality_score 기준
-                    method_used = best_result[0]
-                    text = best_result[1]
-                    quality_score = best_result[2]
-                    quality_desc = best_result[3]
-                    
-                    # 품질이 너무 낮으면 경고
-                    if quality_score < 40:
-                        warning_message = f"⚠️ 텍스트 품질이 낮습니다 (품질: {quality_desc}, {quality_score}점). 결과를 확인해주세요."
-                    else:
-                        warning_message = None
-                    
-                    # 디버깅 정보 포함 (품질 점수 포함)
-                    debug_info = []
-                    for method, result, q_score, q_desc in ocr_results:
-                        short_result = result[:50] + "..." if len(result) > 50 else result
-                        debug_info.append(f"{method} (품질: {q_score}점, {q_desc}): {short_result}")
-                    
-                    return {
-                        "success": True,
-                        "ocr_text": text,
-                        "message": f"✅ 텍스트 추출 완료! ({method_used} 방법 사용, 품질: {quality_desc})",
-                        "quality_score": quality_score,
-                        "quality_description": quality_desc,
-                        "warning": warning_message,
-                        "debug_info": debug_info,
-                        "total_methods_tried": len(ocr_results),
-                        "best_method": method_used
-                    }
-                else:
-                    # 모든 방법이 실패한 경우
-                    return {
-                        "success": True,
-                        "ocr_text": "",
-                        "message": "📄 텍스트를 감지할 수 없습니다.",
-                        "detailed_message": "6가지 다른 OCR 방법을 시도했지만 의미있는 텍스트를 찾을 수 없습니다.",
-                        "suggestion": "다음을 확인해보세요:\n• 글씨가 선명하고 읽을 수 있나요?\n• 배경과 글씨의 대비가 충분한가요?\n• 이미지에 노이즈나 얼룩이 많지 않나요?\n• 글씨 크기가 너무 작지 않나요?\n• 손글씨가 너무 흘림체는 아닌가요?",
-                        "quality_info": "모든 OCR 방법에서 깨진 글자나 의미없는 문자만 감지되었습니다."
-                    }
-                    
-            except Exception as ocr_error:
-                return {
-                    "success": False,
-                    "ocr_text": "",
-                    "message": "❌ OCR 처리 중 오류가 발생했습니다.",
-                    "error": f"OCR error: {str(ocr_error)}",
-                    "suggestion": "이미지를 다시 확인하거나 다른 이미지를 시도해보세요."
-                }
+            ext = os.path.splitext(file.filename)[1].lower()
+            image_path = os.path.join(OCR_JOB_DIR,
+                                      f"{hash_upload(contents)}{ext}")
+            with open(image_path, "wb") as f:
+                f.write(contents)
             
+            job_id = ocr_job_queue.enqueue(student_id, image_path)
+            return {
+                "success": True,
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/ocr_jobs/{job_id}",
+                "message": "📥 OCR 작업이 대기열에 등록되었습니다."
+            }
+        
+        # OCR 처리 (학생이 창을 닫으면 남은 OCR 작업 취소)
+        try:
+            with tracing(trace_requested) as collector:
+                result = await cancel_on_disconnect(
+                    request, process_ocr_upload(contents, student_id))
+            return attach_trace(result, collector)
+        except ClientDisconnected:
+            return JSONResponse(
+                status_code=499,
+                content={"detail": "클라이언트 연결이 끊어졌습니다."})
         except Exception as ocr_error:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"OCR 처리 중 오류가 발생했습니다. 다른 사진을 시도해보세요. (상세: {str(ocr_error)})"
-            )
+            return ocr_error_response(ocr_error)
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 처리 중 오류가 발생했습니다: {str(e)}")
 
+# --- 일괄 OCR API (교사용) ---
+
+OCR_BATCH_DIR = os.path.join(UPLOAD_DIR, 'batch')
+os.makedirs(OCR_BATCH_DIR, exist_ok=True)
+
+async def process_batch_item(item):
+    """일괄 업로드 사진 한 장: OCR 후 제출 내역으로 저장"""
+    ext = os.path.splitext(item.filename)[1].lower()
+    image_path = os.path.join(OCR_BATCH_DIR,
+                              f"{hash_upload(item.contents)}{ext}")
+    with open(image_path, "wb") as f:
+        f.write(item.contents)
+    
+    result = await process_ocr_upload(item.contents, item.student_id)
+    if not result.get("success"):
+        return {"success": False,
+                "error": result.get("error") or result.get("message")}
+    
+    submission_id = db.save_submission(
+        student_id=item.student_id,
+        ocr_text=result.get("ocr_text", ""),
+        ai_stage=1,
+        original_image_path=image_path,
+        ocr_words=result.get("ocr_words")
+    )
+    return {
+        "success": True,
+        "submission_id": submission_id,
+        "ocr_text": result.get("ocr_text", ""),
+        "quality_score": result.get("quality_score"),
+        "cached": result.get("cached", False)
+    }
+
+@app.post("/ocr_batch")
+async def ocr_batch(
+    files: List[UploadFile] = File(...),
+    student_ids: Optional[List[str]] = Form(None)
+):
+    """여러 장의 사진(또는 ZIP)을 한 번에 OCR하고 학생별 제출 내역으로 저장
+    
+    학생 ID는 student_ids(파일 순서대로) 또는 파일명/ZIP 폴더명에서 가져옵니다.
+    결과는 사진마다 한 줄씩 NDJSON으로 스트리밍되고, 마지막 줄은 요약입니다.
+    """
+    try:
+        if not db:
+            raise HTTPException(status_code=500, detail="데이터베이스를 사용할 수 없습니다.")
+        
+        uploads = [(file.filename or "", await file.read()) for file in files]
+        try:
+            items = build_batch_items(uploads, student_ids,
+                                      ALLOWED_EXTENSIONS, MAX_FILE_SIZE)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        trace.info("📚 일괄 OCR 시작: {}장", len(items))
+        return StreamingResponse(
+            iter_batch_results(items, process_batch_item),
+            media_type="application/x-ndjson"
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500,
+                            detail=f"일괄 처리 중 오류가 발생했습니다: {str(e)}")
+
+# --- 여러 쪽 제출 OCR API ---
+
+OCR_PAGE_DIR = os.path.join(UPLOAD_DIR, 'pages')
+os.makedirs(OCR_PAGE_DIR, exist_ok=True)
+
+async def process_submission_page(page):
+    """여러 쪽 제출의 한 쪽 OCR (같은 파일의 캐시 결과만 재사용)
+
+    같은 글의 쪽들은 틀이 비슷해서 유사 이미지로 잘못 잡힐 수 있으므로
+    학생 ID를 넘기지 않아 유사 이미지 재사용(과 색인 추가)을 하지 않습니다.
+    """
+    return await process_ocr_upload(page.contents)
+
+@app.post("/ocr_upload_pages")
+async def ocr_upload_pages(
+    files: List[UploadFile] = File(...),
+    student_id: str = Form(...)
+):
+    """여러 장에 걸친 글을 한 제출로 OCR (files는 쪽 순서대로)
+    
+    제출 내역을 먼저 만들고 쪽마다 동시에 OCR합니다. 쪽별 결과는 끝나는 순서대로
+    한 줄씩(NDJSON) 전송되고, 마지막 줄은 쪽 순서대로 이어 붙인 ocr_text와
+    submission_id를 담은 요약입니다. (쪽별 결과는 GET /submission/{submission_id}의 pages)
+    """
+    try:
+        if not db:
+            raise HTTPException(status_code=500, detail="데이터베이스를 사용할 수 없습니다.")
+        
+        student_id = student_id.strip() if student_id else ""
+        if not student_id:
+            raise HTTPException(status_code=400, detail="학생 ID가 필요합니다.")
+        if len(files) > OCR_MAX_PAGES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"한 번에 최대 {OCR_MAX_PAGES}쪽까지 올릴 수 있습니다.")
+        
+        # 쪽마다 파일 확인 후 저장 (하나라도 잘못되면 제출 내역을 만들지 않음)
+        pages = []
+        for page_number, file in enumerate(files, 1):
+            valid, error_msg = validate_file(file)
+            if valid:
+                valid, error_msg = await validate_file_size(file)
+            if not valid:
+                raise HTTPException(status_code=400,
+                                    detail=f"{page_number}쪽: {error_msg}")
+            
+            contents = await file.read()
+            ext = os.path.splitext(file.filename)[1].lower()
+            image_path = os.path.join(OCR_PAGE_DIR,
+                                      f"{hash_upload(contents)}{ext}")
+            with open(image_path, "wb") as f:
+                f.write(contents)
+            pages.append(PageUpload(page_number, file.filename, contents,
+                                    image_path, student_id))
+        
+        submission_id = db.save_submission(
+            student_id=student_id,
+            ocr_text="",
+            ai_stage=1,
+            original_image_path=pages[0].image_path
+        )
+        db.create_submission_pages(submission_id,
+                                   [page.image_path for page in pages])
+        
+        trace.info("📄 여러 쪽 제출 OCR 시작: {}쪽 (제출 {})",
+                   len(pages), submission_id)
+        return StreamingResponse(
+            iter_page_results(db, submission_id, pages,
+                              process_submission_page),
+            media_type="application/x-ndjson"
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"여러 쪽 처리 중 오류가 발생했습니다: {str(e)}")
+
+# --- 비동기 OCR 작업 API ---
+
+async def process_ocr_job(job):
+    """대기열에서 꺼낸 OCR 작업 처리 (예외가 나면 큐가 재시도)"""
+    with open(job['image_path'], 'rb') as f:
+        contents = f.read()
+    return await process_ocr_upload(contents, job['student_id'])
+
+OCR_JOB_DIR = os.path.join(UPLOAD_DIR, 'ocr_jobs')
+os.makedirs(OCR_JOB_DIR, exist_ok=True)
+
+ocr_job_queue = OCRJobQueue(db, process_ocr_job)
+
+@app.on_event("startup")
+async def start_ocr_job_workers():
+    """서버 시작 시 OCR 작업 워커 시작 (중단된 작업 복구 포함)"""
+    if db:
+        ocr_job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_ocr_job_workers():
+    """서버 종료 시 OCR 작업 워커 정리"""
+    await ocr_job_queue.stop()
+
+@app.get("/ocr_jobs")
+async def get_ocr_job_stats():
+    """OCR 작업 대기열 길이와 평균 대기/처리 시간"""
+    try:
+        if not db:
+            raise HTTPException(status_code=500, detail="데이터베이스를 사용할 수 없습니다.")
+        
+        return ocr_job_queue.stats()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"작업 통계 조회 중 오류가 발생했습니다: {str(e)}")
+
+@app.get("/ocr_jobs/{job_id}")
+async def get_ocr_job(job_id: int, wait: float = 0):
+    """OCR 작업 상태 및 결과 조회
+    
+    wait(초)를 주면 작업이 끝나거나 시간이 다 될 때까지 기다렸다가 응답합니다. (최대 30초)
+    """
+    try:
+        if not db:
+            raise HTTPException(status_code=500, detail="데이터베이스를 사용할 수 없습니다.")
+        
+        job = await ocr_job_queue.wait(job_id, min(max(wait, 0), 30))
+        if not job:
+            raise HTTPException(status_code=404, detail="OCR 작업을 찾을 수 없습니다.")
+        
+        for key in ('queued_seconds', 'run_seconds'):
+            if job[key] is not None:
+                job[key] = round(job[key], 2)
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500,
+                            detail=f"작업 조회 중 오류가 발생했습니다: {str(e)}")
+
 @app.post("/ai_feedback")
 async def ai_feedback(text: str = Body(..., embed=True)):
     """AI 피드백 생성"""
@@ -1188,9 +1616,14 @@ async def ai_evaluate(
 async def submit_revision(
     student_id: str = Body(...), 
     original_text: str = Body(...), 
-    revised_text: str = Body(...)
+    revised_text: str = Body(...),
+    ocr_words: Optional[dict] = Body(None),
+    submission_id: Optional[int] = Body(None)
 ):
-    """학생이 수정한 글을 데이터베이스에 저장"""
+    """학생이 수정한 글을 데이터베이스에 저장 (ocr_words: OCR 응답의 단어 상자/신뢰도)
+    
+    submission_id를 주면 (여러 쪽 제출처럼) 이미 만들어진 제출 내역에 수정한 글을 저장합니다.
+    """
     try:
         if not db:
             raise HTTPException(status_code=500, detail="데이터베이스를 사용할 수 없습니다.")
@@ -1201,7 +1634,15 @@ async def submit_revision(
         if not revised_text or not revised_text.strip():
             raise HTTPException(status_code=400, detail="수정된 글이 필요합니다.")
         
-        submission_id = db.save_submission(student_id.strip(), original_text, revised_text.strip())
+        if submission_id is not None:
+            if not db.update_revised_text(submission_id, student_id.strip(),
+                                          revised_text.strip()):
+                raise HTTPException(status_code=404, detail="제출 내역을 찾을 수 없습니다.")
+        else:
+            submission_id = db.save_submission(student_id.strip(),
+                                               original_text,
+                                               revised_text.strip(),
+                                               ocr_words=ocr_words)
         
         return JSONResponse(content={
             "message": "글 제출이 완료되었습니다.",
@@ -1313,6 +1754,8 @@ def health_check():
         "message": "AI 학생 글 평가 시스템이 정상 작동 중입니다.",
         "version": "2.0",
         "database": "connected" if db else "disconnected",
+        "ocr_backend": get_ocr_stats(),
+        "ocr_cache": ocr_cache.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -1322,7 +1765,8 @@ def read_root():
         "message": "🎓 AI 학생 글 평가 시스템에 오신 것을 환영합니다!",
         "version": "2.0 with Database",
         "endpoints": {
-            "학생용": "/ocr_upload, /ai_feedback, /ai_evaluate, /submit_revision",
+            "학생용": ("/ocr_upload, /ocr_upload_pages, /ai_feedback, "
+                    "/ai_evaluate, /submit_revision"),
             "교사용": "/teacher/submissions, /teacher/student/{student_id}",
             "기타": "/health, /docs"
         },
@@ -1333,138 +1777,54 @@ def read_root():
         }
     } 
 
-def korean_language_correction(text):
-    """한국어 언어모델 기반 텍스트 교정"""
+def korean_language_correction(text, uncertain=()):
+    """한국어 OCR 오인식 교정
+    
+    규칙 파일(ocr_corrections.json)의 교정을 적용한 뒤, 엔진 신뢰도가 낮았던 어절(uncertain)은
+    자모 어휘 색인에서 가까운 낱말을 찾아 고칩니다.
+    """
     if not text:
         return text
     
-    print(f"🔤 언어모델 교정 시작: '{text}'")
-    
-    # 1. 자주 잘못 인식되는 글자 교정
-    common_mistakes = {
-        # 유사한 모양의 글자들
-        '밑': '법',  # 'ㅁ'과 'ㅂ' 혼동
-        '가': '나',  # 'ㄱ'과 'ㄴ' 혼동
-        '정': '정',  # 그대로
-        '해': '해',  # 그대로
-        '걸': '걸',  # 그대로
-        '꼭': '꼭',  # 그대로
-        '지': '지',  # 그대로
-        '켜': '켜',  # 그대로
-        '야': '야',  # 그대로
-        '하': '하',  # 그대로
-        '는': '는',  # 그대로
-        '것': '것',  # 그대로
-        '강': '강',  # 그대로
-        '제': '제',  # 그대로
-        '적': '적',  # 그대로
-        '으': '으',  # 그대로
-        '로': '로',  # 그대로
-        '체': '체',  # 그대로
-        '벌': '벌',  # 그대로
-        '을': '을',  # 그대로
-        '받': '받',  # 그대로
-        '고': '고',  # 그대로
-        '도': '도',  # 그대로
-        '덕': '덕',  # 그대로
-        '은': '은',  # 그대로
-        '양': '양',  # 그대로
-        '심': '심',  # 그대로
-        '의': '의',  # 그대로
-        '실': '실',  # 그대로
-        '망': '망',  # 그대로
-        '과': '과',  # 그대로
-        '비': '비',  # 그대로
-        '난': '난',  # 그대로
-        '다': '다',  # 그대로
-        
-        # 자주 잘못 인식되는 패턴들
-        '체니': '체벌',
-        '성앙': '실망',
-        '버언': '받는',
-        '오고': '을',
-        '억': '도덕',
-        '앙가': '과',
-    }
-    
-    corrected = text
-    corrections_made = []
-    
-    for wrong, correct in common_mistakes.items():
-        if wrong in corrected:
-            corrected = corrected.replace(wrong, correct)
-            corrections_made.append(f"{wrong}→{correct}")
-    
-    if corrections_made:
-        print(f"  📝 글자 교정: {', '.join(corrections_made)}")
-    
-    # 2. 단어 경계 추론 및 교정
-    word_patterns = [
-        # 법률 관련 용어
-        (r'법.*?는', '법은'),
-        (r'나.*?라.*?에.*?서', '나라에서'),
-        (r'정.*?해.*?준.*?걸', '정해준 걸'),
-        (r'꼭.*?지.*?켜.*?야', '꼭 지켜야'),
-        (r'하.*?는.*?것', '하는 것'),
-        (r'강.*?제.*?적.*?으.*?로', '강제적으로'),
-        (r'체.*?벌.*?을', '체벌을'),
-        (r'받.*?고', '받고'),
-        (r'도.*?덕.*?은', '도덕은'),
-        (r'양.*?심.*?의', '양심의'),
-        (r'실.*?망.*?과', '실망과'),
-        (r'비.*?난.*?을', '비난을'),
-        (r'받.*?는.*?다', '받는다'),
-    ]
+    trace.debug("🔤 언어모델 교정 시작: '{}'", text)
     
-    for pattern, replacement in word_patterns:
-        if re.search(pattern, corrected):
-            old_text = corrected
-            corrected = re.sub(pattern, replacement, corrected)
-            if old_text != corrected:
-                print(f"  🔍 패턴 교정: '{old_text}' → '{corrected}'")
+    corrected, corrections = correction_engine.correct(text)
+    if lexicon is not None and uncertain:
+        corrected, lexicon_corrections = lexicon.correct_text(corrected,
+                                                              uncertain)
+        corrections += lexicon_corrections
     
-    # 3. 문장 구조 복원
-    # 쉼표와 마침표 추가
-    if '것' in corrected and '법은' in corrected and ',' not in corrected:
-        corrected = corrected.replace('것', '것,')
-        print(f"  📖 문장부호 추가: 쉼표 삽입")
-    
-    if corrected and not corrected.endswith('.'):
-        if any(ending in corrected for ending in ['다', '요', '음', '니다']):
-            corrected += '.'
-            print(f"  📖 문장부호 추가: 마침표 삽입")
-    
-    # 4. 최종 정리
-    corrected = re.sub(r'\s+', ' ', corrected)  # 연속 공백 제거
-    corrected = corrected.strip()
+    if corrections and trace.enabled(DEBUG):
+        trace.debug("📝 교정: {}", ', '.join(f'{wrong}→{right}'
+                                              for wrong, right in corrections))
     
     if corrected != text:
-        print(f"✅ 교정 완료: '{text}' → '{corrected}'")
+        trace.debug("✅ 교정 완료: '{}' → '{}'", text, corrected)
         return corrected
     else:
-        print(f"ℹ️ 교정 불필요: '{text}'")
+        trace.debug("ℹ️ 교정 불필요: '{}'", text)
         return text
 
-def enhance_korean_ocr_result(text):
-    """한국어 OCR 결과 종합 개선"""
+def enhance_korean_ocr_result(text, uncertain=()):
+    """한국어 OCR 결과 종합 개선 (uncertain: 엔진 신뢰도가 낮은 어절들)"""
     if not text:
         return text
     
-    print(f"🚀 한국어 OCR 결과 종합 개선 시작")
+    trace.debug("🚀 한국어 OCR 결과 종합 개선 시작")
     
     # 1. 기본 정리
     cleaned = clean_korean_ocr_text(text)
     if not cleaned:
-        print(f"❌ 기본 정리 단계에서 제거됨")
+        trace.debug("❌ 기본 정리 단계에서 제거됨")
         return ""
     
     # 2. 언어모델 교정
-    corrected = korean_language_correction(cleaned)
-    
-    # 3. 최종 품질 평가
-    final_score, final_desc, final_analysis = analyze_korean_text_quality(corrected)
+    corrected = korean_language_correction(cleaned, uncertain)
     
-    print(f"📊 최종 품질: {final_score}점 ({final_desc})")
-    print(f"🎯 최종 결과: '{corrected}'")
+    # 3. 최종 품질 평가 (디버그 로그에만 쓰이므로 켜져 있을 때만 계산)
+    if trace.enabled(DEBUG):
+        final_score, final_desc, _ = analyze_korean_text_quality(corrected)
+        trace.debug("📊 최종 품질: {}점 ({})", final_score, final_desc)
+    trace.debug("🎯 최종 결과: '{}'", corrected)
     
     return corrected 
\ No newline at end of file
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""OCR 엔진 백엔드
+
+- TesserocrBackend: Tesseract 엔진을 프로세스 안에 띄워두고 재사용
+  (언어별 traineddata를 한 번만 로딩, 임시 PNG/프로세스 생성 없음)
+- PytesseractBackend: 호출마다 tesseract 프로세스를 실행하는 기존 방식 (대체용)
+
+OCR_BACKEND 환경변수로 선택합니다. (auto | tesserocr | pytesseract)
+두 백엔드 모두 GrayImage를 받으면 PNG 압축 없이 원시 픽셀로 엔진에 넘기고,
+한 번의 호출로 텍스트와 단어 상자/신뢰도(OCRPage)를 함께 돌려줍니다.
+"""
+import os
+import statistics
+import time
+
+from gray_image import GrayImage
+from ocr_words import OCRPage, OCRWord, parse_tsv, words_to_text
+
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto")
+
+
+class OCRBackend:
+    """OCR 백엔드 공통 인터페이스"""
+    name = "base"
+
+    def recognize(self, image, lang, psm, timeout=None):
+        """이미지(GrayImage 또는 PIL 이미지)에서 텍스트와 단어 상자 추출 (OCRPage 반환)
+
+        timeout(초) 안에 끝나지 않으면 엔진을 중단하고 예외를 발생시킵니다.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """엔진 자원 정리"""
+        pass
+
+
+class PytesseractBackend(OCRBackend):
+    """pytesseract 백엔드 (호출마다 tesseract 프로세스 실행)"""
+    name = "pytesseract"
+
+    def __init__(self, tesseract_cmd=None):
+        import pytesseract
+        self._pytesseract = pytesseract
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def recognize(self, image, lang, psm, timeout=None):
+        config = f'--psm {psm} --dpi 300'
+        if isinstance(image, GrayImage):
+            # 임시 파일을 PNG 대신 무압축 PGM으로 저장 (압축/해제 비용 없음)
+            image = image.to_pil()
+            image.format = "PPM"
+        # 텍스트 대신 TSV(단어별 상자와 신뢰도)를 받아 텍스트도 여기서 재구성
+        # 시간이 지나면 pytesseract가 tesseract 프로세스를 종료하고 RuntimeError 발생
+        tsv = self._pytesseract.image_to_data(image, lang=lang, config=config,
+                                              timeout=timeout or 0)
+        words = parse_tsv(tsv)
+        return OCRPage(words_to_text(words), words, image.size)
+
+
+class TesserocrBackend(OCRBackend):
+    """tesserocr 백엔드 (엔진을 계속 띄워두고 재사용)"""
+    name = "tesserocr"
+
+    def __init__(self):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self._apis = {}  # 언어별 엔진
+
+    def _get_api(self, lang):
+        """언어별 엔진 반환 (처음 한 번만 traineddata 로딩)"""
+        api = self._apis.get(lang)
+        if api is None:
+            api = self._tesserocr.PyTessBaseAPI(lang=lang)
+            api.SetVariable("user_defined_dpi", "300")
+            self._apis[lang] = api
+        return api
+
+    def recognize(self, image, lang, psm, timeout=None):
+        api = self._get_api(lang)
+        api.SetPageSegMode(psm)
+        if isinstance(image, GrayImage):
+            # 원시 픽셀 버퍼를 그대로 전달 (1바이트/픽셀)
+            api.SetImageBytes(image.pixels.tobytes(), image.width,
+                              image.height, 1, image.width)
+        else:
+            api.SetImage(image)
+        # 엔진 내부 마감 시간(ms)을 넘기면 인식을 중단
+        if not api.Recognize(int(timeout * 1000) if timeout else 0):
+            if timeout:
+                raise TimeoutError(f"OCR 호출 시간 초과 ({timeout}초)")
+            raise RuntimeError("OCR 인식 실패")
+        return OCRPage(api.GetUTF8Text(), self._words(api), image.size)
+
+    def _words(self, api):
+        """인식이 끝난 엔진에서 단어별 텍스트, 신뢰도, 상자 읽기"""
+        level = self._tesserocr.RIL.WORD
+        iterator = api.GetIterator()
+        words = []
+        line = -1
+        if iterator is None:
+            return words
+        for word in self._tesserocr.iterate_level(iterator, level):
+            if word.IsAtBeginningOf(self._tesserocr.RIL.TEXTLINE):
+                line += 1
+            text = (word.GetUTF8Text(level) or '').strip()
+            if not text:
+                continue
+            x0, y0, x1, y1 = word.BoundingBox(level)
+            words.append(OCRWord(text, round(word.Confidence(level), 1),
+                                 x0, y0, x1 - x0, y1 - y0, max(line, 0)))
+        return words
+
+    def close(self):
+        for api in self._apis.values():
+            api.End()
+        self._apis.clear()
+
+
+def create_ocr_backend(name=None, tesseract_cmd=None):
+    """설정에 맞는 OCR 백엔드 생성 (실패하면 pytesseract로 대체)"""
+    name = name or OCR_BACKEND
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrBackend()
+        except Exception as e:
+            print(f"⚠️ tesserocr를 사용할 수 없어 pytesseract로 대체합니다: {e}")
+    return PytesseractBackend(tesseract_cmd)
+
+
+def measure_call_overhead(backend, repeats=3):
+    """빈 이미지 OCR 시간으로 호출당 고정 비용(ms) 측정"""
+    import numpy as np
+
+    blank = GrayImage(np.full((32, 32), 255, np.uint8))
+    try:
+        backend.recognize(blank, 'kor', 6)  # 엔진 로딩은 측정에서 제외
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            backend.recognize(blank, 'kor', 6)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+    except Exception as e:
+        print(f"⚠️ {backend.name} 호출 비용 측정 실패: {e}")
+        return None
+
+
+class OCRCallStats:
+    """OCR 호출 통계 (백엔드별 호출 수, 평균 시간, 절약된 고정 비용)"""
+
+    def __init__(self):
+        self.backend = None
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.engine_overhead_ms = None    # 현재 백엔드의 호출당 고정 비용
+        self.baseline_overhead_ms = None  # pytesseract의 호출당 고정 비용
+
+    def set_overhead(self, backend_name, engine_ms, baseline_ms):
+        self.backend = backend_name
+        self.engine_overhead_ms = engine_ms
+        self.baseline_overhead_ms = baseline_ms
+
+    def record(self, backend_name, seconds):
+        self.backend = backend_name
+        self.calls += 1
+        self.total_seconds += seconds
+
+    def to_dict(self):
+        saved_per_call = None
+        if (self.engine_overhead_ms is not None
+                and self.baseline_overhead_ms is not None):
+            saved_per_call = (self.baseline_overhead_ms
+                              - self.engine_overhead_ms)
+
+        def ms(value):
+            return round(value, 1) if value is not None else None
+
+        return {
+            "backend": self.backend,
+            "calls": self.calls,
+            "avg_call_ms": (ms(self.total_seconds * 1000 / self.calls)
+                            if self.calls else None),
+            "engine_overhead_ms": ms(self.engine_overhead_ms),
+            "pytesseract_overhead_ms": ms(self.baseline_overhead_ms),
+            "saved_ms_per_call": ms(saved_per_call),
+            "estimated_saved_ms": (round(saved_per_call * self.calls)
+                                   if saved_per_call is not None else None),
+        }
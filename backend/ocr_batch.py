@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""학급 단위 일괄 OCR
+
+교사가 여러 장의 사진(또는 ZIP 하나)을 한 번에 올리면
+사진마다 디코딩 → 전처리 → OCR → 제출 저장을 제한된 수만큼 동시에 진행하고,
+끝나는 순서대로 결과를 한 줄씩(NDJSON) 돌려줍니다.
+"""
+import asyncio
+import io
+import json
+import os
+import zipfile
+from collections import namedtuple
+
+# 동시에 처리할 사진 수
+OCR_BATCH_CONCURRENCY = int(os.getenv("OCR_BATCH_CONCURRENCY", "4"))
+
+# 한 번에 올릴 수 있는 최대 사진 수
+OCR_BATCH_MAX_ITEMS = int(os.getenv("OCR_BATCH_MAX_ITEMS", "100"))
+
+# ZIP 파일 최대 크기 (바이트)
+OCR_BATCH_MAX_ZIP_SIZE = int(
+    os.getenv("OCR_BATCH_MAX_ZIP_SIZE", str(200 * 1024 * 1024)))
+
+# 일괄 업로드 항목: 순번, 파일명, 학생 ID, 이미지 바이트, 오류 메시지
+BatchItem = namedtuple(
+    "BatchItem", ["index", "filename", "student_id", "contents", "error"])
+
+
+def student_id_from_name(filename):
+    """파일 경로에서 학생 ID 추출 (폴더가 있으면 폴더명, 없으면 파일명)
+
+    예) "student001/page1.jpg" → "student001", "홍길동.jpg" → "홍길동"
+    """
+    parts = [p for p in filename.replace('\\', '/').split('/') if p]
+    if len(parts) >= 2:
+        return parts[-2]
+    return os.path.splitext(parts[-1])[0] if parts else ""
+
+
+def expand_zip(contents, allowed_extensions, max_file_size):
+    """ZIP 안의 이미지들을 (파일명, 바이트 또는 None, 오류) 목록으로 풀기"""
+    entries = []
+    with zipfile.ZipFile(io.BytesIO(contents)) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            hidden = os.path.basename(name).startswith('.')
+            if info.is_dir() or name.startswith('__MACOSX/') or hidden:
+                continue
+
+            ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+            if ext not in allowed_extensions:
+                entries.append((name, None, "지원하지 않는 파일 형식입니다."))
+            elif info.file_size > max_file_size:
+                # 압축 해제 전에 크기를 확인해서 압축 폭탄 방지
+                entries.append((name, None, "파일 크기가 너무 큽니다."))
+            else:
+                entries.append((name, archive.read(info), None))
+    return entries
+
+
+def build_batch_items(uploads, student_ids, allowed_extensions, max_file_size):
+    """업로드 파일 목록(파일명, 바이트)을 일괄 처리 항목으로 변환
+
+    student_ids가 주어지면 ZIP이 아닌 파일과 순서대로 짝지어 사용하고,
+    없으면 파일명(또는 ZIP 안의 폴더명)에서 학생 ID를 추출합니다.
+    """
+    student_ids = list(student_ids or [])
+    entries = []
+    plain_index = 0
+
+    for filename, contents in uploads:
+        ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        if ext == 'zip':
+            if len(contents) > OCR_BATCH_MAX_ZIP_SIZE:
+                entries.append((filename, None, None, "ZIP 파일 크기가 너무 큽니다."))
+                continue
+            try:
+                expanded = expand_zip(contents, allowed_extensions,
+                                      max_file_size)
+                for name, data, error in expanded:
+                    entries.append(
+                        (name, student_id_from_name(name), data, error))
+            except zipfile.BadZipFile:
+                entries.append(
+                    (filename, None, None, "ZIP 파일을 읽을 수 없습니다."))
+            continue
+
+        student_id = (student_ids[plain_index]
+                      if plain_index < len(student_ids) else None)
+        plain_index += 1
+        student_id = ((student_id or "").strip()
+                      or student_id_from_name(filename))
+
+        if ext not in allowed_extensions:
+            entries.append(
+                (filename, student_id, None, "지원하지 않는 파일 형식입니다."))
+        elif len(contents) > max_file_size:
+            entries.append((filename, student_id, None, "파일 크기가 너무 큽니다."))
+        else:
+            entries.append((filename, student_id, contents, None))
+
+    if len(entries) > OCR_BATCH_MAX_ITEMS:
+        raise ValueError(
+            f"한 번에 최대 {OCR_BATCH_MAX_ITEMS}장까지 처리할 수 있습니다.")
+
+    return [BatchItem(i, *entry) for i, entry in enumerate(entries)]
+
+
+async def iter_batch_results(items, process_item, concurrency=None):
+    """항목들을 제한된 수만큼 동시에 처리하고 끝나는 순서대로 NDJSON 줄 반환
+
+    process_item: BatchItem을 받아 결과(dict)를 돌려주는 async 함수
+    """
+    semaphore = asyncio.Semaphore(concurrency or OCR_BATCH_CONCURRENCY)
+
+    async def handle(item):
+        base = {"index": item.index, "filename": item.filename,
+                "student_id": item.student_id}
+        if item.error:
+            return {**base, "success": False, "error": item.error}
+        async with semaphore:
+            try:
+                return {**base, **(await process_item(item))}
+            except Exception as e:
+                return {**base, "success": False, "error": str(e)}
+
+    tasks = [asyncio.create_task(handle(item)) for item in items]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            succeeded += 1 if line.get("success") else 0
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+        summary = {"done": True, "total": len(items), "succeeded": succeeded,
+                   "failed": len(items) - succeeded}
+        yield json.dumps(summary, ensure_ascii=False) + "\n"
+    finally:
+        # 클라이언트 연결이 끊기면 남은 작업 취소
+        for task in tasks:
+            task.cancel()
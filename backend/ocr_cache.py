@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""OCR 결과 캐시
+
+같은 사진을 다시 올리면 OCR을 처음부터 다시 돌리지 않도록
+업로드 파일의 SHA-256 + 파이프라인 버전을 키로 결과를 저장합니다.
+
+- 1차: 메모리 LRU (전체 크기 제한, 넘치면 오래된 것부터 제거)
+- 2차: 데이터베이스 (서버를 재시작해도 유지)
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from ocr_trace import trace
+
+# 메모리 캐시 최대 크기 (바이트)
+OCR_CACHE_MAX_BYTES = int(
+    os.getenv("OCR_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+def hash_upload(contents):
+    """업로드 파일 내용의 SHA-256"""
+    return hashlib.sha256(contents).hexdigest()
+
+
+class OCRResultCache:
+    """메모리 LRU + 데이터베이스 2단계 OCR 결과 캐시"""
+
+    def __init__(self, pipeline_version, db=None, max_bytes=None):
+        self.pipeline_version = pipeline_version
+        self.db = db
+        self.max_bytes = (OCR_CACHE_MAX_BYTES if max_bytes is None
+                          else max_bytes)
+        self._entries = OrderedDict()  # content_hash -> (결과, 크기)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, content_hash):
+        """캐시된 OCR 결과 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is not None:
+                self._entries.move_to_end(content_hash)
+                self.hits += 1
+                return entry[0]
+
+        result = None
+        if self.db:
+            try:
+                result = self.db.get_ocr_cache(
+                    content_hash, self.pipeline_version)
+            except Exception as e:
+                trace.warning("⚠️ OCR 캐시 조회 실패: {}", e)
+
+        if result is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.db_hits += 1
+        self._remember(content_hash, result)
+        return result
+
+    def put(self, content_hash, result):
+        """OCR 결과 저장 (메모리 + 데이터베이스)"""
+        self._remember(content_hash, result)
+        if self.db:
+            try:
+                self.db.save_ocr_cache(
+                    content_hash, self.pipeline_version, result)
+            except Exception as e:
+                trace.warning("⚠️ OCR 캐시 저장 실패: {}", e)
+
+    def _remember(self, content_hash, result):
+        """메모리 LRU에 넣고 크기 제한을 넘으면 오래된 항목부터 제거"""
+        size = len(json.dumps(result, ensure_ascii=False).encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(content_hash, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[content_hash] = (result, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        """캐시 적중/실패 통계"""
+        with self._lock:
+            lookups = self.hits + self.db_hits + self.misses
+            return {
+                "pipeline_version": self.pipeline_version,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (round((self.hits + self.db_hits) / lookups, 3)
+                             if lookups else None),
+            }
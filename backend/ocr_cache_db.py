@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""OCR 결과 캐시와 유사 이미지 해시 테이블
+
+DatabaseManager가 OCRCacheDB를 상속해서 db.get_ocr_cache(...)처럼 씁니다.
+"""
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def create_cache_tables(cursor):
+    """OCR 결과 캐시와 이미지 해시 테이블 생성 (열이 없던 예전 DB도 갱신)"""
+    # OCR 결과 캐시 (업로드 파일의 SHA-256 + 파이프라인 버전 기준)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ocr_cache (
+            content_hash TEXT NOT NULL,
+            pipeline_version TEXT NOT NULL,
+            result_json TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (content_hash, pipeline_version)
+        )
+    ''')
+
+    # 업로드 이미지의 지각 해시 (학생별 유사 이미지 탐지용)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS image_hashes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT NOT NULL,
+            dhash TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            image_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            fine_hash TEXT,
+            width INTEGER,
+            height INTEGER
+        )
+    ''')
+
+    # 기존 데이터베이스에는 같은 사진 확인용 열(세밀한 해시, 크기) 추가
+    columns = [row[1] for row in
+               cursor.execute("PRAGMA table_info(image_hashes)")]
+    for column, kind in (("fine_hash", "TEXT"), ("width", "INTEGER"),
+                         ("height", "INTEGER")):
+        if column not in columns:
+            cursor.execute(
+                f"ALTER TABLE image_hashes ADD COLUMN {column} {kind}")
+
+
+class OCRCacheDB:
+    """OCR 결과 캐시와 이미지 해시 조회/저장 (db_path, get_connection 사용)"""
+
+    def get_ocr_cache(self, content_hash: str,
+                      pipeline_version: str) -> Optional[Dict]:
+        """저장된 OCR 결과를 조회합니다."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT result_json FROM ocr_cache "
+            "WHERE content_hash = ? AND pipeline_version = ?",
+            (content_hash, pipeline_version)
+        )
+        row = cursor.fetchone()
+        conn.close()
+
+        if row:
+            return json.loads(row['result_json'])
+        return None
+
+    def save_ocr_cache(self, content_hash: str, pipeline_version: str,
+                       result: Dict):
+        """OCR 결과를 캐시에 저장합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        INSERT OR REPLACE INTO ocr_cache
+            (content_hash, pipeline_version, result_json, created_at)
+        VALUES (?, ?, ?, ?)
+        ''', (content_hash, pipeline_version,
+              json.dumps(result, ensure_ascii=False), datetime.now()))
+        conn.commit()
+        conn.close()
+
+    def save_image_hash(self, student_id: str, dhash: str, content_hash: str,
+                        image_path: str = None, fine_hash: str = None,
+                        width: int = None, height: int = None) -> int:
+        """업로드 이미지의 지각 해시(후보용 dHash, 확인용 해시와 크기)를 저장합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        INSERT INTO image_hashes (student_id, dhash, content_hash, image_path,
+            created_at, fine_hash, width, height)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (student_id, dhash, content_hash, image_path, datetime.now(),
+              fine_hash, width, height))
+        hash_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return hash_id
+
+    def get_image_hashes(self) -> List[Dict]:
+        """저장된 모든 이미지 해시를 조회합니다."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT student_id, dhash, content_hash, image_path, "
+            "fine_hash, width, height FROM image_hashes ORDER BY id")
+        rows = cursor.fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
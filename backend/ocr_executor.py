@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""OCR 병렬 실행기
+
+이미지 변형 × PSM × 언어 조합을 프로세스 풀에 나눠서 실행합니다.
+워커는 시작할 때 cv2와 OCR 백엔드(엔진)를 미리 로딩해 두고 요청을 기다립니다.
+워커가 죽어 풀이 망가지면 새 풀을 만들고 작업을 한 번 다시 실행합니다.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ocr_backends import (
+    OCRCallStats, PytesseractBackend, create_ocr_backend, measure_call_overhead,
+)
+from ocr_trace import trace
+
+# OCR 워커 수 (0이면 프로세스 풀 없이 스레드에서 순차 실행)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+
+# OCR 엔진 호출 한 번의 최대 시간 (초, 0이면 제한 없음)
+OCR_CALL_TIMEOUT = float(os.getenv("OCR_CALL_TIMEOUT", "10"))
+
+# 하나의 OCR 작업 단위: (변형 이름, 이미지, PSM 모드, 언어)
+OCRTask = namedtuple("OCRTask", ["variant_name", "image", "psm", "lang"])
+
+# 워커가 돌려주는 결과: (OCRPage, 백엔드 이름, 소요 시간(초))
+OCROutput = namedtuple("OCROutput", ["page", "backend", "seconds"])
+
+_executor = None
+_executor_lock = threading.Lock()  # 풀을 두 번 만들지 않도록
+_tesseract_cmd = None
+
+# 현재 프로세스의 OCR 백엔드 (워커 프로세스 또는 순차 실행용)
+_backend = None
+_backend_lock = threading.Lock()
+
+# 메인 프로세스에서 모으는 호출 통계
+call_stats = OCRCallStats()
+
+
+def _init_worker(tesseract_cmd):
+    """워커 프로세스 초기화 (무거운 모듈과 OCR 엔진을 미리 로딩)"""
+    global _backend
+    import cv2
+
+    # 워커 여러 개가 동시에 돌기 때문에 OpenCV 내부 스레드는 1개로 제한
+    cv2.setNumThreads(1)
+    _backend = create_ocr_backend(tesseract_cmd=tesseract_cmd)
+
+
+def _get_backend():
+    """현재 프로세스의 OCR 백엔드 반환 (없으면 생성)"""
+    global _backend
+    if _backend is None:
+        _backend = create_ocr_backend(tesseract_cmd=_tesseract_cmd)
+    return _backend
+
+
+def _warmup(measure=False):
+    """워커 프로세스를 띄우고 필요하면 호출당 고정 비용을 측정"""
+    backend = _get_backend()
+    if not measure:
+        return os.getpid(), backend.name, None, None
+
+    engine_ms = measure_call_overhead(backend)
+    if isinstance(backend, PytesseractBackend):
+        baseline_ms = engine_ms
+    else:
+        baseline_ms = measure_call_overhead(PytesseractBackend(_tesseract_cmd))
+    return os.getpid(), backend.name, engine_ms, baseline_ms
+
+
+def run_ocr_task(task):
+    """OCR 작업 하나 실행 (워커 프로세스에서 호출됨)"""
+    backend = _get_backend()
+    started = time.perf_counter()
+    page = backend.recognize(task.image, task.lang, task.psm,
+                             timeout=OCR_CALL_TIMEOUT or None)
+    return OCROutput(page, backend.name, time.perf_counter() - started)
+
+
+def configure_ocr_executor(tesseract_cmd=None):
+    """워커에 전달할 Tesseract 실행 파일 경로 설정"""
+    global _tesseract_cmd
+    _tesseract_cmd = tesseract_cmd
+
+
+def get_ocr_executor():
+    """OCR 프로세스 풀 반환 (처음 호출 시 생성 및 예열)
+
+    예열은 워커가 모두 뜰 때까지 기다리므로 이벤트 루프에서 직접 부르지 않고
+    서버 시작 훅이나 ensure_ocr_executor(스레드에서 실행)로 부릅니다.
+    """
+    global _executor
+    if OCR_WORKERS <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                initializer=_init_worker,
+                initargs=(_tesseract_cmd,),
+            )
+            # 모든 워커를 미리 띄워서 첫 요청의 지연을 없앰 (측정은 한 워커만)
+            warmups = [executor.submit(_warmup, i == 0)
+                       for i in range(OCR_WORKERS)]
+            results = [future.result() for future in warmups]
+            pid, backend_name, engine_ms, baseline_ms = results[0]
+            call_stats.set_overhead(backend_name, engine_ms, baseline_ms)
+            workers = len({r[0] for r in results})
+            trace.info("✅ OCR 워커 풀 준비 완료: {}개 프로세스 ({})",
+                       workers, backend_name)
+            _executor = executor
+    return _executor
+
+
+async def ensure_ocr_executor():
+    """요청 처리 중에 쓸 OCR 프로세스 풀 (없으면 스레드에서 만들어 루프를 막지 않음)"""
+    if OCR_WORKERS <= 0:
+        return None
+    if _executor is not None:
+        return _executor
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, get_ocr_executor)
+
+
+def _discard_broken_executor(executor):
+    """망가진 풀을 버림 (같은 풀을 여러 작업이 동시에 보고해도 한 번만)"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+            trace.warning("⚠️ OCR 워커가 비정상 종료되어 워커 풀을 다시 만듭니다")
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_ocr_executor():
+    """OCR 프로세스 풀 종료"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        trace.info("🛑 OCR 워커 풀 종료")
+
+
+def get_ocr_stats():
+    """OCR 백엔드 호출 통계 반환"""
+    return call_stats.to_dict()
+
+
+def _run_locked(task):
+    """순차 실행 모드: 엔진 하나를 여러 스레드가 동시에 쓰지 않도록 잠금"""
+    with _backend_lock:
+        return run_ocr_task(task)
+
+
+def _collect(outputs):
+    """워커 결과에서 통계를 기록하고 OCRPage만 꺼냄"""
+    pages = []
+    for output in outputs:
+        if isinstance(output, OCROutput):
+            call_stats.record(output.backend, output.seconds)
+            pages.append(output.page)
+        else:
+            pages.append(output)
+    return pages
+
+
+async def _run_task(task):
+    """작업 하나를 워커 풀에서 실행 (풀이 망가졌으면 새 풀에서 한 번 더)"""
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = await ensure_ocr_executor()
+        try:
+            return await loop.run_in_executor(executor, run_ocr_task, task)
+        except BrokenProcessPool:
+            _discard_broken_executor(executor)
+            if attempt:
+                raise
+
+
+def _submit(loop, executor, task):
+    """작업 하나를 워커 풀(또는 순차 실행 스레드)에 제출"""
+    if executor is None:
+        # 프로세스 풀을 쓰지 않는 경우에도 이벤트 루프는 막지 않음
+        return loop.run_in_executor(None, _run_locked, task)
+    return asyncio.ensure_future(_run_task(task))
+
+
+async def run_ocr_tasks(tasks):
+    """OCR 작업들을 병렬로 실행하고 결과(OCRPage)를 작업 순서대로 반환
+
+    실패한 작업은 예외 객체가 그대로 결과 자리에 들어갑니다.
+    """
+    loop = asyncio.get_running_loop()
+    executor = await ensure_ocr_executor()
+    futures = [_submit(loop, executor, task) for task in tasks]
+    return _collect(await asyncio.gather(*futures, return_exceptions=True))
+
+
+async def _as_async_iter(tasks):
+    for task in tasks:
+        yield task
+
+
+async def iter_ocr_results(tasks, concurrency=None):
+    """작업을 주어진 순서대로 제출하고, 끝나는 대로 (작업, OCRPage)를 반환
+
+    동시에 실행하는 작업은 concurrency개(기본: 워커 수)로 제한하므로
+    호출하는 쪽에서 중간에 멈추면 아직 제출하지 않은 작업은 실행되지 않습니다.
+    (중간에 멈출 때는 contextlib.aclosing으로 감싸서 사용)
+
+    tasks는 목록이나 비동기 이터레이터 모두 가능합니다. 비동기 이터레이터가
+    다음 작업을 준비하는 동안에도 이미 끝난 작업의 결과는 바로 반환합니다.
+    """
+    loop = asyncio.get_running_loop()
+    executor = await ensure_ocr_executor()
+    concurrency = concurrency or max(OCR_WORKERS, 1)
+    source = tasks if hasattr(tasks, '__aiter__') else _as_async_iter(tasks)
+    source = source.__aiter__()
+    pending = {}
+    next_task = None  # 다음 작업을 가져오는 중인 asyncio 태스크
+    exhausted = False
+
+    try:
+        while True:
+            if (next_task is None and not exhausted
+                    and len(pending) < concurrency):
+                next_task = asyncio.ensure_future(anext(source))
+
+            waiting = set(pending)
+            if next_task is not None:
+                waiting.add(next_task)
+            if not waiting:
+                break
+
+            done, _ = await asyncio.wait(
+                waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if next_task in done:
+                done.discard(next_task)
+                try:
+                    task = next_task.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending[_submit(loop, executor, task)] = task
+                next_task = None
+
+            for future in done:
+                task = pending.pop(future)
+                try:
+                    output = future.result()
+                except Exception as e:
+                    yield task, e
+                    continue
+                yield task, _collect([output])[0]
+    finally:
+        # 아직 시작하지 않은 작업은 취소
+        for future in pending:
+            future.cancel()
+        if next_task is not None:
+            next_task.cancel()
+            await asyncio.gather(next_task, return_exceptions=True)
+        if hasattr(source, 'aclose'):
+            await source.aclose()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""여러 OCR 결과를 글자 단위로 맞춰 합치는 융합 (ROVER 방식)
+
+점수가 가장 높은 결과를 뼈대로 삼고, 나머지 결과를 하나씩 글자 단위 편집 거리로
+정렬해 글자 자리(slot)마다 후보 글자와 가중치(결과 점수)를 모읍니다.
+자리마다 가중치 합이 가장 큰 글자를 고르고, '빈 글자'가 이기면 그 자리는 뺍니다.
+서로 다른 방법이 서로 다른 글자를 틀리는 경우, 하나의 최고 결과보다 정확해집니다.
+융합 텍스트도 다른 후보와 같은 방식으로 채점해서, 최고 결과보다 낮으면 버립니다.
+"""
+import os
+import re
+
+from ocr_words import OCRPage, mean_confidence
+
+# 융합에 쓸 상위 결과 수 (0이면 융합하지 않음)
+OCR_FUSION_TOP = int(os.getenv("OCR_FUSION_TOP", "4"))
+
+# 빈 글자 (이 자리에 글자가 없다고 본 결과의 표)
+GAP = ""
+
+
+def normalize_hypothesis(text):
+    """줄 안의 연속 공백은 하나로, 빈 줄은 제거"""
+    lines = [re.sub(r'[ \t]+', ' ', line).strip() for line in text.split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+
+def _key(char):
+    """비교용 글자 (공백과 줄바꿈은 같은 글자로 봄)"""
+    return ' ' if char.isspace() else char
+
+
+def _align(slots, text):
+    """글자 자리 목록과 새 결과를 편집 거리로 정렬
+
+    [(자리 번호 또는 None, 글자 또는 None), ...]를 자리 순서대로 반환합니다.
+    자리 번호가 None이면 새 자리 삽입, 글자가 None이면 이 결과가 그 자리를 건너뜀.
+    """
+    n, m = len(slots), len(text)
+    keys = [{_key(c) for c in slot if c} for slot in slots]
+    skip_cost = [0 if GAP in slot else 1 for slot in slots]
+    text_keys = [_key(c) for c in text]
+
+    cost = [list(range(m + 1))]
+    for i in range(1, n + 1):
+        candidates, skip = keys[i - 1], skip_cost[i - 1]
+        prev = cost[i - 1]
+        row = [prev[0] + skip]
+        for j in range(1, m + 1):
+            row.append(min(prev[j - 1] + (text_keys[j - 1] not in candidates),
+                           prev[j] + skip, row[j - 1] + 1))
+        cost.append(row)
+
+    ops = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and cost[i][j] == (
+                cost[i - 1][j - 1] + (text_keys[j - 1] not in keys[i - 1])):
+            ops.append((i - 1, text[j - 1]))
+            i, j = i - 1, j - 1
+        elif i > 0 and cost[i][j] == cost[i - 1][j] + skip_cost[i - 1]:
+            ops.append((i - 1, None))
+            i -= 1
+        else:
+            ops.append((None, text[j - 1]))
+            j -= 1
+    ops.reverse()
+    return ops
+
+
+def fuse_hypotheses(hypotheses):
+    """(텍스트, 가중치) 목록을 글자 단위 가중 투표로 합친 텍스트
+
+    첫 번째 결과가 뼈대가 되며, 가중치가 같으면 먼저 나온 결과의 글자를 고릅니다.
+    """
+    hypotheses = [(normalize_hypothesis(text), max(float(weight), 0.0))
+                  for text, weight in hypotheses]
+    hypotheses = [(text, weight) for text, weight in hypotheses if text]
+    if not hypotheses:
+        return ""
+
+    first_text, first_weight = hypotheses[0]
+    slots = [{char: first_weight} for char in first_text]
+    total = first_weight
+
+    for text, weight in hypotheses[1:]:
+        merged = []
+        for index, char in _align(slots, text):
+            if index is None:
+                # 앞선 결과들에는 없던 글자: 새 자리 (앞선 결과들은 빈 글자에 투표)
+                merged.append({GAP: total, char: weight})
+                continue
+            slot = slots[index]
+            if char is None:
+                slot[GAP] = slot.get(GAP, 0) + weight
+            else:
+                key = next((c for c in slot if c and _key(c) == _key(char)),
+                           char)
+                slot[key] = slot.get(key, 0) + weight
+            merged.append(slot)
+        slots = merged
+        total += weight
+
+    fused = []
+    for slot in slots:
+        char = max(slot, key=slot.get)
+        if char != GAP:
+            fused.append(char)
+    return normalize_hypothesis(''.join(fused))
+
+
+def fused_confidence(results):
+    """융합에 쓴 결과들의 엔진 신뢰도를 점수로 가중한 평균 (모두 모르면 None)"""
+    total = weight = 0
+    for _, _, score, _, _, page in results:
+        confidence = mean_confidence(page.words)
+        if confidence is not None:
+            total += confidence * score
+            weight += score
+    return total / weight if weight else None
+
+
+def fuse_results(results, rate, top=OCR_FUSION_TOP):
+    """점수 상위 결과를 융합한 후보 (최고 결과보다 높은 점수가 아니면 None)
+
+    results: (방법, 텍스트, 점수, 설명, 분석, OCRPage) 목록
+    rate(텍스트, 엔진 신뢰도, 최고 결과) → (점수, 설명, 분석):
+    다른 후보를 채점한 것과 같은 함수
+    점수가 같으면 엔진이 직접 읽은 최고 결과를 그대로 씁니다. 융합 텍스트를
+    쓰더라도 단어 상자와 신뢰도는 최고 결과의 것을 그대로 둡니다.
+    """
+    ranked = sorted(results, key=lambda x: x[2], reverse=True)[:top]
+    if len(ranked) < 2:
+        return None
+
+    best = ranked[0]
+    text = fuse_hypotheses([(result[1], result[2]) for result in ranked])
+    if not text or text == best[1]:
+        return None
+
+    score, desc, analysis = rate(text, fused_confidence(ranked), best)
+    if score <= best[2]:
+        return None
+    page = OCRPage(text, best[5].words, best[5].size)
+    return (f"융합(상위 {len(ranked)}개)", text, score, desc, analysis, page)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""비동기 OCR 작업 큐
+
+업로드 요청은 이미지를 저장하고 작업 ID만 바로 돌려받습니다.
+백그라운드 워커가 데이터베이스의 ocr_jobs 대기열을 순서대로 처리하며,
+실패한 작업은 정해진 횟수까지 다시 시도합니다.
+서버가 중간에 꺼져도 실행 중이던 작업은 재시작 시 다시 대기열로 돌아갑니다.
+"""
+import asyncio
+import os
+
+from ocr_trace import trace
+
+# 동시에 처리할 OCR 작업 수 (각 작업은 OCR 워커 풀을 함께 사용)
+OCR_JOB_WORKERS = int(os.getenv("OCR_JOB_WORKERS", "2"))
+
+# 작업당 최대 시도 횟수
+OCR_JOB_MAX_ATTEMPTS = int(os.getenv("OCR_JOB_MAX_ATTEMPTS", "3"))
+
+# 새 작업 알림이 없을 때 대기열을 다시 확인하는 간격 (초)
+OCR_JOB_POLL_INTERVAL = float(os.getenv("OCR_JOB_POLL_INTERVAL", "2"))
+
+
+class OCRJobQueue:
+    """데이터베이스 기반 OCR 작업 큐와 백그라운드 워커"""
+
+    def __init__(self, db, process_job, workers=None, max_attempts=None):
+        """process_job: 작업(dict)을 받아 결과(dict)를 돌려주는 async 함수"""
+        self.db = db
+        self.process_job = process_job
+        self.workers = workers if workers is not None else OCR_JOB_WORKERS
+        self.max_attempts = (OCR_JOB_MAX_ATTEMPTS if max_attempts is None
+                             else max_attempts)
+        self._wakeup = None
+        self._finished = {}  # job_id -> asyncio.Event (결과 대기 중인 요청용)
+        self._tasks = []
+
+    def start(self):
+        """워커 시작 (중단됐던 작업은 다시 대기열로)"""
+        self._wakeup = asyncio.Event()
+        requeued = self.db.requeue_running_ocr_jobs()
+        if requeued:
+            print(f"🔁 중단된 OCR 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+        self._tasks = [asyncio.create_task(self._worker(i))
+                       for i in range(self.workers)]
+        print(f"✅ OCR 작업 워커 {self.workers}개 시작")
+
+    async def stop(self):
+        """워커 종료 (실행 중이던 작업은 다음 시작 때 다시 처리됨)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, student_id, image_path):
+        """작업을 대기열에 넣고 작업 ID 반환"""
+        job_id = self.db.create_ocr_job(student_id, image_path)
+        if self._wakeup:
+            self._wakeup.set()
+        return job_id
+
+    async def wait(self, job_id, timeout):
+        """작업이 끝날 때까지 최대 timeout초 대기 (롱 폴링용)"""
+        job = self.db.get_ocr_job(job_id)
+        if not job or job['status'] in ('done', 'failed') or timeout <= 0:
+            return job
+
+        event = self._finished.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.db.get_ocr_job(job_id)
+
+    def stats(self):
+        """대기열 길이와 작업 시간 통계"""
+        return {"workers": self.workers, **self.db.get_ocr_job_stats()}
+
+    async def _next_job(self):
+        """대기 작업을 하나 가져옴 (없으면 알림 또는 폴링 간격까지 대기)"""
+        while True:
+            job = self.db.claim_next_ocr_job()
+            if job:
+                return job
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(),
+                                       OCR_JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self, worker_id):
+        while True:
+            job = await self._next_job()
+            trace.info("⚙️ OCR 작업 #{} 시작 (워커 {}, {}번째 시도)",
+                       job['id'], worker_id, job['attempts'])
+            try:
+                result = await self.process_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                retry = job['attempts'] < self.max_attempts
+                self.db.fail_ocr_job(job['id'], str(e), retry)
+                trace.warning("❌ OCR 작업 #{} 실패: {} ({})", job['id'], e,
+                              '재시도 예정' if retry else '포기')
+                if retry:
+                    continue
+            else:
+                self.db.complete_ocr_job(job['id'], result)
+                trace.info("✅ OCR 작업 #{} 완료", job['id'])
+
+            event = self._finished.pop(job['id'], None)
+            if event:
+                event.set()
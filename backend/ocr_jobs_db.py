@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""비동기 OCR 작업 큐 테이블
+
+DatabaseManager가 OCRJobsDB를 상속해서 db.claim_next_ocr_job()처럼 씁니다.
+"""
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, Optional
+
+
+def create_job_tables(cursor):
+    """OCR 작업 큐 테이블과 대기열 조회용 색인 생성"""
+    # 비동기 OCR 작업 큐 (서버를 재시작해도 남아 있도록 DB에 저장)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ocr_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT,
+            image_path TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result_json TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ocr_jobs_status "
+                   "ON ocr_jobs (status, id)")
+
+
+class OCRJobsDB:
+    """OCR 작업 추가/가져가기/완료 처리 (db_path, get_connection 사용)"""
+
+    def create_ocr_job(self, student_id: Optional[str], image_path: str) -> int:
+        """OCR 작업을 대기열에 추가합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        INSERT INTO ocr_jobs (student_id, image_path, status, created_at)
+        VALUES (?, ?, 'queued', ?)
+        ''', (student_id, image_path, datetime.now()))
+        job_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return job_id
+
+    def claim_next_ocr_job(self) -> Optional[Dict]:
+        """가장 오래된 대기 작업을 실행 중으로 바꾸고 반환합니다."""
+        conn = self.get_connection()
+        conn.isolation_level = None
+        cursor = conn.cursor()
+        try:
+            # 여러 워커(프로세스)가 같은 작업을 가져가지 않도록 쓰기 잠금
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT * FROM ocr_jobs WHERE status = 'queued' "
+                           "ORDER BY id LIMIT 1")
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute("COMMIT")
+                return None
+
+            now = datetime.now()
+            cursor.execute('''
+            UPDATE ocr_jobs
+            SET status = 'running', attempts = attempts + 1,
+                started_at = ?, error = NULL
+            WHERE id = ?
+            ''', (now, row['id']))
+            cursor.execute("COMMIT")
+
+            job = dict(row)
+            job.update(status='running', attempts=row['attempts'] + 1,
+                       started_at=now)
+            return job
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def complete_ocr_job(self, job_id: int, result: Dict):
+        """OCR 작업 결과를 저장하고 완료 처리합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        UPDATE ocr_jobs SET status = 'done', result_json = ?, finished_at = ?
+        WHERE id = ?
+        ''', (json.dumps(result, ensure_ascii=False), datetime.now(),
+              job_id))
+        conn.commit()
+        conn.close()
+
+    def fail_ocr_job(self, job_id: int, error: str, retry: bool):
+        """OCR 작업 실패 처리 (retry가 참이면 다시 대기열로)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        UPDATE ocr_jobs SET status = ?, error = ?, finished_at = ?
+        WHERE id = ?
+        ''', ('queued' if retry else 'failed', error,
+              None if retry else datetime.now(), job_id))
+        conn.commit()
+        conn.close()
+
+    def requeue_running_ocr_jobs(self) -> int:
+        """서버 재시작 등으로 중단된 실행 중 작업을 다시 대기열로 돌립니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("UPDATE ocr_jobs SET status = 'queued' "
+                       "WHERE status = 'running'")
+        count = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return count
+
+    def get_ocr_job(self, job_id: int) -> Optional[Dict]:
+        """OCR 작업 상태와 결과를 조회합니다."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+        SELECT *,
+            (julianday(started_at) - julianday(created_at)) * 86400
+                AS queued_seconds,
+            (julianday(finished_at) - julianday(started_at)) * 86400
+                AS run_seconds,
+            (SELECT COUNT(*) FROM ocr_jobs AS q
+             WHERE q.status = 'queued' AND q.id < ocr_jobs.id) AS queue_position
+        FROM ocr_jobs WHERE id = ?
+        ''', (job_id,))
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row:
+            return None
+        job = dict(row)
+        result_json = job.pop('result_json')
+        job['result'] = json.loads(result_json) if result_json else None
+        return job
+
+    def get_ocr_job_stats(self, recent: int = 100) -> Dict:
+        """대기열 길이와 최근 작업들의 평균 대기/처리 시간을 조회합니다."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT status, COUNT(*) AS count "
+                       "FROM ocr_jobs GROUP BY status")
+        counts = {row['status']: row['count'] for row in cursor.fetchall()}
+
+        cursor.execute('''
+        SELECT
+            AVG((julianday(started_at) - julianday(created_at)) * 86400)
+                AS avg_queued_seconds,
+            AVG((julianday(finished_at) - julianday(started_at)) * 86400)
+                AS avg_run_seconds,
+            MAX((julianday(finished_at) - julianday(started_at)) * 86400)
+                AS max_run_seconds
+        FROM (SELECT * FROM ocr_jobs WHERE status = 'done'
+              ORDER BY id DESC LIMIT ?)
+        ''', (recent,))
+        timing = dict(cursor.fetchone())
+        conn.close()
+
+        return {
+            "queued": counts.get('queued', 0),
+            "running": counts.get('running', 0),
+            "done": counts.get('done', 0),
+            "failed": counts.get('failed', 0),
+            **{key: round(value, 2) if value is not None else None
+               for key, value in timing.items()}
+        }
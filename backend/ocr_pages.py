@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""여러 쪽 제출 OCR
+
+긴 글은 여러 장에 걸쳐 쓰므로, 한 제출에 속한 쪽 사진들을 함께 받아
+쪽마다 동시에 OCR하고 쪽 번호 순서로 이어 붙여 하나의 OCR 텍스트로 만듭니다.
+쪽별 이미지와 결과는 submission_pages 테이블에 끝나는 대로 저장하므로
+한 쪽이 오래 걸려도 다른 쪽의 결과는 먼저 저장되고 전송됩니다.
+"""
+import asyncio
+import json
+import os
+from collections import namedtuple
+
+# 한 제출에 올릴 수 있는 최대 쪽 수
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "10"))
+
+# 쪽 사이 구분 (이어 붙일 때 쪽마다 빈 줄 하나)
+PAGE_SEPARATOR = "\n\n"
+
+# 연결이 끊겨 OCR을 끝내지 못한 쪽의 오류 메시지
+CANCELLED_ERROR = "클라이언트 연결이 끊겨 OCR이 취소되었습니다."
+
+# 제출의 한 쪽: 쪽 번호(1부터), 파일명, 이미지 바이트, 저장 경로, 학생 ID
+PageUpload = namedtuple(
+    "PageUpload",
+    ["page_number", "filename", "contents", "image_path", "student_id"])
+
+
+def stitch_pages(page_texts):
+    """{쪽 번호: 텍스트}를 쪽 번호 순서로 이어 붙임 (빈 쪽은 건너뜀)"""
+    return PAGE_SEPARATOR.join(
+        page_texts[number].strip() for number in sorted(page_texts)
+        if page_texts[number].strip()
+    )
+
+
+async def iter_page_results(db, submission_id, pages, process_page):
+    """쪽들을 동시에 OCR하고 끝나는 순서대로 NDJSON 줄 반환
+
+    process_page: PageUpload를 받아 OCR 결과(/ocr_upload 응답 형식)를 돌려주는 async 함수
+    쪽마다 결과를 바로 저장하고, 모두 끝나면 이어 붙인 텍스트를 제출 내역에 저장한 뒤
+    마지막 줄로 요약을 보냅니다. 중간에 연결이 끊기면 남은 쪽은 실패(취소)로 기록하고
+    끝난 쪽만 이어 붙여 저장하므로, 대기 중(pending)으로 남는 쪽이 없습니다.
+    """
+    async def handle(page):
+        base = {"page": page.page_number, "filename": page.filename}
+        try:
+            result = await process_page(page)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        if not result.get("success"):
+            error = result.get("error") or result.get("message") or "OCR 실패"
+            db.fail_submission_page(submission_id, page.page_number, error)
+            return {**base, "success": False, "error": error}
+
+        db.complete_submission_page(submission_id, page.page_number,
+                                    result.get("ocr_text", ""),
+                                    result.get("quality_score"),
+                                    result.get("ocr_words"))
+        return {
+            **base,
+            "success": True,
+            "ocr_text": result.get("ocr_text", ""),
+            "quality_score": result.get("quality_score"),
+            "partial": result.get("partial", False),
+            "cached": result.get("cached", False),
+        }
+
+    tasks = {asyncio.create_task(handle(page)): page for page in pages}
+    page_texts = {}
+    finished = False
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            if line["success"]:
+                page_texts[line["page"]] = line["ocr_text"]
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+        ocr_text = stitch_pages(page_texts)
+        db.update_submission_ocr_text(submission_id, ocr_text)
+        finished = True
+        summary = {"done": True, "submission_id": submission_id,
+                   "ocr_text": ocr_text, "total": len(pages),
+                   "succeeded": len(page_texts),
+                   "failed": len(pages) - len(page_texts)}
+        yield json.dumps(summary, ensure_ascii=False) + "\n"
+    finally:
+        if not finished:
+            _cancel_pages(db, submission_id, tasks, page_texts)
+
+
+def _cancel_pages(db, submission_id, tasks, page_texts):
+    """클라이언트 연결이 끊겼을 때: 남은 쪽은 취소해 실패로 기록하고,
+    이미 끝난 쪽(전송하지 못한 쪽 포함)만 이어 붙여 제출 내역에 저장"""
+    for task, page in tasks.items():
+        if not task.done():
+            task.cancel()
+            db.fail_submission_page(submission_id, page.page_number,
+                                    CANCELLED_ERROR)
+        elif not task.cancelled() and task.exception() is None:
+            line = task.result()
+            if line["success"]:
+                page_texts[line["page"]] = line["ocr_text"]
+    db.update_submission_ocr_text(submission_id, stitch_pages(page_texts))
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""여러 쪽 제출의 쪽 테이블과 OCR 단어 상자 열
+
+DatabaseManager가 OCRPagesDB를 상속해서 db.create_submission_pages(...)처럼 씁니다.
+"""
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def dump_words(ocr_words):
+    """OCR 단어 상자/신뢰도를 저장용 JSON으로 (없으면 None)"""
+    if not ocr_words:
+        return None
+    return json.dumps(ocr_words, ensure_ascii=False, separators=(',', ':'))
+
+
+def create_page_tables(cursor):
+    """OCR 단어 상자 열과 쪽 테이블 생성 (submissions 테이블 다음에 호출)"""
+    # 기존 데이터베이스에는 OCR 단어 상자/신뢰도 열 추가
+    columns = [row[1] for row in
+               cursor.execute("PRAGMA table_info(submissions)")]
+    if "ocr_words" not in columns:
+        cursor.execute("ALTER TABLE submissions ADD COLUMN ocr_words TEXT")
+
+    # 여러 쪽 제출의 쪽별 이미지와 OCR 결과 (쪽마다 끝나는 대로 저장)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS submission_pages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            submission_id INTEGER NOT NULL REFERENCES submissions (id),
+            page_number INTEGER NOT NULL,
+            image_path TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            ocr_text TEXT,
+            quality_score INTEGER,
+            ocr_words TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP,
+            UNIQUE (submission_id, page_number)
+        )
+    ''')
+
+
+class OCRPagesDB:
+    """쪽별 OCR 결과 조회/저장 (db_path, get_connection 사용)"""
+
+    def update_submission_ocr_text(self, submission_id: int, ocr_text: str):
+        """OCR 텍스트 업데이트 (여러 쪽 제출에서 쪽별 결과를 이어 붙인 뒤)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        UPDATE submissions SET ocr_text = ?, update_time = ? WHERE id = ?
+        ''', (ocr_text, datetime.now(), submission_id))
+        conn.commit()
+        conn.close()
+
+    def create_submission_pages(self, submission_id: int,
+                                image_paths: List[str]):
+        """제출 내역의 쪽들을 처리 대기 상태로 추가합니다. (쪽 번호는 1부터)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.executemany('''
+        INSERT INTO submission_pages
+            (submission_id, page_number, image_path, status, created_at)
+        VALUES (?, ?, ?, 'pending', ?)
+        ''', [(submission_id, number, path, datetime.now())
+              for number, path in enumerate(image_paths, 1)])
+        conn.commit()
+        conn.close()
+
+    def complete_submission_page(self, submission_id: int, page_number: int,
+                                 ocr_text: str,
+                                 quality_score: Optional[int] = None,
+                                 ocr_words: Dict = None):
+        """한 쪽의 OCR 결과를 저장하고 완료 처리합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        UPDATE submission_pages
+        SET status = 'done', ocr_text = ?, quality_score = ?, ocr_words = ?,
+            error = NULL, finished_at = ?
+        WHERE submission_id = ? AND page_number = ?
+        ''', (ocr_text, quality_score, dump_words(ocr_words), datetime.now(),
+              submission_id, page_number))
+        conn.commit()
+        conn.close()
+
+    def fail_submission_page(self, submission_id: int, page_number: int,
+                             error: str):
+        """한 쪽의 OCR 실패를 기록합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        UPDATE submission_pages
+        SET status = 'failed', error = ?, finished_at = ?
+        WHERE submission_id = ? AND page_number = ?
+        ''', (error, datetime.now(), submission_id, page_number))
+        conn.commit()
+        conn.close()
+
+    def get_submission_pages(self, submission_id: int) -> List[Dict]:
+        """제출 내역의 쪽들을 쪽 번호 순서로 조회합니다."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM submission_pages WHERE submission_id = ? "
+            "ORDER BY page_number",
+            (submission_id,))
+        rows = cursor.fetchall()
+        conn.close()
+
+        pages = [dict(row) for row in rows]
+        for page in pages:
+            if page.get("ocr_words"):
+                page["ocr_words"] = json.loads(page["ocr_words"])
+        return pages
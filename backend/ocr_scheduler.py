@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""OCR 후보 스케줄러
+
+업로드마다 어떤 OCR 방법(method_name)이 최종 선택됐는지 기록하고,
+선택률이 높은 방법부터 실행하도록 순서를 정합니다 (UCB 방식).
+최고 점수가 기준을 넘거나 시간 예산을 다 쓰면 나머지 후보는 실행하지 않습니다.
+융합용 결과 수(OCR_FUSION_STOP)를 정하면 그만큼 결과가 모였을 때도 멈춥니다.
+"""
+import math
+import os
+import time
+
+# 이 점수 이상인 결과가 나오면 나머지 후보는 건너뜀
+# (점수 = 한글 품질 × 엔진 신뢰도 비율: 한글 품질 95점이면 신뢰도 74 이상)
+OCR_EARLY_EXIT_SCORE = int(os.getenv("OCR_EARLY_EXIT_SCORE", "70"))
+
+# 업로드 한 건당 OCR 시간 예산 (초) - 넘으면 새 후보를 시작하지 않음
+OCR_TIME_BUDGET = float(os.getenv("OCR_TIME_BUDGET", "20"))
+
+# 업로드 한 건당 OCR 마감 시간 (초) - 넘으면 실행 중인 작업도 취소하고 그때까지의 결과 사용 (0이면 제한 없음)
+OCR_DEADLINE = float(os.getenv("OCR_DEADLINE", "30"))
+
+# 이만큼 결과가 모이면 나머지 후보는 건너뛰고 융합으로 마무리 (0이면 사용하지 않음)
+OCR_FUSION_STOP = int(os.getenv("OCR_FUSION_STOP", "0"))
+
+# 이 사유로 멈춘 경우 일부 후보만 실행한 결과 (partial)
+PARTIAL_STOP_REASONS = ("time_budget", "deadline")
+
+# 탐색 가중치 (클수록 적게 시도된 방법도 자주 실행)
+OCR_EXPLORATION = float(os.getenv("OCR_EXPLORATION", "0.5"))
+
+
+def ocr_method_name(task):
+    """OCR 작업의 방법 이름 (결과 표시 및 통계 키로 사용)"""
+    if task.lang == 'kor':
+        return f"한국어({task.variant_name}-PSM{task.psm})"
+    return f"한영혼합({task.variant_name}-PSM{task.psm})"
+
+
+class OCRScheduler:
+    """선택률 기반 OCR 후보 정렬 및 조기 종료 판단"""
+
+    def __init__(self, db=None, score_threshold=None, time_budget=None,
+                 exploration=None, deadline=None, fusion_stop=None):
+        self.db = db
+        self.score_threshold = (OCR_EARLY_EXIT_SCORE if score_threshold is None
+                                else score_threshold)
+        self.time_budget = (OCR_TIME_BUDGET if time_budget is None
+                            else time_budget)
+        self.deadline = deadline if deadline is not None else OCR_DEADLINE
+        self.exploration = (OCR_EXPLORATION if exploration is None
+                            else exploration)
+        self.fusion_stop = (OCR_FUSION_STOP if fusion_stop is None
+                            else fusion_stop)
+        self.stats = {}
+        if db:
+            try:
+                self.stats = db.get_ocr_method_stats()
+            except Exception as e:
+                print(f"⚠️ OCR 방법 통계 로딩 실패: {e}")
+
+    def priority(self, method_name, total_uploads):
+        """선택률 + 탐색 보너스 (한 번도 안 해본 방법도 유한한 값)"""
+        stat = self.stats.get(method_name, {'trials': 0, 'wins': 0})
+        trials, wins = stat['trials'], stat['wins']
+        win_rate = (wins + 1) / (trials + 2)
+        bonus = self.exploration * math.sqrt(
+            math.log(total_uploads + 1) / (trials + 1))
+        return win_rate + bonus
+
+    def order(self, tasks):
+        """우선순위가 높은 순서로 OCR 작업 정렬 (동점이면 원래 순서 유지)"""
+        # 업로드 한 건당 선택되는 방법은 하나이므로 wins 합계 = 누적 업로드 수
+        total_uploads = sum(stat['wins'] for stat in self.stats.values())
+        return sorted(
+            tasks,
+            key=lambda task: -self.priority(
+                ocr_method_name(task), total_uploads),
+        )
+
+    def start(self):
+        """한 건의 OCR 검색 시작 시각 반환"""
+        return time.perf_counter()
+
+    def remaining(self, started):
+        """마감 시간까지 남은 시간 (초, 마감이 없으면 None)"""
+        if self.deadline <= 0:
+            return None
+        return max(0.0, self.deadline - (time.perf_counter() - started))
+
+    def stop_reason(self, best_score, started, result_count=0):
+        """조기 종료 사유 반환 (계속 진행하면 None)"""
+        if best_score is not None and best_score >= self.score_threshold:
+            return "score"
+        if self.fusion_stop and result_count >= self.fusion_stop:
+            return "fusion"
+        if time.perf_counter() - started >= self.time_budget:
+            return "time_budget"
+        return None
+
+    def record(self, tried_methods, winner):
+        """이번 업로드의 시도 목록과 선택 결과를 통계에 반영"""
+        for method_name in tried_methods:
+            stat = self.stats.setdefault(method_name, {'trials': 0, 'wins': 0})
+            stat['trials'] += 1
+            if method_name == winner:
+                stat['wins'] += 1
+
+        if self.db:
+            try:
+                self.db.record_ocr_method_result(list(tried_methods), winner)
+            except Exception as e:
+                print(f"⚠️ OCR 방법 통계 저장 실패: {e}")
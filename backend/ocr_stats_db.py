@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""OCR 방법 통계와 이미지 품질 라우팅 기록 테이블
+
+DatabaseManager가 OCRStatsDB를 상속해서 db.record_ocr_method_result(...)처럼 씁니다.
+"""
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def create_stats_tables(cursor):
+    """OCR 방법 통계와 라우팅 기록 테이블 생성"""
+    # OCR 방법별 시도/선택 횟수 (OCR 스케줄러 우선순위 계산용)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ocr_method_stats (
+            method_name TEXT PRIMARY KEY,
+            trials INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # 이미지 품질 라우팅 기록 (품질 지표, 고른 변형, 최종 OCR 결과 - 라우팅 표 조정용)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ocr_routing_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            metrics_json TEXT NOT NULL,
+            matched_rules TEXT,
+            variants TEXT NOT NULL,
+            winner TEXT,
+            best_score INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+class OCRStatsDB:
+    """OCR 스케줄러 통계와 라우팅 기록 조회/저장 (db_path, get_connection 사용)"""
+
+    def get_ocr_method_stats(self) -> Dict[str, Dict[str, int]]:
+        """OCR 방법별 시도/선택 횟수를 조회합니다."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT method_name, trials, wins FROM ocr_method_stats")
+        rows = cursor.fetchall()
+        conn.close()
+
+        return {
+            row['method_name']: {'trials': row['trials'], 'wins': row['wins']}
+            for row in rows
+        }
+
+    def record_ocr_method_result(self, tried_methods: List[str],
+                                 winner: Optional[str]):
+        """한 번의 업로드에서 시도한 OCR 방법들과 최종 선택된 방법을 기록합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        now = datetime.now()
+
+        for method_name in tried_methods:
+            win = 1 if method_name == winner else 0
+            cursor.execute('''
+            INSERT INTO ocr_method_stats (method_name, trials, wins, updated_at)
+            VALUES (?, 1, ?, ?)
+            ON CONFLICT(method_name) DO UPDATE SET
+                trials = trials + 1,
+                wins = wins + excluded.wins,
+                updated_at = excluded.updated_at
+            ''', (method_name, win, now))
+
+        conn.commit()
+        conn.close()
+
+    def save_routing_log(self, metrics: Dict, matched_rules: List[str],
+                         variants: List[str],
+                         winner: Optional[str], best_score: Optional[int]):
+        """업로드 한 건의 품질 지표, 고른 변형, 최종 선택 방법을 기록합니다."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        INSERT INTO ocr_routing_log (metrics_json, matched_rules, variants,
+            winner, best_score, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (json.dumps(metrics), ",".join(matched_rules), ",".join(variants),
+              winner, best_score, datetime.now()))
+        conn.commit()
+        conn.close()
+
+    def get_routing_log(self, limit: int = 500) -> List[Dict]:
+        """최근 라우팅 기록 (품질 지표는 딕셔너리로)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM ocr_routing_log ORDER BY id DESC LIMIT ?", (limit,))
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        for row in rows:
+            row["metrics"] = json.loads(row.pop("metrics_json"))
+        return rows
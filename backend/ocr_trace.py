@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""요청별 OCR 추적 기록 (OCR/텍스트 처리 경로의 print 대신 사용)
+
+업로드 한 건에 후보마다 정리/교정/점수 로그가 수백 줄씩 콘솔에 찍히면 느리고
+(특히 Windows 콘솔), 동시에 들어온 요청의 로그가 서로 섞입니다.
+trace.debug/info/warning으로 남긴 이벤트는 요청마다 만든 수집기(contextvars)에만 쌓이고,
+요청이 추적을 원할 때만 응답의 debug_info에 붙습니다.
+- 수집기가 없으면(추적을 원하지 않은 요청) 아무 일도 하지 않고, 메시지 형식화도 하지 않음
+- 메시지는 str.format 형식이며 기록할 때만 인자를 채움 (trace.debug("점수 {}점", score))
+- 요청 하나의 이벤트 수는 OCR_TRACE_LIMIT까지 (넘는 것은 개수만 셈)
+- OCR_TRACE_SAMPLE을 주면 같은 DEBUG 메시지는 N번 중 한 번만 기록
+"""
+import contextvars
+import functools
+import os
+import time
+from contextlib import contextmanager
+
+# 추적 수준
+DEBUG = 10    # 후보마다 나오는 세부 기록 (정리/교정/점수)
+INFO = 20     # 업로드마다 몇 번 나오는 진행 기록 (단계, 조기 종료, 최종 순위)
+WARNING = 30  # 실패하거나 결과를 버린 기록
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING}
+LEVEL_NAMES = {level: name.upper() for name, level in LEVELS.items()}
+
+# 추적을 원한 요청에서 기록할 최소 수준
+OCR_TRACE_LEVEL = LEVELS.get(
+    os.getenv("OCR_TRACE_LEVEL", "debug").lower(), DEBUG)
+
+# 요청 하나에 남길 최대 이벤트 수
+OCR_TRACE_LIMIT = int(os.getenv("OCR_TRACE_LIMIT", "500"))
+
+# 같은 DEBUG 메시지는 이 횟수 중 한 번만 기록 (1이면 모두 기록)
+OCR_TRACE_SAMPLE = int(os.getenv("OCR_TRACE_SAMPLE", "1"))
+
+# 요청과 관계없이 콘솔에도 출력할 최소 수준 (none이면 출력하지 않음, 개발할 때 debug/info)
+OCR_TRACE_CONSOLE = LEVELS.get(os.getenv("OCR_TRACE_CONSOLE", "none").lower())
+
+_collector = contextvars.ContextVar("ocr_trace_collector", default=None)
+
+
+def _format(message, args):
+    return message.format(*args) if args else message
+
+
+class TraceCollector:
+    """요청 하나의 추적 이벤트 (경과 시간, 수준, 메시지)"""
+
+    def __init__(self, level=None, limit=None, sample=None):
+        self.level = OCR_TRACE_LEVEL if level is None else level
+        self.limit = OCR_TRACE_LIMIT if limit is None else limit
+        self.sample = max(1, OCR_TRACE_SAMPLE if sample is None else sample)
+        self.started = time.perf_counter()
+        self.events = []
+        self.dropped = 0
+        self.sampled_out = 0
+        self._seen = {}
+
+    def add(self, level, message, args):
+        if level < self.level:
+            return
+        if level == DEBUG and self.sample > 1:
+            seen = self._seen.get(message, 0)
+            self._seen[message] = seen + 1
+            if seen % self.sample:
+                self.sampled_out += 1
+                return
+        if len(self.events) >= self.limit:
+            self.dropped += 1
+            return
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        self.events.append(
+            (round(elapsed_ms, 1), level, _format(message, args)))
+
+    def lines(self):
+        """응답 debug_info에 붙일 문자열 목록"""
+        lines = [f"[{elapsed_ms:.1f}ms {LEVEL_NAMES[level]}] {text}"
+                 for elapsed_ms, level, text in self.events]
+        if self.dropped or self.sampled_out:
+            lines.append(f"[추적] 한도 초과 {self.dropped}개, "
+                         f"샘플링 제외 {self.sampled_out}개 생략")
+        return lines
+
+
+class Trace:
+    """현재 요청의 수집기로 이벤트를 보냄 (수집기가 없으면 아무 일도 하지 않음)"""
+
+    def enabled(self, level):
+        """이 수준의 이벤트가 어딘가에 기록되는지 (기록용 값 계산이 비쌀 때 확인)"""
+        collector = _collector.get()
+        return ((collector is not None and level >= collector.level)
+                or (OCR_TRACE_CONSOLE is not None
+                    and level >= OCR_TRACE_CONSOLE))
+
+    def emit(self, level, message, args):
+        collector = _collector.get()
+        if collector is not None:
+            collector.add(level, message, args)
+        if OCR_TRACE_CONSOLE is not None and level >= OCR_TRACE_CONSOLE:
+            print(_format(message, args))
+
+    def debug(self, message, *args):
+        self.emit(DEBUG, message, args)
+
+    def info(self, message, *args):
+        self.emit(INFO, message, args)
+
+    def warning(self, message, *args):
+        self.emit(WARNING, message, args)
+
+
+trace = Trace()
+
+
+@contextmanager
+def tracing(enabled=True, **options):
+    """with 블록 안(같은 요청에서 만든 작업 포함)의 이벤트를 모으는 수집기
+
+    enabled가 거짓이면 수집기 없이 None을 돌려줍니다.
+    """
+    if not enabled:
+        yield None
+        return
+    collector = TraceCollector(**options)
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+
+def in_context(func):
+    """현재 요청의 수집기를 이어받아 실행하는 함수 (run_in_executor로 스레드에 넘길 때)"""
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def attach_trace(response, collector):
+    """수집기가 있으면 이벤트를 debug_info에 붙인 새 응답 (캐시에 저장된 응답은 바꾸지 않음)"""
+    if collector is None:
+        return response
+    debug_info = list(response.get("debug_info") or []) + collector.lines()
+    return {**response, "debug_info": debug_info}
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""OCR 단어 상자와 신뢰도
+
+OCR 엔진 호출 한 번으로 텍스트와 함께 단어별 위치(상자)와 엔진 신뢰도를 받아
+OCRPage로 돌려줍니다. 결과를 고르거나, 틀린 글자를 강조하거나, 나중에 다시
+점수를 매길 때 Tesseract를 다시 실행하지 않아도 됩니다.
+제출 내역에는 pack_page로 줄인 형태(필드 이름 + 단어별 배열)로 저장합니다.
+"""
+import os
+from collections import namedtuple
+
+# 엔진 신뢰도를 모르는 결과에 쓸 신뢰도 (어휘 교정의 '불확실' 기준과 같은 값)
+OCR_UNKNOWN_CONFIDENCE = float(os.getenv("OCR_UNKNOWN_CONFIDENCE", "60"))
+
+# 선택 점수가 이 값 미만이면 응답에 품질 경고 (예전 한글 품질 40점 × 신뢰도 60%)
+OCR_LOW_QUALITY_SCORE = int(os.getenv("OCR_LOW_QUALITY_SCORE", "25"))
+
+# 단어 하나: 텍스트, 엔진 신뢰도(0~100), 상자(왼쪽, 위, 너비, 높이), 줄 번호
+OCRWord = namedtuple(
+    "OCRWord", ["text", "conf", "left", "top", "width", "height", "line"])
+
+# OCR 호출 한 번의 결과: 텍스트, 단어 목록, 인식한 이미지 크기 (가로, 세로)
+OCRPage = namedtuple("OCRPage", ["text", "words", "size"])
+
+# 저장 형식의 단어 필드 순서
+PACKED_FIELDS = list(OCRWord._fields)
+
+
+def parse_tsv(tsv):
+    """Tesseract TSV(image_to_data) 출력에서 단어 목록 추출
+
+    블록/문단/줄 번호가 바뀔 때마다 줄 번호를 0부터 하나씩 늘립니다.
+    """
+    rows = tsv.strip().split('\n')
+    if not rows:
+        return []
+    header = rows[0].split('\t')
+    index = {name: i for i, name in enumerate(header)}
+
+    words = []
+    line_key, line = None, -1
+    for row in rows[1:]:
+        values = row.split('\t')
+        if len(values) < len(header) or values[index['level']] != '5':
+            continue
+        text = values[index['text']].strip()
+        if not text:
+            continue
+        key = (values[index['block_num']], values[index['par_num']],
+               values[index['line_num']])
+        if key != line_key:
+            line_key, line = key, line + 1
+        words.append(OCRWord(
+            text, round(float(values[index['conf']]), 1),
+            int(values[index['left']]), int(values[index['top']]),
+            int(values[index['width']]), int(values[index['height']]), line,
+        ))
+    return words
+
+
+def words_to_text(words):
+    """단어 목록을 줄 단위 텍스트로 (같은 줄은 공백, 줄 사이는 줄바꿈)"""
+    lines = []
+    current = None
+    for word in words:
+        if word.line != current:
+            lines.append([])
+            current = word.line
+        lines[-1].append(word.text)
+    return '\n'.join(' '.join(line) for line in lines)
+
+
+def mean_confidence(words):
+    """글자 수로 가중한 평균 엔진 신뢰도 (단어가 없으면 None)
+
+    Tesseract는 신뢰도를 모르는 단어에 -1을 주므로 제외합니다.
+    """
+    total = weight = 0
+    for word in words:
+        if word.conf < 0:
+            continue
+        total += word.conf * len(word.text)
+        weight += len(word.text)
+    return total / weight if weight else None
+
+
+def confidence_score(heuristic, confidence):
+    """한글 품질 점수(0~100)에 엔진 신뢰도 비율을 곱한 선택 점수 (0~100)
+
+    신뢰도가 있는 결과와 없는 결과가 같은 척도로 비교되도록, 신뢰도를 모르면
+    OCR_UNKNOWN_CONFIDENCE로 봅니다. 손글씨의 신뢰도는 보통 60~80이므로
+    점수는 한글 품질 점수보다 낮고, 기준값(OCR_EARLY_EXIT_SCORE,
+    OCR_LOW_QUALITY_SCORE)도 이 척도에 맞춰져 있습니다.
+    """
+    if confidence is None:
+        confidence = OCR_UNKNOWN_CONFIDENCE
+    confidence = min(max(confidence, 0), 100)
+    return round(min(max(heuristic, 0), 100) * confidence / 100)
+
+
+def merge_line_pages(pages, boxes, size):
+    """줄마다 따로 인식한 결과를 페이지 좌표의 한 결과로 합침
+
+    boxes: 각 줄을 잘라낸 영역 [(x0, y0, x1, y1), ...] (pages와 같은 순서)
+    """
+    words = []
+    first_line = 0
+    for page, (x0, y0, _, _) in zip(pages, boxes):
+        words += [word._replace(left=word.left + x0, top=word.top + y0,
+                                line=first_line + word.line)
+                  for word in page.words]
+        if page.words:
+            first_line += max(word.line for word in page.words) + 1
+    text = '\n'.join(page.text.strip() for page in pages if page.text.strip())
+    return OCRPage(text, words, size)
+
+
+def pack_page(page):
+    """저장/응답용으로 줄인 형태 (단어마다 필드 순서대로 값만 나열)"""
+    confidence = mean_confidence(page.words)
+    return {
+        "size": list(page.size),
+        "confidence": round(confidence, 1) if confidence is not None else None,
+        "fields": PACKED_FIELDS,
+        "words": [list(word) for word in page.words],
+    }
+
+
+def unpack_words(packed):
+    """pack_page 형태에서 단어 목록 복원"""
+    if not packed:
+        return []
+    fields = packed.get("fields", PACKED_FIELDS)
+    return [OCRWord(**dict(zip(fields, values)))
+            for values in packed.get("words", [])]
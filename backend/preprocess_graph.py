@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""메모이즈 전처리 그래프
+
+한 업로드에서 만드는 여러 전처리 변형은 그레이스케일 변환, 블러, CLAHE,
+Otsu 이진화 같은 중간 단계를 공유합니다. 각 단계는 preprocess_nodes에 이름 있는
+노드로 정의되어 있고, 업로드마다 PreprocessGraph 하나를 만들어 노드를 처음
+요청할 때 한 번만 계산합니다.
+노드마다 실행 시간(의존 노드 제외)을 기록해 어느 단계가 비싼지 확인할 수 있습니다.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from ocr_trace import trace
+from preprocess_nodes import NODES
+
+# 업로드 한 건이 전처리 이미지에 쓸 수 있는 메모리 (MB)
+# 넘으면 오래 쓰지 않은 중간 결과부터 버리고, 다음 변형 생성을 잠시 미룸
+OCR_VARIANT_MEMORY_MB = int(os.getenv("OCR_VARIANT_MEMORY_MB", "256"))
+
+# 메모리가 부족해도 버리지 않는 노드 (다시 만들기 비싸고 거의 모든 변형이 사용)
+PINNED_NODES = {"source", "gray"}
+
+
+def _nbytes(value):
+    """노드 결과가 차지하는 메모리 (바이트)"""
+    if isinstance(value, tuple):
+        value = value[0]
+    return value.nbytes if isinstance(value, np.ndarray) else 0
+
+
+class PreprocessGraph:
+    """업로드 한 장에 대한 전처리 그래프 (노드 결과를 한 번만 계산해서 공유)
+
+    저장된 중간 결과와 take()로 넘겨준 변형의 크기를 합쳐 메모리 사용량을 추적합니다.
+    사용량이 memory_limit를 넘으면 가장 오래 쓰지 않은 중간 결과부터 버리고,
+    버린 결과가 다시 필요하면 입력 노드에서 다시 계산합니다.
+    이벤트 루프와 실행기 스레드가 같은 그래프를 쓰므로, 노드 계산과 메모리 사용량
+    갱신은 그래프 잠금 안에서 합니다 (같은 노드를 두 번 계산하지 않음).
+    """
+
+    def __init__(self, image, memory_limit=None):
+        self._values = OrderedDict(source=image)  # 오래 쓰지 않은 순서
+        self._sizes = {}
+        self.timings = {}  # 노드 이름 -> 실행 시간 (ms)
+        self.memory_limit = (memory_limit if memory_limit is not None
+                             else OCR_VARIANT_MEMORY_MB * 1024 * 1024)
+        self.cached_bytes = 0
+        self.loaned_bytes = 0
+        self.peak_bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def used_bytes(self):
+        return self.cached_bytes + self.loaned_bytes
+
+    def get(self, name):
+        """노드 결과 반환 (없으면 입력 노드부터 계산해서 저장)"""
+        with self._lock:
+            if name in self._values:
+                self._values.move_to_end(name)
+                return self._values[name]
+
+            spec = NODES[name]
+            inputs = [self.get(dep) for dep in spec.inputs]
+
+            started = time.perf_counter()
+            value = spec.func(*inputs)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.timings[name] = round(
+                self.timings.get(name, 0) + elapsed_ms, 2)
+
+            self._store(name, value)
+            return value
+
+    def take(self, name):
+        """노드 결과를 꺼내 넘겨줌 (그래프에는 남기지 않음, 다 쓰면 give_back 호출)"""
+        with self._lock:
+            value = self.get(name)
+            self._drop(name)
+            self.loaned_bytes += _nbytes(value)
+            self._update_peak()
+            return value
+
+    def give_back(self, nbytes):
+        """take()로 넘겨준 결과를 다 썼음을 알림"""
+        with self._lock:
+            self.loaned_bytes = max(0, self.loaned_bytes - nbytes)
+
+    def _store(self, name, value):
+        self._values[name] = value
+        self._sizes[name] = _nbytes(value)
+        self.cached_bytes += self._sizes[name]
+        self._update_peak()
+
+        # 한도를 넘으면 오래 쓰지 않은 중간 결과부터 버림 (방금 만든 결과는 유지)
+        for old_name in list(self._values):
+            if self.used_bytes <= self.memory_limit:
+                break
+            if old_name != name and old_name not in PINNED_NODES:
+                self._drop(old_name)
+
+    def _drop(self, name):
+        if name in self._values:
+            del self._values[name]
+            self.cached_bytes -= self._sizes.pop(name, 0)
+
+    def _update_peak(self):
+        self.peak_bytes = max(self.peak_bytes, self.used_bytes)
+
+    def image(self, name):
+        """노드 결과를 PIL 이미지로 반환"""
+        return Image.fromarray(self.get(name))
+
+    def variants(self, names):
+        """변형 이름 목록을 [(이름, PIL 이미지), ...]로 반환 (실패한 변형은 건너뜀)"""
+        variants = []
+        for name in names:
+            try:
+                variants.append((name, self.image(name)))
+            except Exception as e:
+                trace.warning("⚠️ {} 전처리 실패: {}", name, e)
+        return variants
+
+    def total_ms(self):
+        return round(sum(self.timings.values()), 2)
+
+    def slowest(self, count=5):
+        """가장 오래 걸린 노드 [(이름, ms), ...]"""
+        ranked = sorted(self.timings.items(), key=lambda x: x[1], reverse=True)
+        return ranked[:count]
+
+    def memory_info(self):
+        """전처리 이미지 메모리 사용량 (MB)"""
+        return {
+            "limit_mb": round(self.memory_limit / 1024 / 1024, 1),
+            "peak_mb": round(self.peak_bytes / 1024 / 1024, 1),
+        }
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""전처리 그래프의 노드 정의
+
+그레이스케일 변환, 문서 정렬, 블러, CLAHE, 이진화 같은 중간 단계와 OCR에 넘길
+변형들을 이름 있는 노드로 등록합니다. 노드는 입력 노드 이름과 계산 함수만 가지며,
+언제 계산하고 결과를 얼마나 오래 둘지는 PreprocessGraph가 정합니다.
+"""
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from image_quality import analyze_image_quality
+from ocr_trace import trace
+from rectify import OCR_RECTIFY, rectify
+
+# 전처리 노드: 이름, 입력 노드 이름들, 계산 함수
+Node = namedtuple("Node", ["name", "inputs", "func"])
+
+NODES = {}
+
+
+def node(name, *inputs):
+    """함수를 전처리 노드로 등록하는 데코레이터"""
+    def register(func):
+        NODES[name] = Node(name, inputs, func)
+        return func
+    return register
+
+
+# 손글씨 특화 변형과 일반 전처리 변형 (노드 이름 = 변형 이름)
+HANDWRITING_VARIANTS = ["손글씨_기본", "고해상도_선명", "연결분리"]
+GENERAL_VARIANTS = ["기본전처리", "고대비", "부드러운처리", "침식팽창"]
+
+# 다중 해상도 모드: 원본 크기 변형을 먼저 시도하고, 품질이 낮을 때만 확대 변형 사용
+NATIVE_VARIANTS = ["손글씨_원본크기", "연결분리"] + GENERAL_VARIANTS
+UPSCALED_VARIANTS = ["손글씨_기본", "고해상도_선명"]
+
+
+# ---------------------------------------------------------------------------
+# 공통 단계
+# ---------------------------------------------------------------------------
+
+@node("gray_raw", "source")
+def _gray_raw(image):
+    img_array = np.asarray(image)
+    if img_array.ndim == 3:
+        return cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+    return img_array
+
+
+@node("rectify", "gray_raw")
+def _rectify(gray):
+    """종이 윤곽 원근 보정 + 기울기 보정 → (이미지, 보정 정보)"""
+    if not OCR_RECTIFY:
+        return gray, {"enabled": False}
+    rectified, info = rectify(gray)
+    trace.info("📐 문서 정렬: 종이 {}, 기울기 {}도, {} → {}",
+               '검출' if info['paper_found'] else '미검출', info['skew_angle'],
+               info['original_size'], info['rectified_size'])
+    return rectified, info
+
+
+# 이후 모든 변형은 정렬된 그레이스케일 이미지에서 시작
+@node("gray", "rectify")
+def _gray(rectified):
+    return rectified[0]
+
+
+@node("image_quality", "gray")
+def _image_quality(gray):
+    """썸네일로 잰 품질 지표 (전처리 경로 선택용)"""
+    return analyze_image_quality(gray)
+
+
+@node("gray_otsu", "gray")
+def _gray_otsu(gray):
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+@node("blur3", "gray")
+def _blur3(gray):
+    return cv2.GaussianBlur(gray, (3, 3), 0)
+
+
+# ---------------------------------------------------------------------------
+# 기본 전처리 (블러 → 샤프닝 → CLAHE → Otsu+적응형 → 모폴로지 → 텍스트 영역)
+# ---------------------------------------------------------------------------
+
+@node("basic_enhanced", "blur3")
+def _basic_enhanced(denoised):
+    kernel_sharpen = np.array([[-1, -1, -1],
+                               [-1, 9, -1],
+                               [-1, -1, -1]])
+    sharpened = cv2.filter2D(denoised, -1, kernel_sharpen)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    return clahe.apply(sharpened)
+
+
+@node("basic_binary", "basic_enhanced")
+def _basic_binary(enhanced):
+    _, otsu_binary = cv2.threshold(
+        enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    adaptive_binary = cv2.adaptiveThreshold(
+        enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    return cv2.bitwise_and(otsu_binary, adaptive_binary)
+
+
+@node("기본전처리", "basic_binary")
+def _basic_processed(combined_binary):
+    # 작은 노이즈 제거
+    kernel_noise = np.ones((2, 2), np.uint8)
+    processed = cv2.morphologyEx(combined_binary, cv2.MORPH_OPEN, kernel_noise)
+
+    # 가장 큰 텍스트 영역만 여백을 두고 잘라냄
+    contours, _ = cv2.findContours(
+        processed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if contours:
+        largest_contour = max(contours, key=cv2.contourArea)
+        x, y, w, h = cv2.boundingRect(largest_contour)
+
+        margin = 20
+        x = max(0, x - margin)
+        y = max(0, y - margin)
+        w = min(processed.shape[1] - x, w + 2 * margin)
+        h = min(processed.shape[0] - y, h + 2 * margin)
+
+        # 충분히 큰 영역이면 사용
+        if w > 50 and h > 30:
+            processed = processed[y:y + h, x:x + w]
+            trace.debug("✂️ 텍스트 영역 추출: {}x{}", w, h)
+
+    return processed
+
+
+# ---------------------------------------------------------------------------
+# 일반 변형
+# ---------------------------------------------------------------------------
+
+@node("고대비", "gray")
+def _high_contrast(gray):
+    equalized = cv2.equalizeHist(gray)
+    _, high_contrast = cv2.threshold(equalized, 127, 255, cv2.THRESH_BINARY)
+    return high_contrast
+
+
+@node("부드러운처리", "gray")
+def _soft(gray):
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
+    soft_sharp = cv2.filter2D(blurred, -1, kernel)
+    _, soft_binary = cv2.threshold(
+        soft_sharp, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return soft_binary
+
+
+@node("침식팽창", "gray_otsu")
+def _erode_dilate(binary):
+    kernel = np.ones((2, 2), np.uint8)
+    eroded = cv2.erode(binary, kernel, iterations=1)
+    return cv2.dilate(eroded, kernel, iterations=1)
+
+
+# ---------------------------------------------------------------------------
+# 손글씨 특화 전처리 (확대 → 언샤프 → CLAHE → 이진화 선택 → 모폴로지)
+# ---------------------------------------------------------------------------
+
+def _handwriting_enhanced(scale):
+    """scale배 확대 후 선명화와 대비 향상을 하는 노드 함수"""
+    def enhance(gray):
+        if scale != 1:
+            height, width = gray.shape
+            gray = cv2.resize(gray, (width * scale, height * scale),
+                              interpolation=cv2.INTER_CUBIC)
+        denoised = cv2.GaussianBlur(gray, (3, 3), 0)
+
+        # 언샤프 마스킹으로 선명화 강화
+        gaussian = cv2.GaussianBlur(denoised, (0, 0), 2.0)
+        unsharp_mask = cv2.addWeighted(denoised, 1.5, gaussian, -0.5, 0)
+
+        clahe = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(16, 16))
+        return clahe.apply(unsharp_mask)
+    return enhance
+
+
+def _handwriting_binary(enhanced):
+    """세 가지 이진화 중 흰색 비율이 80%에 가까운 결과 선택"""
+    adaptive_gaussian = cv2.adaptiveThreshold(
+        enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+        21, 10)
+    adaptive_mean = cv2.adaptiveThreshold(
+        enhanced, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 21, 10)
+    _, otsu_binary = cv2.threshold(
+        enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    methods = [
+        ("적응형_가우시안", adaptive_gaussian),
+        ("적응형_평균", adaptive_mean),
+        ("Otsu", otsu_binary),
+    ]
+
+    best_name, best_binary, best_score = None, adaptive_gaussian, 0
+    for name, binary_img in methods:
+        white_ratio = np.count_nonzero(binary_img == 255) / binary_img.size
+        if 0.7 <= white_ratio <= 0.9:
+            score = 100 - abs(white_ratio - 0.8) * 100
+        else:
+            score = max(0, 50 - abs(white_ratio - 0.8) * 100)
+        if score > best_score:
+            best_name, best_binary, best_score = name, binary_img, score
+
+    trace.debug("✅ 선택된 이진화: {}", best_name or '적응형_가우시안(기본값)')
+    return best_binary
+
+
+def _handwriting_processed(binary):
+    # 수직선 제거 (연결된 글자 분리용)
+    vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 3))
+    temp = cv2.morphologyEx(
+        binary, cv2.MORPH_OPEN, vertical_kernel, iterations=1)
+
+    # 작은 노이즈 제거 후 글자 두께 약간 증가
+    square_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+    cleaned = cv2.morphologyEx(
+        temp, cv2.MORPH_OPEN, square_kernel, iterations=1)
+    return cv2.morphologyEx(
+        cleaned, cv2.MORPH_CLOSE, square_kernel, iterations=1)
+
+
+# 2배 확대한 기본 손글씨 변형과, 확대 없이 처리하는 저비용 변형
+for _scale, _variant in ((2, "손글씨_기본"), (1, "손글씨_원본크기")):
+    node(f"hw_enhanced_x{_scale}", "gray")(_handwriting_enhanced(_scale))
+    node(f"hw_binary_x{_scale}", f"hw_enhanced_x{_scale}")(_handwriting_binary)
+    node(_variant, f"hw_binary_x{_scale}")(_handwriting_processed)
+
+
+# ---------------------------------------------------------------------------
+# 손글씨 보조 변형
+# ---------------------------------------------------------------------------
+
+@node("고해상도_선명", "gray")
+def _hires_sharp(gray):
+    large = cv2.resize(gray, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
+    kernel_sharp = np.array([[-1, -1, -1, -1, -1],
+                             [-1, 2, 2, 2, -1],
+                             [-1, 2, 8, 2, -1],
+                             [-1, 2, 2, 2, -1],
+                             [-1, -1, -1, -1, -1]]) / 8
+    sharp = cv2.filter2D(large, -1, kernel_sharp)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    enhanced = clahe.apply(sharp)
+    _, binary = cv2.threshold(
+        enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+@node("연결분리", "gray_otsu")
+def _separated(binary):
+    # 강한 침식으로 연결 분리 후 일부 복원
+    erode_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
+    eroded = cv2.erode(binary, erode_kernel, iterations=2)
+    dilate_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    return cv2.dilate(eroded, dilate_kernel, iterations=1)
+
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""문서 정렬 (종이 윤곽 검출 → 원근 보정 → 기울기 보정)
+
+사진 속 종이의 네 모서리를 찾아 정면에서 본 것처럼 펴고,
+가로 투영 프로파일로 글줄 기울기를 한 번만 추정해 바로 세웁니다.
+이후 모든 전처리 변형은 배경이 잘려 나가 더 작아진, 똑바른 이미지를 사용합니다.
+"""
+import os
+
+import cv2
+import numpy as np
+
+# 문서 정렬 사용 여부 (0이면 원본 그대로 사용)
+OCR_RECTIFY = os.getenv("OCR_RECTIFY", "1") != "0"
+
+# 윤곽 검출과 기울기 추정은 이 크기(긴 변, px)로 줄인 이미지에서 수행
+ANALYSIS_SIZE = 800
+
+# 종이로 인정할 최소 면적 비율 (사진 전체 대비)
+MIN_PAPER_AREA = 0.2
+
+# 사진 대부분이 종이면 원근 보정 생략
+FULL_FRAME_AREA = 0.95
+
+# 기울기 탐색 범위와 간격 (도)
+MAX_SKEW = 10.0
+SKEW_STEP = 0.5
+SKEW_REFINE_STEP = 0.1
+
+# 이보다 작은 기울기는 보정하지 않음 (도)
+MIN_SKEW = 0.3
+
+
+def _downscale(gray):
+    """긴 변이 ANALYSIS_SIZE가 되도록 축소 (축소 배율도 함께 반환)"""
+    scale = ANALYSIS_SIZE / max(gray.shape[:2])
+    if scale >= 1:
+        return gray, 1.0
+    small = cv2.resize(gray, None, fx=scale, fy=scale,
+                       interpolation=cv2.INTER_AREA)
+    return small, scale
+
+
+def order_corners(points):
+    """네 점을 좌상, 우상, 우하, 좌하 순서로 정렬"""
+    points = np.asarray(points, dtype=np.float32).reshape(4, 2)
+    sums = points.sum(axis=1)
+    diffs = np.diff(points, axis=1).ravel()
+    return np.array([
+        points[np.argmin(sums)],
+        points[np.argmin(diffs)],
+        points[np.argmax(sums)],
+        points[np.argmax(diffs)],
+    ], dtype=np.float32)
+
+
+def find_paper_quad(gray):
+    """종이의 네 모서리 좌표 (원본 좌표계, 좌상부터 시계 방향). 못 찾으면 None"""
+    small, scale = _downscale(gray)
+    blurred = cv2.GaussianBlur(small, (5, 5), 0)
+    edges = cv2.Canny(blurred, 50, 150)
+    edges = cv2.dilate(edges, np.ones((3, 3), np.uint8), iterations=1)
+
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL,
+                                   cv2.CHAIN_APPROX_SIMPLE)
+    image_area = small.shape[0] * small.shape[1]
+
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+        area = cv2.contourArea(contour)
+        if area < image_area * MIN_PAPER_AREA:
+            break
+        epsilon = 0.02 * cv2.arcLength(contour, True)
+        approx = cv2.approxPolyDP(contour, epsilon, True)
+        if len(approx) == 4 and cv2.isContourConvex(approx):
+            if area >= image_area * FULL_FRAME_AREA:
+                return None
+            return order_corners(approx) / scale
+    return None
+
+
+def warp_paper(gray, quad):
+    """네 모서리를 직사각형으로 펴서 종이 영역만 반환"""
+    tl, tr, br, bl = quad
+    width = int(max(np.linalg.norm(br - bl), np.linalg.norm(tr - tl)))
+    height = int(max(np.linalg.norm(tr - br), np.linalg.norm(tl - bl)))
+    target = np.array([[0, 0], [width - 1, 0],
+                       [width - 1, height - 1], [0, height - 1]],
+                      dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(quad.astype(np.float32), target)
+    return cv2.warpPerspective(gray, matrix, (width, height),
+                               flags=cv2.INTER_LINEAR,
+                               borderMode=cv2.BORDER_REPLICATE)
+
+
+def _rotate(gray, angle, interpolation=cv2.INTER_LINEAR):
+    height, width = gray.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (width, height), flags=interpolation,
+                          borderMode=cv2.BORDER_REPLICATE)
+
+
+def _profile_sharpness(ink, angle):
+    """angle도 회전했을 때 가로 투영 프로파일의 선명도 (글줄이 수평일수록 큼)"""
+    rotated = _rotate(ink, angle, cv2.INTER_NEAREST)
+    profile = rotated.sum(axis=1, dtype=np.float64)
+    return float(np.sum(np.diff(profile) ** 2))
+
+
+def estimate_skew(gray):
+    """글줄 기울기 추정 (이 각도만큼 회전하면 수평이 됨, 도 단위)"""
+    small, _ = _downscale(gray)
+    _, ink = cv2.threshold(small, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    if not ink.any():
+        return 0.0
+
+    # 넓은 범위를 거칠게 훑은 뒤 최고점 주변만 촘촘히 탐색
+    coarse = np.arange(-MAX_SKEW, MAX_SKEW + SKEW_STEP / 2, SKEW_STEP)
+    best = max(coarse, key=lambda a: _profile_sharpness(ink, a))
+    fine = np.arange(best - SKEW_STEP,
+                     best + SKEW_STEP + SKEW_REFINE_STEP / 2,
+                     SKEW_REFINE_STEP)
+    best = max(fine, key=lambda a: _profile_sharpness(ink, a))
+    return round(float(best), 2)
+
+
+def rectify(gray):
+    """종이 영역을 펴고 기울기를 보정한 그레이스케일 이미지와 보정 정보 반환"""
+    info = {
+        "original_size": [int(gray.shape[1]), int(gray.shape[0])],
+        "paper_found": False,
+        "skew_angle": 0.0,
+    }
+
+    quad = find_paper_quad(gray)
+    if quad is not None:
+        gray = warp_paper(gray, quad)
+        info["paper_found"] = True
+
+    angle = estimate_skew(gray)
+    if abs(angle) >= MIN_SKEW:
+        gray = _rotate(gray, angle, cv2.INTER_CUBIC)
+        info["skew_angle"] = angle
+
+    info["rectified_size"] = [int(gray.shape[1]), int(gray.shape[0])]
+    return gray, info
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""OCR 텍스트 필터 정규식 모음 (모듈을 읽을 때 한 번 컴파일)
+
+정리/점수 함수들이 후보마다, 줄마다 패턴 목록을 새로 만들고 패턴 문자열로 re.search를
+하나씩 부르던 것을, 목록의 대안들을 정규식 하나로 합쳐 두고 한 번만 검사합니다.
+합친 정규식이 일치할 때만(= 걸러낼 때만) 로그에 남길 패턴을 목록 순서대로 다시 찾습니다.
+"""
+import re
+
+# 한글이 영어로 잘못 인식된 결과의 패턴 (대소문자 무시, 로그에는 목록에서 먼저 일치한 패턴)
+SUSPICIOUS_ENGLISH_PATTERNS = [
+    r'^[a-zA-Z\s]{1,3}$',  # 너무 짧은 영문
+    r'^[oOsS][a-zA-Z\s]*$',  # 'o', 'S' 등으로 시작하는 의심스러운 패턴
+    r'[a-zA-Z]{1,2}\s+[a-zA-Z]{1,2}\s+[a-zA-Z]{1,2}',  # 짧은 영단어들이 연속으로
+    r'^[a-zA-Z]{1,2}\s+[a-zA-Z]+\s+[a-zA-Z]{1,2}',  # 패턴: "oS witty Ee"
+    r'[oOsSa-zA-Z]+\s+[wW][a-zA-Z]+\s+[eE][a-zA-Z]*',  # "oS witty Ee" 패턴
+    # 5개 이상 짧은 영단어
+    r'^[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+',
+    r'[oO][sS]\s+[a-zA-Z]+',  # "oS" 또는 "OS"로 시작하는 패턴
+    r'[eE][eE]\s+[oO][dD]',  # "Ee OD" 패턴
+    r'a[eE]\s+[a-zA-Z]+ee',  # "ae ataanee" 패턴
+]
+
+# 영어만 나온 결과의 점수 페널티 패턴 (evaluate_ocr_quality, 대소문자 무시)
+ENGLISH_PENALTY_PATTERNS = [
+    r'[oO][sS]\s+[a-zA-Z]+',  # "oS witty" 패턴
+    r'[eE][eE]\s+[oO][dD]',   # "Ee OD" 패턴
+    r'a[eE]\s+[a-zA-Z]+ee',   # "ae ataanee" 패턴
+    r'[a-z][A-Z][a-z].*[A-Z][a-z]',  # 불규칙한 대소문자
+]
+
+
+class PatternSet:
+    """여러 정규식을 대안 하나로 합쳐 텍스트를 한 번만 훑어 검사"""
+
+    def __init__(self, patterns, flags=0):
+        self.patterns = list(patterns)
+        self.combined = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.patterns), flags)
+        self.compiled = [re.compile(pattern, flags)
+                         for pattern in self.patterns]
+
+    def search(self, text):
+        """일치하는 패턴 문자열 (여럿이면 목록에서 먼저 나온 것), 없으면 None"""
+        if not self.combined.search(text):
+            return None
+        for pattern, compiled in zip(self.patterns, self.compiled):
+            if compiled.search(text):
+                return pattern
+
+
+SUSPICIOUS_ENGLISH = PatternSet(SUSPICIOUS_ENGLISH_PATTERNS, re.IGNORECASE)
+ENGLISH_PENALTY = PatternSet(ENGLISH_PENALTY_PATTERNS, re.IGNORECASE)
+
+# 대소문자가 불규칙하게 섞인 텍스트 / 줄 (대소문자 구분)
+MIXED_CASE_TEXT = re.compile(r'[a-z][A-Z][a-z].*[A-Z][a-z]')
+MIXED_CASE_LINE = re.compile(r'[a-z][A-Z][a-z]|[A-Z][a-z][A-Z]')
+
+# 같은 문자 3번 이상 반복 (일반적 패턴)
+REPEATED_MARKER = re.compile(r'같은문자{3,}')
+
+# 줄 정리: 특수문자와 공백이 이어진 구간을 공백 하나로
+# ([^\w\s가-힣]를 공백으로 바꾼 뒤 \s+를 공백 하나로 줄이던 두 번의 치환과 결과가 같음)
+NON_WORD_RUN = re.compile(r'\W+')
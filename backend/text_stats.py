@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""OCR 후보 텍스트의 글자 통계 (한 번 계산해서 모든 필터/점수 함수가 공유)
+
+후보마다 정리/점수 함수들이 한글·영문·숫자·기호 수를 세려고 문자열을 여러 번
+훑던 것을, str.translate 한 번으로 글자마다 종류 문자(한글 'H', 영문 'A' 등)로 바꾼
+'종류 문자열'을 만들고 그 위에서 C 수준의 count/split/정규식으로 모두 계산합니다.
+줄별 개수, 연속 한글/영문 길이, 공백 단위 단어 길이, 자모 연속 여부를 함께 담고,
+같은 텍스트는 text_stats()가 캐시하므로 후보 하나당 한 번만 계산됩니다.
+(OCR 후보는 수십~수백 자라 NumPy 배열을 만드는 비용이 더 커서 쓰지 않습니다.)
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# 글자 종류 문자
+HANGUL = 'H'        # 완성형 한글 ('가'~'힣')
+ASCII_LETTER = 'A'  # 영문자 (c.isalpha() and c.isascii())
+DIGIT = 'D'         # 숫자 (c.isdigit())
+CONSONANT = 'C'     # 한글 자음 ('ㄱ'~'ㅎ')
+VOWEL = 'V'         # 한글 모음 ('ㅏ'~'ㅣ')
+LETTER = 'L'        # 그 밖의 문자 (c.isalpha(), 한자 등)
+NUMERIC = 'N'       # 그 밖의 숫자 (c.isalnum()이지만 문자/숫자가 아님, '½' 등)
+UNDERSCORE = '_'    # 밑줄 (기호지만 정규식 \w)
+BLANK = ' '         # 공백 (' ')
+NEWLINE = '\n'      # 줄바꿈
+OTHER_SPACE = '\t'  # 그 밖의 공백 문자 (탭 등, 기호로 셈)
+SYMBOL = 'S'        # 그 밖의 기호
+
+ALPHA_CLASSES = HANGUL + ASCII_LETTER + CONSONANT + VOWEL + LETTER
+
+# 한 줄의 통계: 텍스트, 한글 수, 영문 수, 공백(' ')을 뺀 글자 수, 기호 수,
+# \w 글자 수, 가장 긴 연속 한글 길이, 가장 긴 연속 영문 길이
+LineStats = namedtuple("LineStats", [
+    "text", "hangul", "ascii_letters", "total", "special", "word_chars",
+    "longest_hangul_run", "longest_ascii_run",
+])
+
+HANGUL_RUN = re.compile(HANGUL + '+')
+ASCII_RUN = re.compile(ASCII_LETTER + '+')
+
+
+def char_class(c):
+    """글자 하나의 종류 문자"""
+    if '가' <= c <= '힣':
+        return HANGUL
+    if 'ㄱ' <= c <= 'ㅎ':
+        return CONSONANT
+    if 'ㅏ' <= c <= 'ㅣ':
+        return VOWEL
+    if c.isalpha():
+        return ASCII_LETTER if c.isascii() else LETTER
+    if c.isdigit():
+        return DIGIT
+    if c.isalnum():
+        return NUMERIC
+    if c in (' ', '\n', '_'):
+        return c
+    return OTHER_SPACE if c.isspace() else SYMBOL
+
+
+class _ClassTable(dict):
+    """str.translate용 표 (처음 보는 글자만 분류해서 저장)"""
+
+    def __missing__(self, code_point):
+        value = self[code_point] = char_class(chr(code_point))
+        return value
+
+
+CLASS_TABLE = _ClassTable({cp: char_class(chr(cp)) for cp in range(128)})
+
+
+def _longest(pattern, classes):
+    return max(map(len, pattern.findall(classes)), default=0)
+
+
+class TextStats:
+    """텍스트 하나의 글자 통계
+
+    개수 기준은 기존 필터/점수 함수와 같습니다.
+    - total: 공백(' ')과 줄바꿈을 뺀 글자 수
+    - special: 문자/숫자/한글/공백(' ')이 아닌 글자 수 (줄바꿈 포함)
+    - hangul_runs: 연속 한글 구간 길이들 ([가-힣]+)
+    - hangul_word_lengths: 공백으로 나눈 단어마다 한글 글자 수 (한글이 있는 단어만)
+    - lines: 줄마다 LineStats (줄바꿈으로 나눈 순서 그대로, 앞뒤 공백 포함)
+    """
+
+    def __init__(self, text):
+        self.text = text
+        classes = text.translate(CLASS_TABLE)
+        self.classes = classes
+        self.length = len(text)
+
+        self.hangul = classes.count(HANGUL)
+        self.ascii_letters = classes.count(ASCII_LETTER)
+        self.digits = classes.count(DIGIT)
+        self.spaces = classes.count(BLANK)
+        newlines = classes.count(NEWLINE)
+        self.special = (classes.count(SYMBOL) + classes.count(UNDERSCORE)
+                        + classes.count(OTHER_SPACE) + newlines)
+        self.total = self.length - self.spaces - newlines
+
+        # 연속 한글 구간, 자모만 연속 ([ㄱ-ㅎ]{2,}, [ㅏ-ㅣ]{2,})
+        self.hangul_runs = [len(run) for run in HANGUL_RUN.findall(classes)]
+        self.has_consonant_run = CONSONANT * 2 in classes
+        self.has_vowel_run = VOWEL * 2 in classes
+
+        # 공백으로 나눈 단어 (str.split()과 같은 기준)
+        words = classes.split()
+        self.word_count = len(words)
+        self.short_alpha_words = sum(
+            1 for word in words
+            if len(word) <= 3 and not word.strip(ALPHA_CLASSES))
+        self.hangul_word_lengths = [
+            n for n in (word.count(HANGUL) for word in words) if n]
+
+        # 줄별 통계
+        self.lines = [
+            LineStats(
+                line_text,
+                line.count(HANGUL),
+                line.count(ASCII_LETTER),
+                len(line) - line.count(BLANK),
+                (line.count(SYMBOL) + line.count(UNDERSCORE)
+                 + line.count(OTHER_SPACE)),
+                (len(line) - line.count(BLANK) - line.count(OTHER_SPACE)
+                 - line.count(SYMBOL)),
+                _longest(HANGUL_RUN, line),
+                _longest(ASCII_RUN, line),
+            )
+            for line_text, line in zip(text.split('\n'), classes.split('\n'))
+        ]
+
+    @property
+    def hangul_words(self):
+        """두 글자 이상 연속 한글 구간 수 (re.findall(r'[가-힣]{2,}') 개수)"""
+        return sum(1 for n in self.hangul_runs if n >= 2)
+
+    @property
+    def mean_hangul_word_length(self):
+        """두 글자 이상 연속 한글 구간의 평균 길이"""
+        runs = [n for n in self.hangul_runs if n >= 2]
+        return sum(runs) / len(runs) if runs else 0.0
+
+    @property
+    def word_length_histogram(self):
+        """단어별 한글 글자 수 분포 ({글자 수: 단어 수})"""
+        histogram = {}
+        for n in self.hangul_word_lengths:
+            histogram[n] = histogram.get(n, 0) + 1
+        return histogram
+
+
+@lru_cache(maxsize=256)
+def text_stats(text):
+    """텍스트의 TextStats (같은 텍스트는 다시 계산하지 않음)"""
+    return TextStats(text)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""지연 생성 전처리 변형 스트림
+
+OCR 작업 순서대로 필요한 변형을 하나씩 만들어 작업으로 내보내고,
+그 변형의 OCR 작업이 모두 끝나면 바로 메모리에서 해제합니다.
+전처리 그래프의 메모리 사용량이 한도를 넘으면 앞선 변형이 해제될 때까지
+다음 변형 생성을 미룹니다 (적어도 한 변형은 항상 진행).
+"""
+import asyncio
+from collections import OrderedDict
+
+from gray_image import GrayImage
+from ocr_trace import in_context, trace
+
+
+class VariantStream:
+    """변형별 OCR 작업을 지연 생성하는 비동기 작업 공급자
+
+    planned_tasks: 이미지 없이(image=None) 실행 순서대로 정렬된 OCRTask 목록
+    """
+
+    def __init__(self, graph, planned_tasks):
+        self.graph = graph
+        self._groups = OrderedDict()  # 변형 이름 -> 작업 목록 (처음 등장한 순서)
+        for task in planned_tasks:
+            self._groups.setdefault(task.variant_name, []).append(task)
+        self._live = {}  # 변형 이름 -> [남은 작업 수, 바이트]
+        self._released = asyncio.Event()
+        self.produced = []
+        self.failed = []
+
+    async def tasks(self):
+        """이미지가 채워진 OCR 작업을 하나씩 내보내는 비동기 제너레이터"""
+        loop = asyncio.get_running_loop()
+        for name, group in self._groups.items():
+            await self._wait_for_room()
+            try:
+                array = await loop.run_in_executor(
+                    None, in_context(self.graph.take), name)
+            except Exception as e:
+                trace.warning("⚠️ {} 전처리 실패: {}", name, e)
+                self.failed.append(name)
+                continue
+
+            self._live[name] = [len(group), array.nbytes]
+            self.produced.append(name)
+            image = GrayImage(array)
+            ready = [task._replace(image=image) for task in group]
+            del image, array
+
+            # 내보낸 작업 외에는 변형 이미지를 붙잡고 있지 않도록 목록에서 꺼내며 전달
+            while ready:
+                yield ready.pop(0)
+
+    def task_done(self, task):
+        """OCR 작업 하나가 끝났음을 알림 (변형의 마지막 작업이면 해제)"""
+        live = self._live.get(task.variant_name)
+        if live is None:
+            return
+        live[0] -= 1
+        if live[0] <= 0:
+            del self._live[task.variant_name]
+            self.graph.give_back(live[1])
+            self._released.set()
+
+    def close(self):
+        """중간에 멈춘 경우 남은 변형을 모두 해제"""
+        for _, nbytes in self._live.values():
+            self.graph.give_back(nbytes)
+        self._live.clear()
+
+    async def _wait_for_room(self):
+        """메모리 한도를 넘은 동안 앞선 변형이 해제되기를 기다림"""
+        while self._live and self.graph.used_bytes >= self.graph.memory_limit:
+            self._released.clear()
+            await self._released.wait()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""OCR 정확도 벤치마크의 채점과 보고서
+
+문자 오류율(CER), 파레토 최적 표시, 마크다운 보고서 형식을 담당합니다.
+(측정은 bench_ocr_accuracy.py, 코퍼스 생성은 korean_corpus.py)
+"""
+import os
+
+import numpy as np
+
+
+def normalize_text(text):
+    """줄바꿈과 연속 공백을 공백 하나로"""
+    return " ".join((text or "").split())
+
+
+def edit_distance(a, b):
+    """문자 단위 레벤슈타인 거리"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def character_error_rate(reference, hypothesis):
+    """문자 오류율 = 편집 거리 / 정답 길이 (공백 정규화 후)"""
+    reference = normalize_text(reference)
+    hypothesis = normalize_text(hypothesis)
+    return edit_distance(reference, hypothesis) / max(len(reference), 1)
+
+
+def pareto_front(rows):
+    """CER과 시간 모두에서 더 나은(하나는 같을 수 있는) 행이 없는 행 이름 집합"""
+    front = set()
+    for row in rows:
+        dominated = any(
+            other["cer"] <= row["cer"] and other["ms"] <= row["ms"]
+            and (other["cer"] < row["cer"] or other["ms"] < row["ms"])
+            for other in rows
+        )
+        if not dominated:
+            front.add(row["name"])
+    return front
+
+
+def summarize(cers, times, rejected, pipelines, sample_count):
+    """보고서용 행 목록 (이름, 평균 CER, 평균 시간, 제거율)"""
+    rows = [
+        {
+            "name": name,
+            "cer": round(float(np.mean(cers[name])), 3),
+            "ms": round(float(np.mean(times[name]))),
+            "rejected": round(rejected[name] / sample_count, 2),
+        }
+        for name in cers
+    ]
+    rows += [
+        {
+            "name": name,
+            "cer": round(float(np.mean([m[0] for m in pipeline])), 3),
+            "ms": round(float(np.mean([m[1] for m in pipeline]))),
+            "rejected": None,
+            "executed": round(float(np.mean([m[2] for m in pipeline])), 1),
+        }
+        for name, pipeline in pipelines.items()
+    ]
+    return sorted(rows, key=lambda row: (row["cer"], row["ms"], row["name"]))
+
+
+def write_report(path, rows, preprocess_ms, samples, backend_name):
+    """파레토 보고서(마크다운) 저장"""
+    front = pareto_front(rows)
+    fonts = sorted({sample["font"] for sample, _ in samples})
+    report = [
+        "# OCR 정확도 대비 지연 시간",
+        "",
+        f"- 코퍼스: 샘플 {len(samples)}개, 글꼴 {', '.join(fonts)}",
+        f"- OCR 백엔드: {backend_name}",
+        "- CER: 후처리(enhance_korean_ocr_result)까지 거친 텍스트 기준, 품질 필터에서 제거되면 1.0",
+        "- 시간: 조합은 OCR 엔진 호출 시간(ms), 전체 파이프라인은 전처리 포함 걸린 시간(ms)",
+        "",
+        "| 파레토 | 방법 | CER | 시간(ms) | 제거율 |",
+        "|:---:|---|---:|---:|---:|",
+    ]
+    for row in rows:
+        mark = "★" if row["name"] in front else ""
+        rejected = "-" if row["rejected"] is None else f"{row['rejected']:.2f}"
+        name = row["name"]
+        if "executed" in row:
+            name += f" (평균 {row['executed']}개 실행)"
+        report.append(f"| {mark} | {name} | {row['cer']:.3f} "
+                      f"| {row['ms']} | {rejected} |")
+
+    report += ["", "## 전처리 단계별 평균 시간", "", "| 단계 | 시간(ms) |", "|---|---:|"]
+    for node_name in sorted(preprocess_ms):
+        mean_ms = np.mean(preprocess_ms[node_name])
+        report.append(f"| {node_name} | {mean_ms:.0f} |")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(report) + "\n")
+    return front
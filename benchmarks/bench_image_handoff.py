@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""OCR 엔진 이미지 전달 비용 마이크로 벤치마크
+
+업로드 한 건에서 OCR 엔진에 넘기는 모든 변형 이미지에 대해
+기존 방식(PIL → PNG 임시 파일 → Tesseract가 PNG 해제)과
+GrayImage 방식(무압축 PGM 또는 tesserocr 원시 버퍼)의 인코딩/디코딩 시간을 비교합니다.
+
+실행: python benchmarks/bench_image_handoff.py [가로] [세로]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from gray_image import GrayImage
+from preprocess_graph import PreprocessGraph
+from preprocess_nodes import NATIVE_VARIANTS, UPSCALED_VARIANTS
+
+# 변형 하나당 OCR 호출 수 (PSM 6/4 한국어 + PSM 6 한영혼합)
+CALLS_PER_VARIANT = 3
+REPEATS = 3
+
+
+def make_upload(width, height):
+    """글줄 모양 막대가 있는 흰 종이 사진"""
+    rng = np.random.RandomState(0)
+    page = np.full((height, width, 3), 235, np.uint8)
+    for y in range(80, height - 80, 70):
+        x = 60
+        while x < width - 120:
+            w = rng.randint(20, 60)
+            cv2.rectangle(page, (x, y), (x + w, y + 30), (30, 30, 30), -1)
+            x += w + rng.randint(10, 25)
+    noise = rng.randint(0, 20, page.shape).astype(np.uint8)
+    return Image.fromarray(cv2.subtract(page, noise))
+
+
+def png_round_trip(array):
+    """기존 방식: PIL 이미지로 바꿔 PNG 저장 → 엔진이 PNG 해제"""
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format="PNG")
+    cv2.imdecode(np.frombuffer(buffer.getvalue(), np.uint8),
+                 cv2.IMREAD_UNCHANGED)
+
+
+def pgm_round_trip(array):
+    """pytesseract + GrayImage: 무압축 PGM 저장 → 엔진이 PGM 읽기"""
+    image = GrayImage(array).to_pil()
+    buffer = io.BytesIO()
+    image.save(buffer, format="PPM")
+    cv2.imdecode(np.frombuffer(buffer.getvalue(), np.uint8),
+                 cv2.IMREAD_UNCHANGED)
+
+
+def raw_hand_off(array):
+    """tesserocr + GrayImage: 원시 버퍼 전달 (SetImageBytes)"""
+    GrayImage(array).pixels.tobytes()
+
+
+def measure(func, arrays):
+    """모든 변형에 대해 func를 실행한 시간 (ms, 반복 중 최솟값)"""
+    best = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for array in arrays:
+            func(array)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+
+    graph = PreprocessGraph(make_upload(width, height))
+    arrays = [graph.get(name) for name in NATIVE_VARIANTS + UPSCALED_VARIANTS]
+    megapixels = sum(a.size for a in arrays) / 1e6
+    print(f"📸 업로드 {width}x{height}, 변형 {len(arrays)}개 ({megapixels:.1f}MP), "
+          f"변형당 OCR 호출 {CALLS_PER_VARIANT}회")
+
+    results = [
+        ("PNG 인코딩+디코딩 (기존)", measure(png_round_trip, arrays)),
+        ("PGM 무압축 (pytesseract)", measure(pgm_round_trip, arrays)),
+        ("원시 버퍼 (tesserocr)", measure(raw_hand_off, arrays)),
+    ]
+
+    baseline = results[0][1] * CALLS_PER_VARIANT
+    for label, ms in results:
+        per_upload = ms * CALLS_PER_VARIANT
+        print(f"  {label:<28} 변형 전체 {ms:8.1f}ms, 업로드당 {per_upload:8.1f}ms, "
+              f"절약 {baseline - per_upload:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
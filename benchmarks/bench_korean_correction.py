@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""OCR 오인식 교정 마이크로 벤치마크
+
+교정 규칙 수를 늘려 가며 기존 방식(규칙마다 str.replace로 다시 훑고 '.*?' 정규식 적용)과
+교정 엔진(Aho-Corasick 한 번 훑기 + 어절 사전 조회)의 글 한 편당 교정 시간을 비교합니다.
+늘린 규칙은 실제 글에 나오지 않는 글자열이라 두 방식의 결과는 규칙 수와 관계없이 같아야 합니다.
+
+실행: python benchmarks/bench_korean_correction.py [최대 규칙 수]
+"""
+import json
+import os
+import random
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..', 'backend'))
+
+from korean_corpus import SENTENCES
+from korean_correction import OCR_CORRECTION_RULES, CorrectionEngine
+
+REPEATS = 5
+
+# 기존 교정 함수의 패턴 교정 (어절 사이 글자까지 지우던 '.*?' 정규식)
+LEGACY_WORD_PATTERNS = [
+    (r'법.*?는', '법은'),
+    (r'나.*?라.*?에.*?서', '나라에서'),
+    (r'정.*?해.*?준.*?걸', '정해준 걸'),
+    (r'꼭.*?지.*?켜.*?야', '꼭 지켜야'),
+    (r'하.*?는.*?것', '하는 것'),
+    (r'강.*?제.*?적.*?으.*?로', '강제적으로'),
+    (r'체.*?벌.*?을', '체벌을'),
+    (r'받.*?고', '받고'),
+    (r'도.*?덕.*?은', '도덕은'),
+    (r'양.*?심.*?의', '양심의'),
+    (r'실.*?망.*?과', '실망과'),
+    (r'비.*?난.*?을', '비난을'),
+    (r'받.*?는.*?다', '받는다'),
+]
+
+
+def make_rules(count, seed=0):
+    """글에 나오지 않는 글자(뷁, 햏 등 드문 음절)로 만든 substitutions 규칙"""
+    rng = random.Random(seed)
+    rare = list("뷁햏쉢퓛톍퀋뙗땷쨶꿻")
+    rules = {}
+    while len(rules) < count:
+        key = ''.join(rng.choice(rare) for _ in range(rng.randint(2, 4)))
+        rules[key] = rng.choice(SENTENCES)[:2]
+    return rules
+
+
+def legacy_correct(text, substitutions):
+    """기존 방식: 규칙마다 차례로 바꾸고, 패턴 정규식을 차례로 적용"""
+    for wrong, right in substitutions.items():
+        if wrong in text:
+            text = text.replace(wrong, right)
+    for pattern, replacement in LEGACY_WORD_PATTERNS:
+        if re.search(pattern, text):
+            text = re.sub(pattern, replacement, text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def measure(function, texts):
+    """글 전체를 교정하는 데 걸린 시간 (ms, REPEATS번 중 최소)"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for text in texts:
+            function(text)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def main():
+    max_rules = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(1)
+    texts = ["\n".join(rng.sample(SENTENCES, 10)) for _ in range(20)]
+    chars = sum(len(text) for text in texts)
+    print(f"📝 글 {len(texts)}편 (평균 {chars / len(texts):.0f}자)")
+
+    with open(OCR_CORRECTION_RULES, encoding='utf-8') as f:
+        rules = json.load(f)
+    base = CorrectionEngine(rules)
+    for count in sorted({0, 100, 1000, max_rules}):
+        extra = make_rules(count)
+        engine = CorrectionEngine(
+            {**rules, "substitutions": {**extra, **rules["substitutions"]}})
+        if ([engine.correct(text) for text in texts]
+                != [base.correct(text) for text in texts]):
+            print(f"❌ 규칙 {count}개를 더하니 교정 결과가 달라짐")
+            sys.exit(1)
+
+        legacy_ms = measure(lambda text: legacy_correct(text, extra), texts)
+        engine_ms = measure(engine.correct, texts)
+        legacy_us = legacy_ms * 1000 / len(texts)
+        engine_us = engine_ms * 1000 / len(texts)
+        print(f"  규칙 +{count:>5}개: 기존 방식 {legacy_us:8.1f}µs, "
+              f"교정 엔진 {engine_us:7.1f}µs (글 한 편당)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""OCR 정확도 대비 지연 시간 벤치마크
+
+합성 한국어 손글씨 코퍼스(korean_corpus.py)로 두 가지를 측정합니다.
+
+1. try_multiple_ocr_methods가 실행하는 변형 × PSM × 언어 조합(줄 분할 OCR 포함) 각각의
+   문자 오류율(CER)과 OCR 시간 (한 프로세스에서 순차 실행)
+2. 전체 파이프라인(다중 해상도 단계, 조기 종료 포함)의 최종 결과 CER과 걸린 시간
+   (최고 점수 결과만 고를 때, 상위 결과를 융합할 때, 결과 몇 개에서 멈추고 융합할 때)
+
+결과는 CER과 시간 모두에서 더 나은 조합이 없는 조합(파레토 최적)을 표시한
+마크다운 보고서로 저장합니다(accuracy_report.py). 값을 반올림해서 정렬하므로
+커밋마다 보고서를 다시 만들어 git diff로 비교할 수 있습니다.
+
+실행: python benchmarks/bench_ocr_accuracy.py [--corpus 코퍼스_폴더] [--out 보고서.md]
+(코퍼스가 없으면 먼저 만듭니다. 파이프라인 측정은 OCR_WORKERS 설정을 따릅니다.)
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import time
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..', 'backend'))
+
+from accuracy_report import character_error_rate, summarize, write_report
+from korean_corpus import (DEFAULT_CORPUS_DIR, build_corpus, find_fonts,
+                           load_corpus)
+
+DEFAULT_REPORT = os.path.join(BENCH_DIR, 'results', 'ocr_pareto.md')
+
+# 전체 파이프라인 측정 설정: (이름, 융합할 상위 결과 수, 융합용으로 멈출 결과 수)
+PIPELINE_CONFIGS = [
+    ("전체 파이프라인 (최고 점수 선택)", 0, 0),
+    ("전체 파이프라인 (상위 4개 융합)", 4, 0),
+    ("전체 파이프라인 (결과 3개에서 멈추고 융합)", 3, 3),
+]
+
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """파이프라인의 진행 로그 숨기기"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def planned_runs(app, graph):
+    """파이프라인이 실행할 수 있는 모든 조합의 (방법 이름, OCR 작업 목록, 줄 영역 목록)
+
+    줄 영역 목록은 줄 분할 조합에만 있고, 페이지 조합은 None입니다.
+    """
+    from gray_image import GrayImage
+    from line_segmentation import crop_lines, find_text_lines
+    from ocr_executor import OCRTask
+
+    # 페이지 OCR 조합 (변형 × PSM × 언어)
+    variants = []
+    for stage in app.OCR_STAGES:
+        variants += [name for name in stage.variants if name not in variants]
+    planned = app.build_ocr_tasks([(name, None) for name in variants])
+    runs = [(app.ocr_method_name(task),
+             [task._replace(image=GrayImage(graph.get(task.variant_name)))],
+             None)
+            for task in planned]
+
+    # 줄 분할 조합 (줄마다 PSM 7, 시간은 모든 줄의 합)
+    for stage in app.OCR_STAGES:
+        binary = graph.get(stage.line_source)
+        lines = find_text_lines(binary)
+        line_task = OCRTask(stage.line_variant, None, app.LINE_PSM, 'kor')
+        runs.append((app.ocr_method_name(line_task),
+                     [line_task._replace(image=GrayImage(crop))
+                      for crop in crop_lines(binary, lines)],
+                     (lines, (binary.shape[1], binary.shape[0]))))
+    return runs
+
+
+def measure_combinations(app, samples, verbose=False):
+    """조합별 (이름 -> CER 목록, 시간 목록, 품질 필터 제거 수)와 전처리 단계별 시간"""
+    from ocr_executor import run_ocr_task
+    from ocr_words import merge_line_pages
+    from preprocess_graph import PreprocessGraph
+
+    cers, times = defaultdict(list), defaultdict(list)
+    rejected = defaultdict(int)
+    preprocess_ms = defaultdict(list)
+
+    for index, (sample, image) in enumerate(samples, 1):
+        print(f"  [{index}/{len(samples)}] {sample['file']}")
+        graph = PreprocessGraph(image)
+        with quiet(not verbose):
+            runs = planned_runs(app, graph)
+
+        for name, tasks, line_boxes in runs:
+            outputs = [run_ocr_task(task) for task in tasks]
+            if line_boxes is None:
+                page = outputs[0].page
+            else:
+                page = merge_line_pages(
+                    [output.page for output in outputs], *line_boxes)
+            with quiet(not verbose):
+                scored = app.score_ocr_output(tasks[0], page) if tasks else None
+            if scored is None:
+                rejected[name] += 1
+            text = scored[1] if scored else ""
+            cers[name].append(character_error_rate(sample["text"], text))
+            times[name].append(sum(output.seconds for output in outputs) * 1000)
+
+        for node_name, ms in graph.timings.items():
+            preprocess_ms[node_name].append(ms)
+
+    return cers, times, rejected, preprocess_ms
+
+
+async def measure_pipeline(app, samples, verbose=False, fusion_top=0,
+                           fusion_stop=0):
+    """전체 파이프라인의 샘플별 (CER, 시간(ms), 실행된 후보 수)"""
+    from ocr_scheduler import OCRScheduler
+
+    app.OCR_FUSION_TOP = fusion_top
+    app.ocr_scheduler = OCRScheduler(fusion_stop=fusion_stop)
+    measurements = []
+    for sample, image in samples:
+        run_info = {}
+        started = time.perf_counter()
+        with quiet(not verbose):
+            results = await app.try_multiple_ocr_methods(image, run_info)
+        elapsed = (time.perf_counter() - started) * 1000
+        best_text = results[0][1] if results else ""
+        cer = character_error_rate(sample["text"], best_text)
+        measurements.append((cer, elapsed, run_info.get("executed", 0)))
+    return measurements
+
+
+def load_app(tesseract_cmd=None):
+    """OCR 파이프라인 모듈을 불러오고 벤치마크용으로 설정
+
+    방법별 선택률이 서비스 데이터베이스에 쌓이지 않고, 매번 같은 순서로
+    후보를 실행하도록 데이터베이스 없는 스케줄러를 사용합니다.
+    """
+    with quiet():
+        import main_backup as app
+    from ocr_executor import configure_ocr_executor
+    from ocr_scheduler import OCRScheduler
+    import pytesseract
+
+    tesseract_cmd = tesseract_cmd or pytesseract.pytesseract.tesseract_cmd
+    if not os.path.exists(tesseract_cmd):
+        tesseract_cmd = shutil.which("tesseract") or tesseract_cmd
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    configure_ocr_executor(tesseract_cmd)
+    app.ocr_scheduler = OCRScheduler()
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 정확도 대비 지연 시간 벤치마크")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR,
+                        help="코퍼스 폴더 (없으면 생성)")
+    parser.add_argument("--fonts", action="append", help="코퍼스 생성에 쓸 글꼴 폴더")
+    parser.add_argument("--out", default=DEFAULT_REPORT, help="보고서 경로")
+    parser.add_argument("--limit", type=int, default=0,
+                        help="사용할 샘플 수 (0이면 전부)")
+    parser.add_argument("--tesseract", help="Tesseract 실행 파일 경로")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 로그 표시")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.corpus, 'manifest.json')):
+        fonts = find_fonts(args.fonts)
+        if not fonts:
+            print("❌ 코퍼스를 만들 한글 글꼴이 없습니다. --fonts로 손글씨 글꼴 폴더를 지정하세요.")
+            sys.exit(1)
+        build_corpus(args.corpus, fonts)
+        print(f"✅ 코퍼스 생성: {args.corpus}")
+
+    samples = load_corpus(args.corpus)
+    if args.limit:
+        samples = samples[:args.limit]
+
+    app = load_app(args.tesseract)
+    from ocr_executor import _get_backend, shutdown_ocr_executor
+
+    print(f"📚 샘플 {len(samples)}개로 조합별 측정")
+    cers, times, rejected, preprocess_ms = measure_combinations(
+        app, samples, args.verbose)
+
+    pipelines = {}
+    try:
+        for name, fusion_top, fusion_stop in PIPELINE_CONFIGS:
+            print(f"🔍 {name} 측정")
+            pipelines[name] = asyncio.run(
+                measure_pipeline(app, samples, args.verbose, fusion_top,
+                                 fusion_stop))
+    finally:
+        shutdown_ocr_executor()
+
+    rows = summarize(cers, times, rejected, pipelines, len(samples))
+    front = write_report(args.out, rows, preprocess_ms, samples,
+                         _get_backend().name)
+
+    print(f"\n{'방법':<40} {'CER':>6} {'시간(ms)':>9}")
+    for row in rows:
+        mark = "★" if row["name"] in front else " "
+        print(f"{mark} {row['name']:<38} {row['cer']:6.3f} {row['ms']:9}")
+    print(f"\n📝 보고서 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""OCR 텍스트 필터 정규식 마이크로 벤치마크
+
+잡음 섞인 한국어 후보와 한글이 영어로 잘못 인식된 후보(짧은 영문 조각)를 섞은 코퍼스로,
+정리/점수 함수들(clean_ocr_text, clean_korean_ocr_text, evaluate_ocr_quality)이
+후보 하나에 하는 정규식 검사의 시간을 비교하고, 두 방식의 판정이 모든 후보에서 같은지 확인합니다.
+- 기존: 함수마다 패턴 목록을 새로 만들고 패턴 문자열로 re.search/re.sub를 하나씩 호출
+- 현재: text_patterns의 미리 컴파일한 정규식 (목록의 대안을 하나로 합쳐 한 번에 검사)
+
+실행: python benchmarks/bench_text_patterns.py [후보 수]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..', 'backend'))
+
+from bench_text_stats import make_candidates
+from text_patterns import (
+    ENGLISH_PENALTY, MIXED_CASE_LINE, MIXED_CASE_TEXT, NON_WORD_RUN,
+    REPEATED_MARKER, SUSPICIOUS_ENGLISH,
+)
+from text_stats import text_stats
+
+REPEATS = 5
+
+# 한글 획이 영문으로 읽힌 것 같은 글자들 ("oS witty Ee", "ae ataanee" 등)
+ENGLISH_NOISE = "oOsSeEaAwWtTyidlIrnDu"
+
+
+def make_english_candidates(count, seed=0):
+    """짧은 영문 조각으로 된 1~3줄 후보"""
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(count):
+        lines = []
+        for _ in range(rng.randint(1, 3)):
+            words = [''.join(rng.choice(ENGLISH_NOISE)
+                             for _ in range(rng.randint(1, 7)))
+                     for _ in range(rng.randint(1, 6))]
+            ending = rng.choice(['', '.', '!', ' 12', '~'])
+            lines.append(' '.join(words) + ending)
+        candidates.append('\n'.join(lines))
+    return candidates
+
+
+def legacy_filters(text):
+    """기존 방식: 세 함수가 후보 하나에 하던 정규식 검사를 그대로 반복"""
+    stats = text_stats(text)
+    results = []
+
+    # clean_ocr_text: 패턴 목록을 만들고 하나씩 검사
+    suspicious_english_patterns = [
+        r'^[a-zA-Z\s]{1,3}$',
+        r'^[oOsS][a-zA-Z\s]*$',
+        r'[a-zA-Z]{1,2}\s+[a-zA-Z]{1,2}\s+[a-zA-Z]{1,2}',
+        r'^[a-zA-Z]{1,2}\s+[a-zA-Z]+\s+[a-zA-Z]{1,2}',
+        r'[oOsSa-zA-Z]+\s+[wW][a-zA-Z]+\s+[eE][a-zA-Z]*',
+        r'^[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+\s+[a-zA-Z]+',
+        r'[oO][sS]\s+[a-zA-Z]+',
+        r'[eE][eE]\s+[oO][dD]',
+        r'a[eE]\s+[a-zA-Z]+ee',
+    ]
+    if stats.hangul == 0:
+        results.append(next((p for p in suspicious_english_patterns
+                             if re.search(p, text, re.IGNORECASE)), None))
+        results.append(bool(re.search(r'[a-z][A-Z][a-z].*[A-Z][a-z]', text)))
+    for line_stats in stats.lines:
+        line = line_stats.text.strip()
+        if not line:
+            continue
+        if line_stats.hangul == 0 and line_stats.ascii_letters > 0:
+            results.append(bool(
+                re.search(r'[a-z][A-Z][a-z]|[A-Z][a-z][A-Z]', line)))
+            results.append(any(re.search(p, line, re.IGNORECASE)
+                               for p in suspicious_english_patterns))
+        cleaned_line = re.sub(r'[^\w\s가-힣]', ' ', line)
+        cleaned_line = re.sub(r'\s+', ' ', cleaned_line)
+        results.append(cleaned_line.strip())
+
+    # clean_korean_ocr_text: 같은 문자 반복, 줄마다 특수문자 정리
+    results.append(bool(re.search(r'같은문자{3,}', text)))
+    for line_stats in stats.lines:
+        line = line_stats.text.strip()
+        if line:
+            cleaned_line = re.sub(r'[^\w\s가-힣]', ' ', line)
+            cleaned_line = re.sub(r'\s+', ' ', cleaned_line)
+            results.append(cleaned_line.strip())
+
+    # evaluate_ocr_quality: 영어만 있으면 페널티 패턴 목록
+    if stats.hangul == 0:
+        suspicious_patterns = [
+            r'[oO][sS]\s+[a-zA-Z]+',
+            r'[eE][eE]\s+[oO][dD]',
+            r'a[eE]\s+[a-zA-Z]+ee',
+            r'[a-z][A-Z][a-z].*[A-Z][a-z]',
+        ]
+        results.append(next((p for p in suspicious_patterns
+                             if re.search(p, text, re.IGNORECASE)), None))
+    return results
+
+
+def registry_filters(text):
+    """현재 방식: 미리 컴파일한 정규식으로 같은 검사"""
+    stats = text_stats(text)
+    results = []
+
+    if stats.hangul == 0:
+        results.append(SUSPICIOUS_ENGLISH.search(text))
+        results.append(bool(MIXED_CASE_TEXT.search(text)))
+    for line_stats in stats.lines:
+        line = line_stats.text.strip()
+        if not line:
+            continue
+        if line_stats.hangul == 0 and line_stats.ascii_letters > 0:
+            results.append(bool(MIXED_CASE_LINE.search(line)))
+            results.append(SUSPICIOUS_ENGLISH.search(line) is not None)
+        results.append(NON_WORD_RUN.sub(' ', line).strip())
+
+    results.append(bool(REPEATED_MARKER.search(text)))
+    for line_stats in stats.lines:
+        line = line_stats.text.strip()
+        if line:
+            results.append(NON_WORD_RUN.sub(' ', line).strip())
+
+    if stats.hangul == 0:
+        results.append(ENGLISH_PENALTY.search(text))
+    return results
+
+
+def measure(function, candidates):
+    """후보 전체를 처리하는 데 걸린 시간 (ms, REPEATS번 중 최소, 글자 통계는 미리 캐시)"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for text in candidates:
+            function(text)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    korean = make_candidates(count // 2)
+    english = make_english_candidates(count - len(korean))
+    candidates = korean + english
+    print(f"📝 OCR 후보 {len(candidates)}개 (한국어 잡음 {len(korean)}개, "
+          f"영문 오인식 {len(english)}개)")
+
+    mismatched = [text for text in candidates
+                  if legacy_filters(text) != registry_filters(text)]
+    if mismatched:
+        print(f"❌ 판정이 다른 후보 {len(mismatched)}개: {mismatched[0]!r}")
+        sys.exit(1)
+    print("✅ 모든 후보에서 기존 방식과 판정 일치")
+
+    groups = (("한국어 잡음", korean), ("영문 오인식", english),
+              ("전체", candidates))
+    for label, group in groups:
+        for text in group:
+            text_stats(text)
+        legacy_ms = measure(legacy_filters, group)
+        registry_ms = measure(registry_filters, group)
+        legacy_us = legacy_ms * 1000 / len(group)
+        registry_us = registry_ms * 1000 / len(group)
+        print(f"  {label:<8} 후보당 기존 {legacy_us:6.1f}µs → "
+              f"현재 {registry_us:6.1f}µs "
+              f"({legacy_ms / registry_ms:.1f}배)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""OCR 후보 텍스트 통계 마이크로 벤치마크
+
+업로드 한 건의 OCR 후보(약 60개)마다 정리/점수 함수들이 글자 수를 세던
+기존 방식(함수마다 sum(1 for c in text ...) 생성기와 re.findall로 여러 번 훑기)과
+TextStats(str.translate 한 번으로 글자 종류를 구해 계산)의 시간을 비교하고,
+두 방식의 개수가 모든 후보에서 같은지 확인합니다.
+
+실행: python benchmarks/bench_text_stats.py [후보 수]
+"""
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, '..', 'backend'))
+
+from korean_corpus import SENTENCES
+from text_stats import TextStats, text_stats
+
+REPEATS = 5
+
+# OCR 오인식 흉내용 글자 (비슷한 한글, 숫자, 영문, 기호, 자모)
+NOISE = list("밑범낭랴애세졍헤줜겻곡0123456789oOsSlIeEadW.,~!-|:;'\"ㄱㄴㅎㅏㅣ ")
+
+
+def make_candidates(count, seed=0):
+    """문장마다 글자를 바꾸고/빼고/넣고 줄을 나눈 OCR 후보 텍스트"""
+    rng = random.Random(seed)
+    candidates = []
+    while len(candidates) < count:
+        text = "\n".join(rng.sample(SENTENCES, 3))
+        chars = list(text)
+        for _ in range(rng.randint(0, len(chars) // 3)):
+            i = rng.randrange(len(chars))
+            op = rng.random()
+            if op < 0.5:
+                chars[i] = rng.choice(NOISE)
+            elif op < 0.7:
+                del chars[i]
+            else:
+                chars.insert(i, rng.choice(NOISE))
+        candidates.append("".join(chars))
+    return candidates
+
+
+def _is_special(c):
+    """기존 함수들이 특수문자로 세던 글자 (영숫자, 완성형 한글, 공백 제외)"""
+    return not c.isalnum() and not '가' <= c <= '힣' and c != ' '
+
+
+def legacy_counts(text):
+    """기존 방식: 네 함수가 후보 하나에 하던 글자 수 세기를 그대로 반복"""
+    counts = {}
+    # clean_korean_ocr_text / analyze_korean_text_quality /
+    # evaluate_ocr_quality / clean_ocr_text
+    for prefix in ("clean_korean", "analyze", "evaluate", "clean"):
+        counts[prefix] = (
+            sum(1 for c in text if '가' <= c <= '힣'),
+            sum(1 for c in text if c.isdigit()),
+            sum(1 for c in text if c.isalpha() and c.isascii()),
+            len(text.replace(' ', '').replace('\n', '')),
+        )
+    counts["special"] = sum(1 for c in text if _is_special(c))
+    counts["hangul_words"] = len(re.findall(r'[가-힣]{2,}', text))
+    counts["word_lengths"] = [
+        len(w) for w in re.sub(r'[^가-힣\s]', '', text).split()]
+    words = text.split()
+    short = [w for w in words if len(w) <= 3 and w.isalpha()]
+    counts["short_alpha_words"] = (len(words), len(short))
+    counts["jamo"] = (bool(re.search(r'[ㄱ-ㅎ]{2,}', text)),
+                      bool(re.search(r'[ㅏ-ㅣ]{2,}', text)))
+    lines = []
+    for line in text.split('\n'):
+        lines.append((
+            sum(1 for c in line if '가' <= c <= '힣'),
+            sum(1 for c in line if c.isalpha() and c.isascii()),
+            len(line.replace(' ', '')),
+            sum(1 for c in line if _is_special(c)),
+            bool(re.findall(r'[가-힣]{2,}', line)),
+            bool(re.findall(r'[a-zA-Z]{3,}', line)),
+        ))
+    counts["lines"] = lines
+    return counts
+
+
+def stats_counts(stats):
+    """TextStats에서 같은 개수를 꺼냄"""
+    whole = (stats.hangul, stats.digits, stats.ascii_letters, stats.total)
+    counts = {prefix: whole
+              for prefix in ("clean_korean", "analyze", "evaluate", "clean")}
+    counts["special"] = stats.special
+    counts["hangul_words"] = stats.hangul_words
+    counts["word_lengths"] = stats.hangul_word_lengths
+    counts["short_alpha_words"] = (stats.word_count, stats.short_alpha_words)
+    counts["jamo"] = (stats.has_consonant_run, stats.has_vowel_run)
+    counts["lines"] = [
+        (line.hangul, line.ascii_letters, line.total, line.special,
+         line.longest_hangul_run >= 2, line.longest_ascii_run >= 3)
+        for line in stats.lines
+    ]
+    return counts
+
+
+def measure(function, candidates):
+    """후보 전체를 처리하는 데 걸린 시간 (ms, REPEATS번 중 최소)"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for text in candidates:
+            function(text)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    candidates = make_candidates(count)
+    chars = sum(len(text) for text in candidates)
+    print(f"📝 OCR 후보 {len(candidates)}개 (평균 {chars / len(candidates):.0f}자)")
+
+    mismatched = [text for text in candidates
+                  if legacy_counts(text) != stats_counts(TextStats(text))]
+    if mismatched:
+        print(f"❌ 개수가 다른 후보 {len(mismatched)}개: {mismatched[0]!r}")
+        sys.exit(1)
+    print("✅ 모든 후보에서 기존 방식과 개수 일치")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main_backup as app
+
+    def score_candidate(text):
+        """현재 점수 경로: 정리/교정 후 품질 점수 (후보 하나당 통계는 캐시에서 공유)"""
+        cleaned = app.enhance_korean_ocr_result(text)
+        if cleaned:
+            app.analyze_korean_text_quality(cleaned)
+
+    def score_all(text):
+        with contextlib.redirect_stdout(io.StringIO()):
+            score_candidate(text)
+
+    results = [
+        ("글자 수 세기 (기존, 함수마다 훑기)", measure(legacy_counts, candidates)),
+        ("TextStats (한 번 계산)", measure(TextStats, candidates)),
+    ]
+    text_stats.cache_clear()
+    results.append(("후보 점수 경로 전체 (현재)", measure(score_all, candidates)))
+
+    for label, ms in results:
+        per_candidate = ms * 1000 / len(candidates)
+        print(f"  {label:<30} 후보 전체 {ms:8.2f}ms, "
+              f"후보당 {per_candidate:7.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
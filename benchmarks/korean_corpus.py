@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""합성 한국어 손글씨 OCR 평가 코퍼스
+
+손글씨 느낌의 한글 글꼴로 정답을 알고 있는 문장을 종이 사진처럼 그린 뒤
+노이즈, 흐림, 기울어짐을 더해 저장합니다. 같은 글꼴과 시드를 쓰면
+항상 같은 코퍼스가 만들어지므로 커밋 사이의 OCR 정확도 비교에 사용합니다.
+
+실행: python benchmarks/korean_corpus.py [--fonts 글꼴_폴더] [--out 저장_폴더]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+
+# 정답 문장 (학생 글과 비슷한 길이와 어휘)
+SENTENCES = [
+    "법은 나라에서 정해준 것으로 꼭 지켜야 한다",
+    "도덕은 양심의 문제이다",
+    "친구와 약속을 지키는 것은 중요하다",
+    "우리 반은 쉬는 시간에 운동장에서 놀았다",
+    "나는 커서 과학자가 되고 싶다",
+    "환경을 보호하려면 쓰레기를 줄여야 한다",
+    "오늘 급식에는 김치찌개가 나왔다",
+    "책을 읽으면 생각이 넓어진다",
+    "규칙을 지키면 모두가 편안하게 지낼 수 있다",
+    "할머니 댁에 가서 감을 땄다",
+    "어려운 친구를 도와주면 마음이 따뜻해진다",
+    "선생님께서 발표를 잘했다고 칭찬해 주셨다",
+    "비가 와서 우산을 쓰고 학교에 갔다",
+    "우리 가족은 주말마다 산책을 한다",
+    "거짓말을 하면 믿음을 잃게 된다",
+    "동생과 함께 그림을 그렸다",
+    "교통 신호를 지키지 않으면 위험하다",
+    "봄이 되니 꽃이 많이 피었다",
+    "나의 꿈을 이루기 위해 열심히 공부하겠다",
+    "서로 존중하는 마음이 필요하다",
+]
+
+# 손글씨 느낌의 한글 글꼴 파일 이름 (일부만 일치해도 사용)
+HANDWRITING_FONTS = [
+    "NanumPen", "NanumBrush", "나눔손글씨", "Gaegu", "HiMelody", "GamjaFlower",
+    "PoorStory", "EastSeaDokdo", "YeonSung", "SingleDay", "Dokdo",
+    "Cafe24Ssurround",
+]
+
+# 손글씨 글꼴을 못 찾을 때 사용하는 일반 한글 글꼴
+FALLBACK_FONTS = ["malgun", "NanumGothic", "NanumMyeongjo", "NotoSansCJK",
+                  "NotoSansKR", "AppleGothic"]
+
+FONT_DIRS = [
+    os.path.join(BENCH_DIR, 'fonts'),
+    r"C:\Windows\Fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/Library/Fonts"),
+    "/Library/Fonts",
+]
+
+# 샘플 하나에 들어가는 줄 수, 왜곡 범위
+LINES_PER_SAMPLE = (2, 4)
+NOISE_RANGE = (0, 18)       # 가우시안 노이즈 표준편차
+BLUR_RANGE = (0.0, 1.6)     # 가우시안 흐림 시그마
+SKEW_RANGE = (-6.0, 6.0)    # 기울어짐 (도)
+
+
+def find_fonts(font_dirs=None):
+    """손글씨 글꼴 목록 (없으면 일반 한글 글꼴)"""
+    paths = []
+    for font_dir in font_dirs or FONT_DIRS:
+        for ext in ("ttf", "otf", "ttc"):
+            pattern = os.path.join(font_dir, '**', f'*.{ext}')
+            paths += glob.glob(pattern, recursive=True)
+
+    def matching(names):
+        lowered = [n.lower() for n in names]
+        return sorted({p for p in paths
+                       if any(n in os.path.basename(p).lower()
+                              for n in lowered)})
+
+    return matching(HANDWRITING_FONTS) or matching(FALLBACK_FONTS)
+
+
+def render_handwriting(lines, font_path, rng, font_size=56):
+    """글자마다 크기와 높이를 조금씩 흔들어 손으로 쓴 것처럼 그림 (RGB 배열)"""
+    margin, line_gap = 60, int(font_size * 0.9)
+    fonts = {}
+    longest = max(len(line) for line in lines)
+    width = margin * 2 + int(longest * font_size * 0.95)
+    height = margin * 2 + len(lines) * (font_size + line_gap)
+
+    # 약간 누런 종이 + 위에서 아래로 밝기 변화
+    shade = np.linspace(rng.randint(225, 245), rng.randint(205, 230),
+                        height)[:, None]
+    paper = np.repeat(np.repeat(shade, width, axis=1)[:, :, None], 3, axis=2)
+    paper[:, :, 2] *= 0.94
+    image = Image.fromarray(paper.astype(np.uint8))
+    draw = ImageDraw.Draw(image)
+    ink = tuple(int(v) for v in rng.randint(10, 60, 3))
+
+    y = margin
+    for line in lines:
+        x = margin + rng.randint(-10, 10)
+        for char in line:
+            size = int(font_size * rng.uniform(0.88, 1.12))
+            if size not in fonts:
+                fonts[size] = ImageFont.truetype(font_path, size)
+            draw.text((x, y + rng.randint(-4, 5)), char, font=fonts[size],
+                      fill=ink)
+            x += int(fonts[size].getlength(char) * rng.uniform(0.95, 1.1))
+        y += font_size + line_gap
+    return np.asarray(image)
+
+
+def degrade(page, rng, noise=None, blur=None, skew=None):
+    """휴대폰 사진처럼 기울이고 흐리게 하고 노이즈 추가 (왜곡 값도 함께 반환)"""
+    noise = rng.uniform(*NOISE_RANGE) if noise is None else noise
+    blur = rng.uniform(*BLUR_RANGE) if blur is None else blur
+    skew = rng.uniform(*SKEW_RANGE) if skew is None else skew
+
+    height, width = page.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), skew, 1.0)
+    page = cv2.warpAffine(page, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_REPLICATE)
+    if blur > 0.1:
+        page = cv2.GaussianBlur(page, (0, 0), blur)
+    if noise > 0:
+        noisy = page + rng.normal(0, noise, page.shape)
+        page = np.clip(noisy, 0, 255).astype(np.uint8)
+    return page, {"noise": round(noise, 1), "blur": round(blur, 2),
+                  "skew": round(skew, 2)}
+
+
+def build_corpus(out_dir, fonts, samples_per_font=5, seed=0):
+    """코퍼스 이미지와 정답 목록(manifest.json)을 저장하고 목록을 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.RandomState(seed)
+    samples = []
+    for font_path in fonts:
+        font_name = os.path.splitext(os.path.basename(font_path))[0]
+        for i in range(samples_per_font):
+            count = rng.randint(LINES_PER_SAMPLE[0], LINES_PER_SAMPLE[1] + 1)
+            chosen = rng.choice(len(SENTENCES), count, replace=False)
+            lines = [SENTENCES[j] for j in chosen]
+            page = render_handwriting(lines, font_path, rng)
+            page, distortion = degrade(page, rng)
+
+            file_name = f"{font_name}_{i:02d}.png"
+            Image.fromarray(page).save(os.path.join(out_dir, file_name))
+            samples.append({"file": file_name, "font": font_name,
+                            "text": "\n".join(lines), **distortion})
+
+    manifest = {"seed": seed, "samples_per_font": samples_per_font,
+                "samples": samples}
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return samples
+
+
+def load_corpus(corpus_dir):
+    """manifest.json의 (샘플 정보, PIL 이미지) 목록"""
+    with open(os.path.join(corpus_dir, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    return [(sample,
+             Image.open(os.path.join(corpus_dir, sample["file"]))
+             .convert('RGB'))
+            for sample in manifest["samples"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 한국어 손글씨 OCR 코퍼스 생성")
+    parser.add_argument("--fonts", action="append", help="글꼴 폴더 (여러 번 지정 가능)")
+    parser.add_argument("--out", default=DEFAULT_CORPUS_DIR, help="저장 폴더")
+    parser.add_argument("--samples", type=int, default=5, help="글꼴당 샘플 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fonts = find_fonts(args.fonts)
+    if not fonts:
+        print("❌ 한글 글꼴을 찾을 수 없습니다. --fonts로 손글씨 글꼴 폴더를 지정하세요 "
+              "(예: 나눔손글씨 펜, Gaegu).")
+        sys.exit(1)
+
+    samples = build_corpus(args.out, fonts, args.samples, args.seed)
+    print(f"✅ 코퍼스 생성 완료: 글꼴 {len(fonts)}개, 샘플 {len(samples)}개 → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import pickle
+
+import numpy as np
+from PIL import Image
+
+from gray_image import GrayImage
+
+
+def test_contiguous_gray_array_is_not_copied():
+    """이미 연속된 uint8 배열이면 복사 없이 감싸고, PIL 이미지도 같은 버퍼를 쓰는지 확인"""
+    pixels = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    image = GrayImage(pixels)
+
+    assert image.pixels is pixels
+    assert (image.width, image.height, image.size) == (4, 3, (4, 3))
+    assert image.nbytes == 12
+
+    pil = image.to_pil()
+    assert (pil.mode, pil.size) == ('L', (4, 3))
+    pixels[0, 0] = 200
+    assert pil.getpixel((0, 0)) == 200
+
+
+def test_color_views_and_other_dtypes_are_converted():
+    """컬러/잘린 뷰/다른 자료형은 연속된 그레이스케일 uint8로 바꾸는지 확인"""
+    color = np.zeros((5, 6, 3), np.uint8)
+    color[..., 0] = 255
+    assert GrayImage(color).pixels.shape == (5, 6)
+    assert GrayImage(color).pixels[0, 0] == 76  # 빨강의 밝기
+
+    view = np.zeros((10, 10), np.uint8)[::2, 1:]
+    image = GrayImage(view)
+    assert image.pixels.flags['C_CONTIGUOUS'] and image.size == (9, 5)
+
+    assert GrayImage(np.ones((2, 2), np.float64)).pixels.dtype == np.uint8
+
+    pil = Image.new('RGB', (7, 3), 'white')
+    assert GrayImage.from_pil(pil).pixels.min() == 255
+
+
+def test_pgm_and_pickle_round_trip():
+    """무압축 PGM과 워커 프로세스 전달(pickle)에서 픽셀이 그대로 유지되는지 확인"""
+    pixels = np.random.default_rng(0).integers(0, 256, (8, 5), np.uint8)
+    image = GrayImage(pixels)
+
+    data = image.to_pgm()
+    assert data.startswith(b"P5\n5 8\n255\n")
+    assert len(data) == len(b"P5\n5 8\n255\n") + 40
+
+    restored = pickle.loads(pickle.dumps(image))
+    assert np.array_equal(restored.pixels, pixels)
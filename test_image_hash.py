@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import cv2
+import numpy as np
+
+from database import DatabaseManager
+from image_hash import (
+    BKTree, NearDuplicateIndex, dhash, fingerprint, hamming_distance,
+)
+
+
+def make_page(seed, shift=0, brightness=0, width=600):
+    """같은 틀(테두리, 줄 위치)에 seed마다 다른 글을 쓴 쪽 이미지"""
+    rng = random.Random(seed)
+    page = np.full((800, width), 235, np.uint8)
+    cv2.rectangle(page, (30, 30), (width - 30, 770), 120, 2)
+    for line in range(12):
+        x = 50
+        while x < width - 120:
+            word = "".join(rng.choice("abcdeghkmnp")
+                           for _ in range(rng.randint(1, 4)))
+            cv2.putText(page, word, (x + shift, 80 + line * 55 + shift),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.9, 30, 2)
+            x += 25 * len(word) + rng.randint(15, 40)
+    return np.clip(page.astype(int) + brightness, 0, 255).astype(np.uint8)
+
+
+def test_bktree_matches_linear_scan():
+    """BK-트리 검색 결과가 전체 비교 결과와 같은지 확인"""
+    rng = random.Random(0)
+    hashes = [rng.getrandbits(64) for _ in range(300)]
+    tree = BKTree()
+    for i, value in enumerate(hashes):
+        tree.add(value, i)
+
+    query = hashes[42] ^ 0b1011  # 3비트만 다른 해시
+    expected = sorted(
+        (hamming_distance(query, value), i)
+        for i, value in enumerate(hashes)
+        if hamming_distance(query, value) <= 8
+    )
+    assert sorted(tree.search(query, 8)) == expected
+    assert tree.search(query, 8)[0] == (3, 42)
+
+
+def test_dhash_keeps_64_bit_layout():
+    """기본 dHash가 왼쪽 위 픽셀부터 최상위 비트로 채운 64비트 값인지 확인"""
+    gradient = np.tile(np.arange(9, dtype=np.uint8) * 20, (8, 1))
+    assert dhash(gradient) == 2 ** 64 - 1
+    assert dhash(gradient[:, ::-1]) == 0
+
+
+def test_near_duplicate_needs_confirmation(tmp_path):
+    """dHash 후보라도 비율과 세밀한 해시가 맞는 같은 사진만 재사용하는지 확인"""
+    db = DatabaseManager(str(tmp_path / "hashes.db"))
+    # 후보 거리 제한을 없애서 확인 단계만 시험
+    index = NearDuplicateIndex(db, max_distance=64)
+    index.add("s1", fingerprint(make_page(1)), "원본")
+
+    retaken = fingerprint(make_page(1, shift=3, brightness=10))
+    assert index.find("s1", retaken)[0][1] == "원본"
+    assert index.find("s2", retaken) == []
+    # 틀은 같고 글만 다른 쪽, 비율이 다른 사진은 같은 사진이 아님
+    assert index.find("s1", fingerprint(make_page(2))) == []
+    assert index.find("s1", fingerprint(make_page(1, width=700))) == []
+
+    # 데이터베이스에서 다시 읽은 색인도 같은 결과
+    reloaded = NearDuplicateIndex(db, max_distance=64)
+    assert reloaded.find("s1", retaken)[0][1] == "원본"
+    assert reloaded.find("s1", fingerprint(make_page(2))) == []
+
+
+def test_old_rows_without_fine_hash_are_not_reused(tmp_path):
+    """세밀한 해시가 없는 예전 기록은 dHash가 같아도 재사용하지 않는지 확인"""
+    db = DatabaseManager(str(tmp_path / "hashes.db"))
+    image_print = fingerprint(make_page(1))
+    db.save_image_hash("s1", f"{image_print.dhash:016x}", "예전")
+
+    assert NearDuplicateIndex(db).find("s1", image_print) == []
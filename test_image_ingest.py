@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import io
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import pytest
+from PIL import Image
+
+from image_ingest import ImageTooLargeError, ingest_image
+
+
+def make_jpeg(width, height):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (240, 240, 240)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def test_large_jpeg_is_decoded_at_reduced_size():
+    """큰 JPEG는 원본 해상도로 풀지 않고 축소 디코딩되는지 확인"""
+    image, info = ingest_image(make_jpeg(4000, 3000), max_side=1000)
+
+    assert info["draft"]
+    assert info["original_size"] == [4000, 3000]
+    assert info["decoded_size"] == [1000, 750]
+    assert image.size == (1000, 750)
+    assert info["decode_ms"] >= 0
+
+
+def test_pixel_limit_rejects_before_decoding():
+    """헤더의 픽셀 수가 한도를 넘으면 디코딩 전에 거부되는지 확인"""
+    with pytest.raises(ImageTooLargeError):
+        ingest_image(make_jpeg(4000, 3000), max_pixels=1_000_000)
+
+
+def test_rss_growth_is_per_call():
+    """메모리 증가량이 프로세스 최댓값이 아닌 호출 전후의 현재 RSS 차이인지 확인"""
+    # 먼저 큰 이미지를 읽어 프로세스 최댓값을 올려 둠
+    ingest_image(make_jpeg(3000, 3000), draft=False)
+    _, info = ingest_image(make_jpeg(2000, 2000), max_side=2000, draft=False)
+
+    if info["rss_mb"] is None:
+        pytest.skip("/proc/self/statm을 읽을 수 없는 OS")
+    assert info["rss_mb"] > 0
+    assert info["rss_growth_mb"] >= 5  # 2000x2000 RGB 이미지는 약 12MB
+    assert "peak_rss_mb" not in info
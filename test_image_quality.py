@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import cv2
+import numpy as np
+import pytest
+
+from database import DatabaseManager
+from image_quality import QualityRouter, analyze_image_quality
+from preprocess_nodes import NATIVE_VARIANTS, UPSCALED_VARIANTS
+
+
+def make_page(thickness=5):
+    """짧은 획을 글줄처럼 늘어놓은 흰 종이"""
+    rng = np.random.RandomState(0)
+    page = np.full((900, 1200), 235, np.uint8)
+    for y in range(100, 800, 110):
+        for x in range(80, 1100, 60):
+            for _ in range(3):
+                start = (x + rng.randint(0, 40), y + rng.randint(0, 50))
+                end = (x + rng.randint(0, 40), y + rng.randint(0, 50))
+                cv2.line(page, start, end, (30,), thickness)
+    return page
+
+
+def test_quality_metrics_follow_image_condition():
+    """흐림, 대비, 조명 얼룩, 획 두께가 사진 상태에 따라 달라지는지 확인"""
+    sharp = analyze_image_quality(make_page())
+
+    blurred = analyze_image_quality(cv2.GaussianBlur(make_page(), (0, 0), 4))
+    assert blurred["blur"] < sharp["blur"] / 5
+
+    faded = analyze_image_quality((make_page() * 0.3 + 150).astype(np.uint8))
+    assert faded["contrast"] < sharp["contrast"] / 2
+
+    gradient = np.linspace(0.5, 1, 1200)[None, :]
+    shaded = analyze_image_quality((gradient * make_page()).astype(np.uint8))
+    assert (shaded["background_unevenness"]
+            > sharp["background_unevenness"] + 0.2)
+
+    thin = analyze_image_quality(make_page(2))
+    thick = analyze_image_quality(make_page(12))
+    assert thin["stroke_width"] < sharp["stroke_width"]
+    assert thick["stroke_width"] > sharp["stroke_width"]
+    assert 0 < sharp["text_density"] < 0.5
+
+
+def test_router_picks_matching_rules_and_logs(tmp_path):
+    """일치한 규칙의 변형을 순서대로 최대 개수까지 고르고, 부족하면 기본값으로 채우는지 확인"""
+    table = {
+        "max_variants": 3,
+        "min_variants": 2,
+        "default": ["손글씨_원본크기", "기본전처리"],
+        "rules": [
+            {"name": "흐림", "when": {"blur": {"max": 100}},
+             "variants": ["부드러운처리", "손글씨_원본크기"]},
+            {"name": "저대비", "when": {"contrast": {"max": 90}},
+             "variants": ["고대비", "부드러운처리"]},
+            {"name": "굵은_획", "when": {"stroke_width": {"min": 12}},
+             "variants": ["연결분리"]},
+        ],
+    }
+    db = DatabaseManager(str(tmp_path / "routing.db"))
+    router = QualityRouter(table, NATIVE_VARIANTS + UPSCALED_VARIANTS, db)
+
+    metrics = {"blur": 50, "contrast": 60, "stroke_width": 15}
+    assert router.route(metrics) == (
+        ["부드러운처리", "손글씨_원본크기", "고대비"], ["흐림", "저대비", "굵은_획"])
+    assert router.route({"blur": 500, "contrast": 200, "stroke_width": 15}) == \
+        (["연결분리", "손글씨_원본크기"], ["굵은_획"])
+
+    router.record(metrics, ["흐림"], ["부드러운처리"], "한국어(부드러운처리-PSM6)", 88)
+    log = db.get_routing_log()
+    assert log[0]["metrics"] == metrics
+    assert log[0]["winner"] == "한국어(부드러운처리-PSM6)"
+
+    with pytest.raises(ValueError):
+        QualityRouter(dict(table, default=["회전_90도"]), NATIVE_VARIANTS)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from korean_correction import AhoCorasick, CorrectionEngine
+
+
+def test_automaton_picks_leftmost_longest_matches():
+    """겹치는 규칙은 왼쪽, 같은 위치는 긴 규칙을 고르고 결과를 다시 바꾸지 않는지 확인"""
+    automaton = AhoCorasick(
+        {"체니": "체벌", "체니을": "체벌을", "니을": "X", "벌": "니"})
+    assert automaton.replace("체니을 받고 체니") == (
+        "체벌을 받고 체벌", [("체니을", "체벌을"), ("체니", "체벌")])
+    assert automaton.replace("아무 일치 없음") == ("아무 일치 없음", [])
+    assert AhoCorasick({}).replace("텍스트") == ("텍스트", [])
+
+
+def test_token_rules_do_not_touch_other_words():
+    """어절 규칙은 어절 전체가 같을 때만 바꾸고, 쪼개진 낱말만 다시 붙이는지 확인"""
+    engine = CorrectionEngine({
+        "tokens": {"밑은": "법은", "억은": "도덕은"},
+        "words": ["나라에서", "정해준"],
+        "sentence_endings": ["다"],
+    })
+    corrected, applied = engine.correct("밑은 나 라에서 정해 준 것\n기억은 밑에  있다")
+    assert corrected == "법은 나라에서 정해준 것\n기억은 밑에 있다."
+    assert applied == [("밑은", "법은"), ("나 라에서", "나라에서"),
+                       ("정해 준", "정해준"), ("있다", "있다.")]
+    assert engine.correct("다른 말") == ("다른 말", [])
+
+
+def test_large_rule_table():
+    """규칙이 수천 개여도 같은 결과를 내는지 확인"""
+    rules = {f"규칙{i}번": f"교정{i}" for i in range(5000)}
+    engine = CorrectionEngine({"substitutions": rules})
+    assert len(engine) == 5000
+    assert engine.correct("규칙42번 그리고 규칙4999번")[0] == "교정42 그리고 교정4999"
+
+
+def test_shipped_rules_load():
+    """기본 규칙 파일이 읽히고 흔한 낱말을 바꾸지 않는지 확인"""
+    engine = CorrectionEngine.from_file()
+    assert engine.correct("가족과 기억")[0] == "가족과 기억"
+    assert engine.correct("체니을 받고")[0] == "체벌을 받고"
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from korean_lexicon import KoreanLexicon, jamo_distance, uncertain_tokens
+from korean_lexicon_index import build_index, decompose
+from ocr_words import OCRWord
+
+WORDS = ["나라", "도덕", "양심", "체벌", "학생", "선생님", "강제적으로", "지켜야"]
+
+
+def open_lexicon(tmp_path, words=WORDS):
+    words_path = tmp_path / "words.txt"
+    words_path.write_text("# 시험용 어휘\n" + "\n".join(words) + "\n",
+                          encoding="utf-8")
+    return KoreanLexicon.open(str(words_path), str(tmp_path / "words.idx"))
+
+
+def test_jamo_distance():
+    """자모 단위로 거리를 재서 획 하나 차이는 1이 되는지 확인"""
+    assert jamo_distance(decompose("밥"), decompose("밤"), 2) == 1
+    assert jamo_distance(decompose("양심"), decompose("양싱"), 2) == 1
+    assert jamo_distance(decompose("나라"), decompose("강제적으로"), 2) == 3
+
+
+def test_lookup_and_particles(tmp_path):
+    """가까운 낱말을 찾고, 조사를 떼어 찾거나 잘못 읽은 조사도 받침에 맞게 고치는지 확인"""
+    lexicon = open_lexicon(tmp_path)
+    assert len(lexicon) == len(WORDS)
+    assert "양심" in lexicon and "양싱" not in lexicon
+    assert lexicon.lookup("선생넘") == ("선생님", 1)
+    assert lexicon.lookup("사람") == ("나라", 2)
+    assert lexicon.lookup("사람", 1) is None
+
+    assert lexicon.correct_token("강제적으루") == "강제적으로"
+    assert lexicon.correct_token("양싱의") == "양심의"
+    assert lexicon.correct_token("나라애서") == "나라에서"
+    assert lexicon.correct_token("도덕픈") == "도덕은"
+    assert lexicon.correct_token("체벌을") is None   # 이미 맞는 어절
+    assert lexicon.correct_token("토끼") is None     # 가까운 낱말 없음
+    assert lexicon.correct_token("사람") is None     # 두 음절 낱말은 자모 하나까지만
+
+
+def test_only_uncertain_tokens_are_corrected(tmp_path):
+    """엔진 신뢰도가 낮은 어절만 고치고 줄바꿈은 그대로 두는지 확인"""
+    lexicon = open_lexicon(tmp_path)
+    words = [OCRWord("양싱의", 41.0, 0, 0, 10, 10, 0),
+             OCRWord("도덕픈", 95.0, 0, 0, 10, 10, 1),
+             OCRWord("학샘|", 30.0, 0, 0, 10, 10, 1),
+             OCRWord("?", -1, 0, 0, 10, 10, 1)]
+    uncertain = uncertain_tokens(words, 60)
+    assert uncertain == {"양싱의", "학샘|", "학샘"}
+
+    text, applied = lexicon.correct_text("양싱의 가책\n도덕픈 학샘", uncertain)
+    assert text == "양심의 가책\n도덕픈 학생"
+    assert applied == [("양싱의", "양심의"), ("학샘", "학생")]
+
+
+def test_index_is_rebuilt_when_words_change(tmp_path):
+    """어휘 목록이 바뀌면 색인을 다시 만들고, 같은 색인은 그대로 여는지 확인"""
+    lexicon = open_lexicon(tmp_path)
+    index_path = tmp_path / "words.idx"
+    built = index_path.stat().st_mtime_ns
+    reopened = KoreanLexicon.open(str(tmp_path / "words.txt"),
+                                  str(index_path))
+    assert len(reopened) == len(WORDS)
+    assert index_path.stat().st_mtime_ns == built
+
+    os.utime(index_path, ns=(built - 10**9, built - 10**9))
+    lexicon = open_lexicon(tmp_path, WORDS + ["사람"])
+    assert lexicon.lookup("사람") == ("사람", 0)
+
+    build_index(["하나"], str(tmp_path / "other.idx"), max_distance=1)
+    assert KoreanLexicon(str(tmp_path / "other.idx")).max_distance == 1
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import numpy as np
+
+from line_segmentation import MAX_LINES, crop_lines, find_text_lines
+
+
+def make_page(rows, width=300, height=200):
+    """흰 배경에 (위, 아래, 왼쪽, 오른쪽) 검은 글줄을 그린 이진 이미지"""
+    page = np.full((height, width), 255, np.uint8)
+    for top, bottom, left, right in rows:
+        page[top:bottom, left:right] = 0
+    return page
+
+
+def test_lines_found_top_to_bottom_with_margin():
+    """글줄을 위에서부터 찾고, 잉크 영역에 여백을 더해 자르는지 확인"""
+    page = make_page([(100, 120, 40, 200), (20, 40, 30, 250)])
+    assert find_text_lines(page) == [(26, 16, 254, 44), (36, 96, 204, 124)]
+
+
+def test_narrow_gaps_merge_and_rules_are_ignored():
+    """받침처럼 좁은 틈은 한 줄로 합치고, 가로 전체 선과 작은 점은 무시하는지 확인"""
+    page = make_page([
+        (20, 30, 40, 200), (32, 40, 40, 200),  # 2픽셀 틈: 같은 줄
+        (80, 82, 0, 300),                      # 공책 줄
+        (150, 153, 100, 140),                  # 너무 낮은 얼룩
+    ])
+    assert find_text_lines(page) == [(36, 16, 204, 44)]
+
+
+def test_too_many_lines_is_noise():
+    """줄이 너무 많으면 노이즈로 보고 줄 분할을 포기하는지 확인"""
+    count = MAX_LINES + 1
+    page = make_page([(i * 20, i * 20 + 10, 10, 100) for i in range(count)],
+                     height=count * 20)
+    assert find_text_lines(page, margin=0) == []
+
+
+def test_crop_lines_are_contiguous():
+    """잘라낸 줄 이미지가 연속 메모리 배열인지 확인 (엔진에 그대로 전달)"""
+    page = make_page([(20, 40, 30, 250)])
+    lines = find_text_lines(page)
+    crops = crop_lines(page, lines)
+    assert crops[0].shape == (28, 228)
+    assert crops[0].flags['C_CONTIGUOUS']
+    assert not np.shares_memory(crops[0], page)
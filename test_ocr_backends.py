@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import numpy as np
+
+import ocr_backends
+from gray_image import GrayImage
+from ocr_backends import (
+    OCRBackend, OCRCallStats, PytesseractBackend, create_ocr_backend,
+    measure_call_overhead,
+)
+from ocr_words import OCRPage
+
+TSV = "\n".join([
+    "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num"
+    "\tleft\ttop\twidth\theight\tconf\ttext",
+    "5\t1\t1\t1\t1\t1\t10\t5\t40\t20\t91.5\t법은",
+    "5\t1\t1\t1\t1\t2\t60\t5\t40\t20\t88\t지킨다",
+])
+
+
+class FakePytesseract:
+    """image_to_data 호출을 기록하는 가짜 pytesseract 모듈"""
+
+    def __init__(self):
+        self.calls = []
+
+    def image_to_data(self, image, lang, config, timeout):
+        self.calls.append((image.format, image.size, lang, config, timeout))
+        return TSV
+
+
+def test_pytesseract_reads_text_and_words_in_one_call():
+    """GrayImage를 무압축 PGM으로 넘기고, TSV 한 번으로 텍스트와 단어를 얻는지 확인"""
+    backend = PytesseractBackend()
+    backend._pytesseract = FakePytesseract()
+
+    page = backend.recognize(GrayImage(np.zeros((30, 120), np.uint8)),
+                             'kor', 7, timeout=2)
+
+    assert page.text == "법은 지킨다"
+    assert [(w.text, w.conf) for w in page.words] == [
+        ("법은", 91.5), ("지킨다", 88.0)]
+    assert page.size == (120, 30)
+    assert backend._pytesseract.calls == [
+        ("PPM", (120, 30), 'kor', '--psm 7 --dpi 300', 2)]
+
+
+def test_auto_falls_back_to_pytesseract(monkeypatch):
+    """tesserocr를 쓸 수 없으면 pytesseract 백엔드로 대체하는지 확인"""
+    def unavailable(self):
+        raise ImportError("tesserocr 없음")
+
+    monkeypatch.setattr(ocr_backends.TesserocrBackend, "__init__", unavailable)
+    assert isinstance(create_ocr_backend("auto"), PytesseractBackend)
+    assert isinstance(create_ocr_backend("pytesseract"), PytesseractBackend)
+
+
+def test_call_overhead_is_median_and_failures_are_none():
+    """빈 이미지 호출 시간의 중앙값을 재고, 엔진 오류면 None을 돌려주는지 확인"""
+    class Blank(OCRBackend):
+        name = "blank"
+        calls = 0
+
+        def recognize(self, image, lang, psm, timeout=None):
+            Blank.calls += 1
+            return OCRPage("", [], image.size)
+
+    class Broken(OCRBackend):
+        name = "broken"
+
+        def recognize(self, image, lang, psm, timeout=None):
+            raise RuntimeError("엔진 없음")
+
+    assert measure_call_overhead(Blank(), repeats=3) >= 0
+    assert Blank.calls == 4  # 엔진 로딩용 첫 호출은 측정에서 제외
+    assert measure_call_overhead(Broken()) is None
+
+
+def test_call_stats_estimate_saved_time():
+    """호출 수와 평균 시간, pytesseract 대비 절약한 고정 비용을 계산하는지 확인"""
+    stats = OCRCallStats()
+    assert stats.to_dict()["avg_call_ms"] is None
+
+    stats.set_overhead("tesserocr", 5.0, 45.0)
+    stats.record("tesserocr", 0.1)
+    stats.record("tesserocr", 0.3)
+
+    assert stats.to_dict() == {
+        "backend": "tesserocr",
+        "calls": 2,
+        "avg_call_ms": 200.0,
+        "engine_overhead_ms": 5.0,
+        "pytesseract_overhead_ms": 45.0,
+        "saved_ms_per_call": 40.0,
+        "estimated_saved_ms": 80,
+    }
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+import io
+import json
+import zipfile
+
+import pytest
+
+import ocr_batch
+from ocr_batch import (
+    build_batch_items, expand_zip, iter_batch_results, student_id_from_name,
+)
+
+ALLOWED = ["jpg", "png"]
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_student_id_from_name():
+    """폴더가 있으면 폴더명, 없으면 확장자를 뺀 파일명을 학생 ID로 쓰는지 확인"""
+    assert student_id_from_name("student001/page1.jpg") == "student001"
+    assert student_id_from_name("반\\홍길동\\1.png") == "홍길동"
+    assert student_id_from_name("홍길동.jpg") == "홍길동"
+    assert student_id_from_name("") == ""
+
+
+def test_zip_limits_are_checked_before_extraction():
+    """숨김/폴더 항목은 건너뛰고, 형식과 압축 해제 크기는 풀기 전에 거르는지 확인"""
+    contents = make_zip({
+        "s1/a.jpg": b"a" * 10,
+        "s1/big.png": b"0" * 5000,  # 압축하면 작지만 풀면 제한 초과
+        "s1/notes.txt": b"memo",
+        "__MACOSX/s1/._a.jpg": b"x",
+        "s1/.DS_Store": b"x",
+    })
+
+    entries = expand_zip(contents, ALLOWED, max_file_size=1000)
+
+    assert entries == [
+        ("s1/a.jpg", b"a" * 10, None),
+        ("s1/big.png", None, "파일 크기가 너무 큽니다."),
+        ("s1/notes.txt", None, "지원하지 않는 파일 형식입니다."),
+    ]
+
+
+def test_build_items_from_files_and_zips(monkeypatch):
+    """ZIP은 풀어서 폴더명으로, 일반 파일은 받은 학생 ID 순서대로 짝짓는지 확인"""
+    monkeypatch.setattr(ocr_batch, "OCR_BATCH_MAX_ZIP_SIZE", 10_000)
+    uploads = [
+        ("a.jpg", b"a"),
+        ("class.zip", make_zip({"s2/1.jpg": b"b", "s3/1.jpg": b"c"})),
+        ("b.gif", b"d"),
+        ("huge.zip", b"0" * 10_001),
+        ("broken.zip", b"not a zip"),
+    ]
+
+    items = build_batch_items(uploads, ["s1", " "], ALLOWED, 1000)
+
+    assert [(i.index, i.filename, i.student_id, i.contents, i.error)
+            for i in items] == [
+        (0, "a.jpg", "s1", b"a", None),
+        (1, "s2/1.jpg", "s2", b"b", None),
+        (2, "s3/1.jpg", "s3", b"c", None),
+        (3, "b.gif", "b", None, "지원하지 않는 파일 형식입니다."),
+        (4, "huge.zip", None, None, "ZIP 파일 크기가 너무 큽니다."),
+        (5, "broken.zip", None, None, "ZIP 파일을 읽을 수 없습니다."),
+    ]
+
+
+def test_too_many_items_after_expansion(monkeypatch):
+    """ZIP을 푼 뒤의 사진 수가 한도를 넘으면 거절하는지 확인"""
+    monkeypatch.setattr(ocr_batch, "OCR_BATCH_MAX_ITEMS", 2)
+    contents = make_zip({f"s1/{i}.jpg": b"x" for i in range(3)})
+    with pytest.raises(ValueError):
+        build_batch_items([("class.zip", contents)], None, ALLOWED, 1000)
+
+
+def test_results_stream_with_bounded_concurrency():
+    """동시에 처리하는 수를 제한하고, 끝나는 대로 줄을 보내고 마지막에 요약을 보내는지 확인"""
+    items = build_batch_items(
+        [(f"s{i}.jpg", b"x") for i in range(6)] + [("bad.gif", b"x")],
+        None, ALLOWED, 1000)
+    running = {"now": 0, "max": 0}
+
+    async def process_item(item):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        if item.student_id == "s3":
+            raise RuntimeError("OCR 오류")
+        return {"success": True, "ocr_text": item.student_id}
+
+    async def collect():
+        return [json.loads(line) async for line
+                in iter_batch_results(items, process_item, concurrency=2)]
+
+    lines = asyncio.run(collect())
+
+    assert running["max"] == 2
+    assert lines[0] == {"index": 6, "filename": "bad.gif", "student_id": "bad",
+                        "success": False,
+                        "error": "지원하지 않는 파일 형식입니다."}
+    failed = [line for line in lines if line.get("error") == "OCR 오류"]
+    assert [line["student_id"] for line in failed] == ["s3"]
+    assert lines[-1] == {"done": True, "total": 7, "succeeded": 5,
+                         "failed": 2}
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from database import DatabaseManager
+from ocr_cache import OCRResultCache, hash_upload
+
+
+def test_memory_lru_eviction():
+    """메모리 캐시가 크기 제한을 넘으면 오래된 항목부터 제거되는지 확인"""
+    cache = OCRResultCache("test", max_bytes=120)
+    for i in range(5):
+        cache.put(f"hash{i}", {"ocr_text": "가" * 10})
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 120
+    assert stats["evictions"] > 0
+    assert cache.get("hash4") is not None
+    assert cache.get("hash0") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_database_backed_cache(tmp_path):
+    """메모리에서 빠진 결과도 데이터베이스에서 다시 찾는지 확인"""
+    db = DatabaseManager(str(tmp_path / "cache.db"))
+    content_hash = hash_upload(b"same photo bytes")
+
+    OCRResultCache("v1", db).put(content_hash, {"ocr_text": "법은 지켜야 한다"})
+
+    fresh = OCRResultCache("v1", db)
+    assert fresh.get(content_hash) == {"ocr_text": "법은 지켜야 한다"}
+    assert fresh.stats()["db_hits"] == 1
+
+    # 파이프라인 버전이 다르면 재사용하지 않음
+    assert OCRResultCache("v2", db).get(content_hash) is None
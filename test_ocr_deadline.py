@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+import time
+from contextlib import aclosing
+
+import pytest
+from PIL import Image
+
+import ocr_executor
+from ocr_backends import OCRBackend
+from ocr_executor import OCRTask, iter_ocr_results
+from ocr_scheduler import OCRScheduler
+from ocr_words import OCRPage
+
+
+class SlowBackend(OCRBackend):
+    """호출마다 delay초 걸리고, 끝난 호출 수를 세는 가짜 엔진"""
+    name = "slow"
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    def recognize(self, image, lang, psm, timeout=None):
+        time.sleep(self.delay)
+        self.calls += 1
+        return OCRPage("법은 나라에서 정해준 것", [], (10, 10))
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """프로세스 풀 없이(OCR_WORKERS=0) 느린 가짜 엔진으로 실행"""
+    slow = SlowBackend(0.05)
+    monkeypatch.setattr(ocr_executor, "OCR_WORKERS", 0)
+    monkeypatch.setattr(ocr_executor, "_backend", slow)
+    return slow
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    """서버 모듈 (데이터베이스는 임시 폴더에 생성)"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        import main_backup
+    finally:
+        os.chdir(cwd)
+    return main_backup
+
+
+def run_search(app, monkeypatch, scheduler):
+    monkeypatch.setattr(app, "quality_router", None)
+    monkeypatch.setattr(app, "ocr_scheduler", scheduler)
+    run_info = {}
+    image = Image.new('RGB', (400, 300), 'white')
+    results = asyncio.run(app.try_multiple_ocr_methods(image, run_info))
+    return results, run_info
+
+
+def test_closing_stream_skips_unsubmitted_tasks(backend):
+    """중간에 멈추면 동시 실행 한도 밖의 작업은 엔진에 제출되지 않는지 확인"""
+    tasks = [OCRTask(f"변형{i}", f"변형{i}", 6, 'kor') for i in range(10)]
+
+    async def first_result():
+        async with aclosing(iter_ocr_results(tasks, concurrency=2)) as stream:
+            async for task, page in stream:
+                return task
+
+    assert asyncio.run(first_result()) == tasks[0]
+    time.sleep(0.2)  # 이미 시작된 호출은 끝까지 실행됨
+    assert backend.calls <= 2
+
+
+def test_deadline_returns_partial_results(app, monkeypatch, backend):
+    """마감 시간이 지나면 남은 후보를 취소하고 그때까지의 결과를 partial로 반환하는지 확인"""
+    scheduler = OCRScheduler(score_threshold=101, time_budget=60,
+                             deadline=0.3, fusion_stop=0)
+    started = time.perf_counter()
+    results, run_info = run_search(app, monkeypatch, scheduler)
+    elapsed = time.perf_counter() - started
+    calls = backend.calls
+
+    assert (run_info["stop_reason"], run_info["partial"]) == (
+        "deadline", True)
+    assert run_info["resolution_stages"][-1]["stop_reason"] == "deadline"
+    native = app.build_ocr_tasks(
+        [(name, None) for name in app.OCR_STAGES[0].variants])
+    assert 0 < run_info["executed"] < len(native)
+    assert results
+    assert elapsed < 2
+
+    time.sleep(0.2)  # 취소된 후보는 더 실행되지 않음
+    assert backend.calls - calls <= 1
+
+
+def test_time_budget_stops_new_candidates(app, monkeypatch, backend):
+    """시간 예산을 다 쓰면 새 페이지 후보를 시작하지 않고 partial로 표시하는지 확인"""
+    scheduler = OCRScheduler(score_threshold=101, time_budget=0,
+                             deadline=0, fusion_stop=0)
+    _, run_info = run_search(app, monkeypatch, scheduler)
+
+    assert (run_info["stop_reason"], run_info["partial"]) == (
+        "time_budget", True)
+    assert len(run_info["resolution_stages"]) == 1
+    assert run_info["executed"] <= 1  # 줄 분할 OCR만 실행
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+def test_disconnect_cancels_ocr(app):
+    """클라이언트 연결이 끊기면 OCR 작업을 취소하고 ClientDisconnected를 발생시키는지 확인"""
+    request = FakeRequest()
+    cancelled = []
+
+    async def slow_ocr():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        asyncio.get_running_loop().call_later(
+            0.05, setattr, request, "disconnected", True)
+        with pytest.raises(app.ClientDisconnected):
+            await app.cancel_on_disconnect(request, slow_ocr(),
+                                           poll_interval=0.01)
+
+        async def quick_ocr():
+            return {"success": True}
+
+        return await app.cancel_on_disconnect(FakeRequest(), quick_ocr(),
+                                              poll_interval=0.01)
+
+    assert asyncio.run(main()) == {"success": True}
+    assert cancelled == [True]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import ocr_executor
+from ocr_backends import OCRBackend, OCRCallStats
+from ocr_executor import OCRTask, run_ocr_tasks
+from ocr_words import OCRPage
+
+
+class FakeBackend(OCRBackend):
+    """변형 이름을 그대로 텍스트로 돌려주는 가짜 엔진 ("실패"면 예외)"""
+    name = "fake"
+
+    def __init__(self):
+        self.calls = []
+
+    def recognize(self, image, lang, psm, timeout=None):
+        self.calls.append((image, lang, psm, timeout))
+        if image == "실패":
+            raise RuntimeError("엔진 오류")
+        return OCRPage(f"{image}-{lang}-{psm}", [], (10, 10))
+
+
+class BrokenPool(Executor):
+    """워커가 죽어 모든 작업이 BrokenProcessPool로 끝나는 가짜 프로세스 풀"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.closed = False
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        future = Future()
+        future.set_exception(BrokenProcessPool("워커 비정상 종료"))
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.closed = True
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """프로세스 풀 없이(OCR_WORKERS=0) 가짜 엔진으로 실행"""
+    fake = FakeBackend()
+    monkeypatch.setattr(ocr_executor, "OCR_WORKERS", 0)
+    monkeypatch.setattr(ocr_executor, "_backend", fake)
+    monkeypatch.setattr(ocr_executor, "call_stats", OCRCallStats())
+    return fake
+
+
+def test_without_workers_no_pool_is_created(backend):
+    """워커 수가 0이면 프로세스 풀을 만들지 않는지 확인"""
+    assert ocr_executor.get_ocr_executor() is None
+
+
+def test_results_keep_task_order_and_errors_in_place(backend, monkeypatch):
+    """결과는 작업 순서대로, 실패한 작업은 예외가 그 자리에 들어가는지 확인"""
+    monkeypatch.setattr(ocr_executor, "OCR_CALL_TIMEOUT", 5)
+    tasks = [OCRTask("기본", "기본", 6, 'kor'),
+             OCRTask("실패", "실패", 6, 'kor'),
+             OCRTask("고대비", "고대비", 7, 'kor+eng')]
+
+    outputs = asyncio.run(run_ocr_tasks(tasks))
+
+    assert outputs[0].text == "기본-kor-6"
+    assert isinstance(outputs[1], RuntimeError)
+    assert outputs[2].text == "고대비-kor+eng-7"
+    assert [call[3] for call in backend.calls] == [5, 5, 5]
+
+    stats = ocr_executor.get_ocr_stats()
+    assert stats["backend"] == "fake"
+    assert stats["calls"] == 2
+
+
+def test_call_timeout_zero_means_no_limit(backend, monkeypatch):
+    """호출 시간 제한이 0이면 엔진에 제한 없음(None)으로 넘기는지 확인"""
+    monkeypatch.setattr(ocr_executor, "OCR_CALL_TIMEOUT", 0)
+    output = ocr_executor.run_ocr_task(OCRTask("기본", "기본", 6, 'kor'))
+    assert output.backend == "fake"
+    assert backend.calls[0][3] is None
+
+
+def test_broken_pool_is_rebuilt_and_retried_once(backend, monkeypatch):
+    """워커가 죽어 풀이 망가지면 새 풀을 만들어 한 번만 다시 실행하는지 확인"""
+    broken = BrokenPool()
+    monkeypatch.setattr(ocr_executor, "OCR_WORKERS", 2)
+    monkeypatch.setattr(ocr_executor, "_executor", broken)
+    tasks = [OCRTask("기본", "기본", 6, 'kor'),
+             OCRTask("고대비", "고대비", 6, 'kor')]
+
+    with ThreadPoolExecutor(1) as healthy:
+        monkeypatch.setattr(ocr_executor, "get_ocr_executor", lambda: healthy)
+        outputs = asyncio.run(run_ocr_tasks(tasks))
+
+    assert [output.text for output in outputs] == ["기본-kor-6", "고대비-kor-6"]
+    assert broken.submitted == 2 and broken.closed
+    assert ocr_executor._executor is None  # 다음 요청에서 새 풀을 만듦
+
+    # 새 풀도 망가지면 더 재시도하지 않고 오류를 돌려줌
+    still_broken = BrokenPool()
+    monkeypatch.setattr(ocr_executor, "get_ocr_executor",
+                        lambda: still_broken)
+    outputs = asyncio.run(run_ocr_tasks(tasks[:1]))
+    assert isinstance(outputs[0], BrokenProcessPool)
+    assert still_broken.submitted == 2
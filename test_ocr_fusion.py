@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from ocr_fusion import fuse_hypotheses, fuse_results, normalize_hypothesis
+from ocr_scheduler import OCRScheduler
+from ocr_words import OCRPage, OCRWord, confidence_score
+
+
+def test_fusion_fixes_errors_that_differ_between_results():
+    """결과마다 다른 글자를 틀리면 글자 단위 투표로 바로잡는지 확인"""
+    fused = fuse_hypotheses([
+        ("법은 나라애서 정해준 것", 80),   # 바뀐 글자
+        ("범은 나라에서 정해준 것", 75),
+        ("법은 나라에서 정해 준것", 70),   # 띄어쓰기 차이
+        ("법은 나라에서  정해준 것!", 60),  # 덧붙은 글자
+    ])
+    assert fused == "법은 나라에서 정해준 것"
+
+
+def test_fusion_keeps_lines_and_weights():
+    """줄바꿈을 유지하고, 표가 갈리면 가중치가 큰 글자를 고르는지 확인"""
+    assert fuse_hypotheses([("도덕은\n양심", 50), ("도덕는\n양심", 90)]) == "도덕는\n양심"
+    assert (fuse_hypotheses([("도덕은\n\n양심", 50)])
+            == normalize_hypothesis("도덕은\n양심"))
+    assert fuse_hypotheses([("", 90), ("  ", 80)]) == ""
+
+
+def test_scheduler_stops_for_fusion():
+    """융합용 결과 수가 모이면 멈추고, 설정하지 않으면 계속 진행하는지 확인"""
+    scheduler = OCRScheduler(score_threshold=95, time_budget=100, fusion_stop=3)
+    started = scheduler.start()
+    assert scheduler.stop_reason(80, started, 2) is None
+    assert scheduler.stop_reason(80, started, 3) == "fusion"
+    no_fusion = OCRScheduler(score_threshold=95, time_budget=100,
+                             fusion_stop=0)
+    assert no_fusion.stop_reason(80, started, 9) is None
+
+
+def make_result(text, quality, conf):
+    """(방법, 텍스트, 점수, 설명, 분석, OCRPage) 형식의 후보"""
+    words = [OCRWord(word, conf, 0, 0, 10, 10, 0) for word in text.split()]
+    page = OCRPage(text, words, (100, 50))
+    return (text, text, confidence_score(quality, conf), "", {}, page)
+
+
+def test_fusion_never_lowers_the_chosen_score():
+    """융합 텍스트도 같은 방식으로 채점해, 최고 결과보다 낮으면 버리는지 확인"""
+    qualities = {"법은 나라에서 정해준 것": 100}
+
+    def rate(text, confidence, best):
+        return confidence_score(qualities.get(text, 50), confidence), "", {}
+
+    results = [
+        make_result("법은 나라애서 정해준 것", 80, 90),
+        make_result("범은 나라에서 정해준 것", 80, 90),
+        make_result("법은 나라에서 정해준 것!", 80, 90),
+    ]
+    fused = fuse_results(results, rate, top=3)
+    assert fused[1] == "법은 나라에서 정해준 것"
+    assert fused[2] == confidence_score(100, 90) > results[0][2]
+    # 단어 상자와 신뢰도는 최고 결과의 것을 그대로 저장
+    best = max(results, key=lambda result: result[2])
+    assert fused[5].words == best[5].words and fused[5].size == (100, 50)
+
+    # 최고 결과와 점수가 같으면 엔진 결과를 그대로 씀
+    qualities["법은 나라에서 정해준 것"] = 80
+    assert fuse_results(results, rate, top=3) is None
+
+    # 다른 후보보다 나쁘게 채점되는 융합 텍스트는 채택하지 않음
+    qualities.clear()
+    assert fuse_results(results, rate, top=3) is None
+    assert fuse_results(results[:1], rate, top=3) is None
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+import io
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+import image_ingest
+from database import DatabaseManager
+from ocr_jobs import OCRJobQueue
+
+
+def test_concurrent_claims_take_each_job_once(tmp_path):
+    """여러 워커가 동시에 가져가도 BEGIN IMMEDIATE 잠금으로 작업마다 한 번만 실행되는지 확인"""
+    path = str(tmp_path / "jobs.db")
+    db = DatabaseManager(path)
+    job_ids = [db.create_ocr_job("s1", f"{i}.jpg") for i in range(30)]
+
+    claimed = []
+    start = threading.Barrier(4)
+
+    def worker():
+        # 워커마다 따로 연결 (다른 프로세스와 같은 상황)
+        own_db = DatabaseManager(path)
+        start.wait()
+        while True:
+            job = own_db.claim_next_ocr_job()
+            if job is None:
+                return
+            claimed.append(job['id'])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == job_ids
+    job = db.get_ocr_job(job_ids[0])
+    assert (job['status'], job['attempts']) == ('running', 1)
+    assert db.claim_next_ocr_job() is None
+
+
+def test_failed_jobs_are_retried_up_to_max_attempts(tmp_path):
+    """실패한 작업은 다시 대기열로 가고, 최대 시도 횟수를 넘으면 실패로 끝나는지 확인"""
+    db = DatabaseManager(str(tmp_path / "jobs.db"))
+    attempts = {}
+
+    async def process_job(job):
+        attempts[job['image_path']] = job['attempts']
+        if job['image_path'] == "broken.jpg" or job['attempts'] == 1:
+            raise RuntimeError(f"{job['attempts']}번째 오류")
+        return {"ocr_text": "법은 지켜야 한다"}
+
+    async def main():
+        queue = OCRJobQueue(db, process_job, workers=2, max_attempts=3)
+        queue.start()
+        flaky = queue.enqueue("s1", "flaky.jpg")
+        broken = queue.enqueue("s1", "broken.jpg")
+        results = [await queue.wait(job_id, 5) for job_id in (flaky, broken)]
+        await queue.stop()
+        return results
+
+    flaky, broken = asyncio.run(main())
+
+    assert (flaky['status'], flaky['attempts']) == ('done', 2)
+    assert flaky['result'] == {"ocr_text": "법은 지켜야 한다"}
+    assert (broken['status'], broken['attempts']) == ('failed', 3)
+    assert broken['error'] == "3번째 오류"
+
+
+def test_running_jobs_are_requeued_on_restart(tmp_path):
+    """서버가 꺼질 때 실행 중이던 작업을 다시 시작하면 대기열로 돌려 처리하는지 확인"""
+    db = DatabaseManager(str(tmp_path / "jobs.db"))
+    job_id = db.create_ocr_job("s1", "page.jpg")
+    assert db.claim_next_ocr_job()['id'] == job_id  # 처리 중에 서버 종료
+
+    async def process_job(job):
+        return {"ocr_text": job['image_path']}
+
+    async def main():
+        queue = OCRJobQueue(db, process_job, workers=1)
+        queue.start()
+        job = await queue.wait(job_id, 5)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(main())
+    assert (job['status'], job['attempts']) == ('done', 2)
+    assert job['result'] == {"ocr_text": "page.jpg"}
+    assert db.get_ocr_job_stats()['done'] == 1
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """서버 모듈 (데이터베이스와 작업 이미지 폴더는 임시 폴더에)"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        import main_backup
+    finally:
+        os.chdir(cwd)
+    monkeypatch.setattr(main_backup, "db",
+                        DatabaseManager(str(tmp_path / "jobs.db")))
+    monkeypatch.setattr(main_backup, "OCR_JOB_DIR", str(tmp_path))
+    return main_backup
+
+
+def test_job_mode_rejects_non_images_before_queueing(app, monkeypatch):
+    """작업 모드에서도 이미지가 아니거나 너무 크면 대기열에 넣지 않고 400을 반환하는지 확인"""
+    client = TestClient(app.app)
+
+    def upload(contents):
+        return client.post("/ocr_upload", data={"mode": "job"},
+                           files={"file": ("page.jpg", contents)})
+
+    response = upload(b"not an image")
+    assert response.status_code == 400
+    assert "이미지 파일을 읽을 수 없습니다" in response.json()["detail"]
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (2000, 1000), 'white').save(buffer, 'PNG')
+    monkeypatch.setattr(image_ingest, "OCR_MAX_IMAGE_PIXELS", 1_000_000)
+    response = upload(buffer.getvalue())
+    assert response.status_code == 400
+    assert "해상도" in response.json()["detail"]
+
+    assert app.db.get_ocr_job_stats()["queued"] == 0
+    saved = os.listdir(app.OCR_JOB_DIR)
+    assert not any(name.endswith(".jpg") for name in saved)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from database import DatabaseManager
+from image_hash import NearDuplicateIndex, fingerprint
+from ocr_cache import OCRResultCache, hash_upload
+from ocr_pages import (
+    CANCELLED_ERROR, PageUpload, iter_page_results, stitch_pages,
+)
+from ocr_words import OCRPage
+
+
+def test_stitch_pages_in_page_order():
+    """끝난 순서와 관계없이 쪽 번호 순서로 이어 붙이고 빈 쪽은 건너뛰는지 확인"""
+    assert stitch_pages({3: "셋째 쪽", 1: "첫째 쪽\n", 2: "  "}) == "첫째 쪽\n\n셋째 쪽"
+    assert stitch_pages({}) == ""
+
+
+def test_pages_are_saved_as_they_finish(tmp_path):
+    """늦은 쪽을 기다리지 않고 먼저 끝난 쪽부터 저장/전송하고, 마지막에 이어 붙이는지 확인"""
+    db = DatabaseManager(str(tmp_path / "pages.db"))
+    submission_id = db.save_submission("s1", "")
+    pages = [PageUpload(n, f"p{n}.jpg", b"", f"p{n}.jpg", "s1")
+             for n in (1, 2, 3)]
+    db.create_submission_pages(submission_id,
+                               [page.image_path for page in pages])
+
+    async def process_page(page):
+        if page.page_number == 1:
+            await asyncio.sleep(0.05)
+            # 늦게 끝나는 쪽이 끝나기 전에 다른 쪽은 이미 저장됨
+            statuses = [p["status"]
+                        for p in db.get_submission_pages(submission_id)]
+            assert statuses == ["pending", "done", "failed"]
+        if page.page_number == 3:
+            raise RuntimeError("OCR 오류")
+        return {"success": True, "ocr_text": f"{page.page_number}쪽 글",
+                "quality_score": 80, "ocr_words": {"words": []}}
+
+    async def collect():
+        results = iter_page_results(db, submission_id, pages, process_page)
+        return [json.loads(line) async for line in results]
+
+    lines = asyncio.run(collect())
+
+    assert [line.get("page") for line in lines[:-1]] == [2, 3, 1]
+    assert lines[-1] == {"done": True, "submission_id": submission_id,
+                         "ocr_text": "1쪽 글\n\n2쪽 글",
+                         "total": 3, "succeeded": 2, "failed": 1}
+
+    submission = db.get_submission_by_id(submission_id)
+    assert submission["ocr_text"] == "1쪽 글\n\n2쪽 글"
+    assert [(p["page_number"], p["status"])
+            for p in submission["pages"]] == [
+        (1, "done"), (2, "done"), (3, "failed")]
+    assert submission["pages"][2]["error"] == "OCR 오류"
+
+
+def test_disconnect_cancels_pending_pages_and_saves_finished(tmp_path):
+    """연결이 끊기면 남은 쪽은 취소/실패로 기록하고 끝난 쪽만 이어 붙여 저장하는지 확인"""
+    db = DatabaseManager(str(tmp_path / "pages.db"))
+    submission_id = db.save_submission("s1", "")
+    pages = [PageUpload(n, f"p{n}.jpg", b"", f"p{n}.jpg", "s1")
+             for n in (1, 2, 3)]
+    db.create_submission_pages(submission_id,
+                               [page.image_path for page in pages])
+    cancelled = []
+
+    async def process_page(page):
+        try:
+            await asyncio.sleep({1: 10, 2: 0, 3: 0.01}[page.page_number])
+        except asyncio.CancelledError:
+            cancelled.append(page.page_number)
+            raise
+        return {"success": True, "ocr_text": f"{page.page_number}쪽 글"}
+
+    async def disconnect_after_first_line():
+        stream = iter_page_results(db, submission_id, pages, process_page)
+        first = json.loads(await stream.__anext__())
+        # 3쪽은 끝났지만 전송하기 전에 연결이 끊김
+        await asyncio.sleep(0.05)
+        await stream.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    assert asyncio.run(disconnect_after_first_line())["page"] == 2
+    assert cancelled == [1]
+
+    submission = db.get_submission_by_id(submission_id)
+    assert submission["ocr_text"] == "2쪽 글\n\n3쪽 글"
+    assert [(p["page_number"], p["status"]) for p in submission["pages"]] == [
+        (1, "failed"), (2, "done"), (3, "done")]
+    assert submission["pages"][0]["error"] == CANCELLED_ERROR
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    """서버 모듈 (데이터베이스는 임시 폴더에 생성)"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        import main_backup
+    finally:
+        os.chdir(cwd)
+    return main_backup
+
+
+def test_sibling_pages_never_reuse_near_duplicates(app, monkeypatch):
+    """비슷한 쪽의 OCR 결과를 유사 이미지로 재사용하지 않고, 같은 파일만 캐시에서 쓰는지 확인"""
+    def encode(image_format):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 300), 'white').save(buffer, image_format)
+        return buffer.getvalue()
+
+    first_page, second_page = encode('PNG'), encode('BMP')
+    cache = OCRResultCache("test")
+    index = NearDuplicateIndex()
+    monkeypatch.setattr(app, "ocr_cache", cache)
+    monkeypatch.setattr(app, "near_duplicates", index)
+    monkeypatch.setattr(app, "TESSERACT_INSTALLED", True)
+
+    # 1쪽의 결과가 캐시와 유사 이미지 색인에 있음 (2쪽과 같은 그림)
+    cache.put(hash_upload(first_page), {"success": True, "ocr_text": "1쪽"})
+    image = Image.open(io.BytesIO(first_page)).convert('RGB')
+    index.add("s1", fingerprint(image), hash_upload(first_page))
+    assert index.find("s1", fingerprint(image))
+
+    async def fake_ocr(image, run_info):
+        return [("방법", "2쪽 글", 80, "좋음", OCRPage("2쪽 글", [], (1, 1)))]
+
+    monkeypatch.setattr(app, "try_multiple_ocr_methods", fake_ocr)
+
+    def run(contents):
+        page = PageUpload(1, "p.png", contents, "p.png", "s1")
+        return asyncio.run(app.process_submission_page(page))
+
+    assert run(second_page)["ocr_text"] == "2쪽 글"
+    assert run(first_page)["ocr_text"] == "1쪽"
+    # 쪽 OCR 결과는 유사 이미지 색인에 추가하지 않음
+    assert len(index.find("s1", fingerprint(image))) == 1
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import time
+
+from ocr_executor import OCRTask
+from ocr_scheduler import OCRScheduler, ocr_method_name
+
+
+class FakeDB:
+    """방법별 통계를 돌려주고 기록 호출을 모으는 가짜 데이터베이스"""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.recorded = []
+
+    def get_ocr_method_stats(self):
+        return self.stats
+
+    def record_ocr_method_result(self, tried_methods, winner):
+        self.recorded.append((tried_methods, winner))
+
+
+def task(variant, psm=6, lang='kor'):
+    return OCRTask(variant, None, psm, lang)
+
+
+STATS = {
+    ocr_method_name(task("기본")): {'trials': 10, 'wins': 8},
+    ocr_method_name(task("고대비")): {'trials': 10, 'wins': 1},
+}
+
+
+def test_order_by_win_rate_and_explore_untried():
+    """선택률이 높은 방법을 먼저, 탐색 가중치가 크면 안 해본 방법을 먼저 실행하는지 확인"""
+    tasks = [task("고대비"), task("새변형"), task("기본")]
+
+    greedy = OCRScheduler(FakeDB(STATS), exploration=0)
+    assert [t.variant_name for t in greedy.order(tasks)] == [
+        "기본", "새변형", "고대비"]
+
+    curious = OCRScheduler(FakeDB(STATS), exploration=5)
+    assert curious.order(tasks)[0].variant_name == "새변형"
+
+
+def test_ties_keep_original_order():
+    """통계가 없어 우선순위가 같으면 원래 순서를 유지하는지 확인"""
+    tasks = [task("가", 6), task("나", 7), task("다", 6, 'kor+eng')]
+    assert OCRScheduler().order(tasks) == tasks
+
+
+def test_stop_reasons():
+    """점수 기준, 시간 예산 순서로 조기 종료 사유를 판단하는지 확인"""
+    scheduler = OCRScheduler(score_threshold=90, time_budget=100,
+                             fusion_stop=0)
+    started = scheduler.start()
+    assert scheduler.stop_reason(None, started) is None
+    assert scheduler.stop_reason(89, started) is None
+    assert scheduler.stop_reason(90, started) == "score"
+
+    expired = time.perf_counter() - 101
+    assert scheduler.stop_reason(50, expired) == "time_budget"
+    assert scheduler.stop_reason(95, expired) == "score"
+
+
+def test_remaining_deadline():
+    """마감 시간까지 남은 시간을 계산하고, 마감이 없으면 None인지 확인"""
+    started = time.perf_counter()
+    assert 9 < OCRScheduler(deadline=10).remaining(started) <= 10
+    assert OCRScheduler(deadline=10).remaining(started - 20) == 0
+    assert OCRScheduler(deadline=0).remaining(started) is None
+
+
+def test_record_updates_stats_and_database():
+    """시도한 방법은 trials, 선택된 방법은 wins가 늘고 DB에도 기록되는지 확인"""
+    db = FakeDB({})
+    scheduler = OCRScheduler(db)
+    tried = [ocr_method_name(task("기본")), ocr_method_name(task("고대비"))]
+
+    scheduler.record(tried, tried[1])
+
+    assert scheduler.stats == {
+        tried[0]: {'trials': 1, 'wins': 0},
+        tried[1]: {'trials': 1, 'wins': 1},
+    }
+    assert db.recorded == [(tried, tried[1])]
+    assert scheduler.order([task("기본"), task("고대비")])[0] == task("고대비")
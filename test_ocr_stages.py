@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+
+import pytest
+from PIL import Image
+
+import ocr_executor
+from ocr_backends import OCRBackend
+from ocr_scheduler import OCRScheduler
+from ocr_words import OCRPage
+from preprocess_nodes import UPSCALED_VARIANTS
+
+GOOD_TEXT = "법은 나라에서 정해준 것 꼭 지켜야 하는 것\n도덕은 양심의 문제이다"
+WIDTH = 400
+
+
+class FakeBackend(OCRBackend):
+    """min_width 이상인 이미지에서만 글자를 읽는 가짜 엔진"""
+    name = "fake"
+
+    def __init__(self, min_width=0):
+        self.min_width = min_width
+        self.widths = []
+
+    def recognize(self, image, lang, psm, timeout=None):
+        self.widths.append(image.width)
+        text = GOOD_TEXT if image.width >= self.min_width else ""
+        return OCRPage(text, [], image.size)
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    """서버 모듈 (데이터베이스는 임시 폴더에 생성)"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        import main_backup
+    finally:
+        os.chdir(cwd)
+    return main_backup
+
+
+def run_search(app, monkeypatch, backend):
+    """프로세스 풀 없이(OCR_WORKERS=0) 가짜 엔진으로 전체 OCR 검색 실행"""
+    monkeypatch.setattr(ocr_executor, "OCR_WORKERS", 0)
+    monkeypatch.setattr(ocr_executor, "_backend", backend)
+    monkeypatch.setattr(app, "quality_router", None)
+    # 점수 조기 종료는 끄고 단계 전환 판단만 확인
+    monkeypatch.setattr(app, "ocr_scheduler", OCRScheduler(
+        score_threshold=101, time_budget=60, deadline=0, fusion_stop=0))
+    run_info = {}
+    image = Image.new('RGB', (WIDTH, 300), 'white')
+    results = asyncio.run(app.try_multiple_ocr_methods(image, run_info))
+    return results, run_info
+
+
+def test_escalation_decision(app):
+    """결과가 없거나 한글 품질이 낮을 때만 확대 단계로 넘어가는지 확인"""
+    def search(*texts, stop_reason=None):
+        results = [("방법", text, 50, "", {}, None) for text in texts]
+        return {"results": results, "stop_reason": stop_reason}
+
+    assert app.escalation_decision(search(stop_reason="score")) == (
+        False, "score", None)
+    assert app.escalation_decision(search()) == (True, "no_result", None)
+    escalate, reason, quality = app.escalation_decision(search("ab cd"))
+    assert (escalate, reason) == (True, "low_quality")
+    assert quality < app.OCR_ESCALATE_SCORE
+    escalate, reason, quality = app.escalation_decision(search(GOOD_TEXT))
+    assert (escalate, reason) == (False, "quality_ok")
+    assert quality >= app.OCR_ESCALATE_SCORE
+
+
+def test_native_stage_is_enough(app, monkeypatch):
+    """원본 크기 결과가 좋으면 확대 변형을 만들지도 실행하지도 않는지 확인"""
+    backend = FakeBackend()
+    results, run_info = run_search(app, monkeypatch, backend)
+
+    stages = run_info["resolution_stages"]
+    assert [stage["stage"] for stage in stages] == ["원본크기"]
+    assert (stages[0]["escalate"], stages[0]["reason"]) == (
+        False, "quality_ok")
+    assert max(backend.widths) <= WIDTH
+    assert not any(name in method for method, *_ in results
+                   for name in UPSCALED_VARIANTS)
+
+
+def test_escalates_to_upscaled_when_native_fails(app, monkeypatch):
+    """원본 크기에서 읽지 못하면 확대 변형 단계로 넘어가 결과를 얻는지 확인"""
+    backend = FakeBackend(min_width=WIDTH * 2)
+    results, run_info = run_search(app, monkeypatch, backend)
+
+    stages = run_info["resolution_stages"]
+    assert [stage["stage"] for stage in stages] == ["원본크기", "확대"]
+    assert (stages[0]["escalate"], stages[0]["reason"]) == (
+        True, "no_result")
+    assert results and results[0][1].startswith("법은")
+    assert run_info["executed"] == stages[0]["executed"] + stages[1]["executed"]
+
+
+def test_final_quality_is_scored_only_when_debug_traced(app, monkeypatch):
+    """최종 품질 점수는 DEBUG 기록이 켜져 있을 때만 계산하는지 확인"""
+    calls = []
+    monkeypatch.setattr(app, "analyze_korean_text_quality",
+                        lambda text: calls.append(text) or (50, "보통", {}))
+    monkeypatch.setattr(app.trace, "enabled", lambda level: False)
+    assert app.enhance_korean_ocr_result(GOOD_TEXT)
+    assert calls == []
+
+    monkeypatch.setattr(app.trace, "enabled", lambda level: True)
+    app.enhance_korean_ocr_result(GOOD_TEXT)
+    assert len(calls) == 1
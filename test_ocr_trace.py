@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import asyncio
+
+from ocr_trace import DEBUG, INFO, attach_trace, in_context, trace, tracing
+
+
+class Unformattable:
+    """형식화되면 실패하는 인자 (기록하지 않을 때 형식화하지 않는지 확인용)"""
+
+    def __format__(self, spec):
+        raise AssertionError("기록하지 않는 메시지를 형식화함")
+
+
+def test_no_collector_is_noop():
+    """추적을 원하지 않은 요청에서는 기록도 형식화도 하지 않는지 확인"""
+    trace.debug("점수 {}점", Unformattable())
+    with tracing(False) as collector:
+        assert collector is None
+        trace.info("단계 {}", Unformattable())
+        assert not trace.enabled(DEBUG)
+
+
+def test_levels_limit_and_lazy_formatting():
+    """최소 수준 미만은 형식화 없이 버리고, 한도를 넘는 이벤트는 개수만 세는지 확인"""
+    with tracing(level=INFO, limit=2) as collector:
+        trace.debug("세부 {}", Unformattable())
+        trace.info("단계 {} 시작", "빠름")
+        trace.warning("❌ {} 오류", "줄 OCR")
+        trace.info("넘침")
+    lines = collector.lines()
+    assert lines[0].endswith("INFO] 단계 빠름 시작")
+    assert lines[1].endswith("WARNING] ❌ 줄 OCR 오류")
+    assert lines[2] == "[추적] 한도 초과 1개, 샘플링 제외 0개 생략"
+
+
+def test_debug_sampling():
+    """같은 DEBUG 메시지는 N번 중 한 번만 기록하는지 확인"""
+    with tracing(sample=3) as collector:
+        for score in range(7):
+            trace.debug("점수 {}점", score)
+        trace.info("완료")
+    texts = [text for _, _, text in collector.events]
+    assert texts == ["점수 0점", "점수 3점", "점수 6점", "완료"]
+    assert collector.sampled_out == 4
+
+
+def test_requests_are_isolated_and_threads_inherit():
+    """동시에 처리되는 요청의 기록이 섞이지 않고, in_context로 넘긴 스레드 작업도 기록되는지 확인"""
+    def decode(name):
+        trace.info("이미지 읽기 {}", name)
+
+    async def handle(name, enabled):
+        with tracing(enabled) as collector:
+            for step in range(3):
+                trace.info("{} 단계 {}", name, step)
+                await asyncio.sleep(0)
+            await asyncio.get_running_loop().run_in_executor(
+                None, in_context(decode), name)
+        return collector
+
+    async def main():
+        return await asyncio.gather(handle("가", True), handle("나", True),
+                                    handle("다", False))
+
+    first, second, third = asyncio.run(main())
+    assert [text for _, _, text in first.events] == [
+        "가 단계 0", "가 단계 1", "가 단계 2", "이미지 읽기 가"]
+    assert [text for _, _, text in second.events] == [
+        "나 단계 0", "나 단계 1", "나 단계 2", "이미지 읽기 나"]
+    assert third is None
+
+
+def test_attach_trace_keeps_cached_response():
+    """추적 기록을 붙여도 캐시에 저장된 원래 응답은 바뀌지 않는지 확인"""
+    cached = {"success": True, "debug_info": ["기본 (품질: 80점, 좋음): 법은"]}
+    assert attach_trace(cached, None) is cached
+    with tracing() as collector:
+        trace.info("♻️ OCR 캐시 적중: {:.12}", "0123456789abcdef")
+    response = attach_trace(cached, collector)
+    assert cached["debug_info"] == ["기본 (품질: 80점, 좋음): 법은"]
+    assert response["debug_info"][0] == "기본 (품질: 80점, 좋음): 법은"
+    assert response["debug_info"][1].endswith(
+        "INFO] ♻️ OCR 캐시 적중: 0123456789ab")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from database import DatabaseManager
+from ocr_scheduler import OCR_EARLY_EXIT_SCORE
+from ocr_words import (
+    OCR_LOW_QUALITY_SCORE, OCR_UNKNOWN_CONFIDENCE, OCRPage, confidence_score,
+    mean_confidence, merge_line_pages, pack_page, parse_tsv, unpack_words,
+    words_to_text,
+)
+
+TSV = "\n".join([
+    "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num"
+    "\tleft\ttop\twidth\theight\tconf\ttext",
+    "1\t1\t0\t0\t0\t0\t0\t0\t300\t100\t-1\t",
+    "5\t1\t1\t1\t1\t1\t10\t5\t40\t20\t90.5\t법은",
+    "5\t1\t1\t1\t1\t2\t60\t5\t40\t20\t70\t지킨다",
+    "5\t1\t1\t1\t2\t1\t10\t40\t40\t20\t-1\t도덕",
+])
+
+
+def test_parse_tsv_and_confidence():
+    """TSV에서 단어 상자를 읽고 글자 수 가중 신뢰도를 계산하는지 확인"""
+    words = parse_tsv(TSV)
+
+    assert [w.text for w in words] == ["법은", "지킨다", "도덕"]
+    assert [w.line for w in words] == [0, 0, 1]
+    assert words_to_text(words) == "법은 지킨다\n도덕"
+    # 신뢰도 -1(알 수 없음)은 제외
+    assert mean_confidence(words) == (90.5 * 2 + 70 * 3) / 5
+    assert mean_confidence([]) is None
+
+
+def test_merge_lines_and_pack_round_trip(tmp_path):
+    """줄별 결과를 페이지 좌표로 합치고, 제출 내역에 저장했다가 그대로 읽는지 확인"""
+    line = OCRPage("법은 지킨다", parse_tsv(TSV)[:2], (120, 30))
+    page = merge_line_pages([line, line],
+                            [(5, 100, 125, 130), (5, 200, 125, 230)],
+                            (300, 400))
+
+    assert page.text == "법은 지킨다\n법은 지킨다"
+    assert [(w.left, w.top, w.line) for w in page.words] == [
+        (15, 105, 0), (65, 105, 0), (15, 205, 1), (65, 205, 1)]
+
+    packed = pack_page(page)
+    assert unpack_words(packed) == page.words
+
+    db = DatabaseManager(str(tmp_path / "words.db"))
+    submission_id = db.save_submission("s1", page.text, ocr_words=packed)
+    assert db.get_submission_by_id(submission_id)["ocr_words"] == packed
+    assert "ocr_words" not in db.get_all_submissions()[0]
+
+
+def test_scores_with_and_without_confidence_share_one_scale():
+    """신뢰도가 없는 결과가 방법 보너스만으로 신뢰도가 있는 결과를 이기지 않는지 확인"""
+    calibrated = confidence_score(85, mean_confidence(parse_tsv(TSV)))
+    heuristic_only = confidence_score(80 + 25, None)
+
+    assert calibrated == round(85 * (90.5 * 2 + 70 * 3) / 5 / 100)
+    assert heuristic_only == round(100 * OCR_UNKNOWN_CONFIDENCE / 100)
+    assert max([heuristic_only, calibrated]) == calibrated
+    # 같은 텍스트 품질이면 신뢰도가 높은 결과가 이김
+    assert confidence_score(90, 95) > confidence_score(90, 70)
+    assert confidence_score(100, 100) == 100
+
+
+def test_thresholds_fit_the_confidence_scale():
+    """손글씨에서 흔한 신뢰도로도 조기 종료할 수 있고, 보통 결과에는 품질 경고가 없는지 확인"""
+    # 한글 품질이 좋으면 신뢰도 75로도 조기 종료, 60이면 계속 탐색
+    assert confidence_score(100, 75) >= OCR_EARLY_EXIT_SCORE
+    assert confidence_score(95, 75) >= OCR_EARLY_EXIT_SCORE
+    assert confidence_score(100, 60) < OCR_EARLY_EXIT_SCORE
+    # 예전 기준(한글 품질 40점)과 비슷하게 경고
+    assert confidence_score(60, 60) >= OCR_LOW_QUALITY_SCORE
+    assert confidence_score(40, 70) >= OCR_LOW_QUALITY_SCORE
+    assert confidence_score(35, 60) < OCR_LOW_QUALITY_SCORE
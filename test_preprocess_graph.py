@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from preprocess_graph import PreprocessGraph
+from preprocess_nodes import NATIVE_VARIANTS, NODES
+
+
+def make_image():
+    image = np.full((200, 300, 3), 255, np.uint8)
+    image[50:70, 30:270] = 20
+    image[120:140, 30:200] = 20
+    return Image.fromarray(image)
+
+
+def test_shared_nodes_computed_once(monkeypatch):
+    """여러 변형이 공유하는 중간 단계는 한 번만 계산되는지 확인"""
+    calls = []
+    spec = NODES["gray_otsu"]
+    monkeypatch.setitem(NODES, "gray_otsu", spec._replace(
+        func=lambda gray: calls.append(1) or spec.func(gray)))
+
+    graph = PreprocessGraph(make_image())
+    variants = graph.variants(NATIVE_VARIANTS)
+
+    assert [name for name, _ in variants] == NATIVE_VARIANTS
+    # 연결분리와 침식팽창은 같은 Otsu 결과를 사용
+    assert len(calls) == 1
+    assert "gray" in graph.timings
+
+
+def test_memory_limit_evicts_and_tracks_peak():
+    """메모리 한도를 넘으면 중간 결과를 버리고, take/give_back으로 사용량을 추적하는지 확인"""
+    unlimited = PreprocessGraph(make_image())
+    graph = PreprocessGraph(make_image(), memory_limit=100 * 1024)
+    for name in NATIVE_VARIANTS:
+        unlimited.get(name)
+        graph.get(name)
+
+    # 고정 노드(gray)와 방금 만든 결과만 남고 나머지 중간 결과는 버려짐
+    assert graph.cached_bytes <= 2 * 200 * 300
+    assert graph.peak_bytes < unlimited.peak_bytes
+
+    binary = graph.take("고대비")
+    assert graph.loaned_bytes == binary.nbytes
+    graph.give_back(binary.nbytes)
+    assert graph.loaned_bytes == 0
+
+
+def test_concurrent_access_computes_once_and_balances_memory(monkeypatch):
+    """여러 스레드가 같은 그래프를 써도 노드를 한 번만 계산하고 사용량이 맞는지 확인"""
+    calls = []
+    spec = NODES["gray_otsu"]
+
+    def slow_otsu(gray):
+        calls.append(1)
+        time.sleep(0.02)
+        return spec.func(gray)
+
+    monkeypatch.setitem(NODES, "gray_otsu", spec._replace(func=slow_otsu))
+    graph = PreprocessGraph(make_image())
+    names = ["연결분리", "침식팽창"] * 4
+
+    def use(name):
+        binary = graph.take(name)
+        graph.give_back(binary.nbytes)
+        return binary.nbytes
+
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        sizes = list(pool.map(use, names))
+
+    assert len(calls) == 1
+    assert graph.loaned_bytes == 0
+    assert graph.peak_bytes >= graph.cached_bytes + max(sizes)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import cv2
+import numpy as np
+
+from rectify import _rotate, estimate_skew, find_paper_quad, rectify
+
+
+def make_page():
+    """흰 종이에 글줄 모양 검은 막대를 그린 테스트 이미지"""
+    page = np.full((800, 600), 255, np.uint8)
+    for row in range(10):
+        for col in range(8):
+            x, y = 40 + col * 65, 60 + row * 70
+            cv2.rectangle(page, (x, y), (x + 50, y + 25), 0, -1)
+    return page
+
+
+def test_estimate_skew_undoes_rotation():
+    """회전된 글줄의 기울기를 반대 방향 각도로 추정하는지 확인"""
+    page = make_page()
+    for angle in (3.0, -4.5):
+        assert abs(estimate_skew(_rotate(page, angle)) + angle) <= 0.2
+    assert abs(estimate_skew(page)) <= 0.2
+
+
+def test_rectify_finds_paper_and_crops_background():
+    """어두운 배경 위에 비스듬히 찍힌 종이를 찾아 배경을 잘라내는지 확인"""
+    src = np.float32([[0, 0], [599, 0], [599, 799], [0, 799]])
+    dst = np.float32([[250, 80], [900, 140], [960, 900], [180, 860]])
+    matrix = cv2.getPerspectiveTransform(src, dst)
+    photo = cv2.warpPerspective(make_page(), matrix, (1200, 1000),
+                                dst=np.full((1000, 1200), 40, np.uint8),
+                                borderMode=cv2.BORDER_TRANSPARENT)
+
+    quad = find_paper_quad(photo)
+    assert quad is not None
+    assert np.abs(quad - dst).max() < 10
+
+    rectified, info = rectify(photo)
+    assert info["paper_found"]
+    assert rectified.size < photo.size
+    assert abs(info["skew_angle"]) <= 0.2
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import re
+
+from text_patterns import (
+    NON_WORD_RUN, SUSPICIOUS_ENGLISH, SUSPICIOUS_ENGLISH_PATTERNS, PatternSet,
+)
+
+
+def test_pattern_set_reports_first_listed_pattern():
+    """합친 정규식으로 검사하고, 일치하면 목록에서 먼저 나온 패턴을 돌려주는지 확인"""
+    patterns = PatternSet([r'b+$', r'^a', r'a'], re.IGNORECASE)
+    assert patterns.search("xAbb") == r'b+$'
+    assert patterns.search("Axx") == r'^a'
+    assert patterns.search("xyz") is None
+
+    for text in ["oS witty Ee", "ae ataanee", "Hello world", "법은 나라에서", "ab"]:
+        expected = next((p for p in SUSPICIOUS_ENGLISH_PATTERNS
+                         if re.search(p, text, re.IGNORECASE)), None)
+        assert SUSPICIOUS_ENGLISH.search(text) == expected
+
+
+def test_line_cleanup_matches_two_step_substitution():
+    """특수문자/공백 정리 한 번이 기존 두 번의 치환과 같은지 확인"""
+    for line in ["법은!! 나라-에서  정해준 것.", "도덕_은 (양심)\t의 문제", "~~~", "a  b　c"]:
+        expected = re.sub(r'\s+', ' ', re.sub(r'[^\w\s가-힣]', ' ', line)).strip()
+        assert NON_WORD_RUN.sub(' ', line).strip() == expected
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import re
+
+from text_stats import TextStats
+
+
+def test_counts_match_character_scans():
+    """한 번 계산한 통계가 글자를 하나씩 세던 기존 기준과 같은지 확인"""
+    text = "법은 나라애서 정해준 것_1\n  oS witty Ee ㄱㄴ ½\t²\n\n도덕은 양심의 문제이다."
+    stats = TextStats(text)
+
+    assert stats.hangul == sum(1 for c in text if '가' <= c <= '힣')
+    assert stats.digits == sum(1 for c in text if c.isdigit())
+    assert stats.ascii_letters == sum(1 for c in text
+                                      if c.isalpha() and c.isascii())
+    assert stats.special == sum(1 for c in text if not c.isalnum()
+                                and not '가' <= c <= '힣' and c != ' ')
+    assert stats.total == len(text.replace(' ', '').replace('\n', ''))
+    assert stats.hangul_words == len(re.findall(r'[가-힣]{2,}', text))
+    assert stats.hangul_word_lengths == [
+        len(w) for w in re.sub(r'[^가-힣\s]', '', text).split()]
+    assert stats.short_alpha_words == len(
+        [w for w in text.split() if len(w) <= 3 and w.isalpha()])
+    assert stats.has_consonant_run and not stats.has_vowel_run
+
+    for line, line_stats in zip(text.split('\n'), stats.lines):
+        assert line_stats.text == line
+        assert line_stats.total == len(line.replace(' ', ''))
+        assert line_stats.word_chars == len(re.findall(r'\w', line))
+        ascii_runs = re.findall(r'[a-zA-Z]+', line)
+        assert line_stats.longest_ascii_run == max(map(len, ascii_runs),
+                                                   default=0)
+
+
+def test_word_length_histogram():
+    """공백으로 나눈 단어의 한글 글자 수 분포"""
+    assert TextStats("법 은 나라 1 정해준").word_length_histogram == {1: 2, 2: 1, 3: 1}
+    assert TextStats("").lines[0].total == 0